@@ -1,329 +1,77 @@
 #!/usr/bin/env python3
 
+import sys
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
 import xlsxwriter
-
-def create_exact_plan_structure():
+from plan_actions import (ActivityStats, ActionIndex, generate_launch_actions, generate_expansion_actions,
+                          LAUNCH_REVENUE_THRESHOLD, EXPANSION_REVENUE_THRESHOLD)
+from workbook_source import WorkbookSource
+from plan_state import PlanState, row_fingerprints
+from parallel_workbook import render_workbook_parallel, render_workbook_incremental
+from plan_trace import span, trace_run
+
+# TOP 3 for maximum scaling
+TOP_3_MAXIMUM_SCALING = ['BOARDGAMING', 'SOCIAL_DEDUCTIONS', 'MUSIC']
+
+# Enhanced target days for TOP 3 maximum scaling
+ENHANCED_TARGET_DAYS = {
+    ('BOARDGAMING', 'GCR Extn.', 'Gurgaon'): 'Monday, Tuesday, Wednesday, Thursday, Friday, Saturday, Sunday',
+    ('BOARDGAMING', 'Golf Course Road', 'Gurgaon'): 'Monday, Wednesday, Thursday, Friday, Saturday, Sunday',
+    ('BOARDGAMING', 'MG Road', 'Gurgaon'): 'Monday, Tuesday, Thursday, Friday, Saturday, Sunday',
+    ('SOCIAL_DEDUCTIONS', 'GCR Extn.', 'Gurgaon'): 'Monday, Wednesday, Thursday, Friday, Saturday, Sunday',
+    ('SOCIAL_DEDUCTIONS', 'South City', 'Gurgaon'): 'Monday, Tuesday, Thursday, Friday, Saturday, Sunday',
+    ('MUSIC', 'GCR Extn.', 'Gurgaon'): 'Monday, Tuesday, Wednesday, Thursday, Saturday, Sunday',
+    ('MUSIC', 'Golf Course Road', 'Gurgaon'): 'Monday, Wednesday, Thursday, Friday, Saturday, Sunday',
+    ('MUSIC', 'South City', 'Gurgaon'): 'Monday, Tuesday, Thursday, Friday, Saturday, Sunday',
+}
+
+# Monday of plan week 1
+PLAN_START_DATE = datetime(2024, 10, 28)
+
+def define_plan_formats(workbook):
     """
-    Create the exact plan structure as requested:
-    1. Club expansion
-    2. Club launches
-    3. Summary
-    4. Weekly execution
-    5. Milestone
-    6. City progress
-    7. Working sheet (original)
-    8. Events (original - keep as is)
-    9. Logic (calculations explanation)
+    Cell formats shared by every sheet of the plan, always created in the
+    same order
     """
-
-    file_path = 'OND-JFM Plan with actionbales V5.xlsx'
-    working_sheet = pd.read_excel(file_path, sheet_name='Working sheet')
-
-    # Try to read events sheet
-    try:
-        events_sheet = pd.read_excel(file_path, sheet_name='Events')
-    except:
-        events_sheet = None
-
-    print('🎯 CREATING EXACT PLAN STRUCTURE AS REQUESTED')
-    print('=' * 60)
-
-    # TOP 3 for maximum scaling
-    TOP_3_MAXIMUM_SCALING = ['BOARDGAMING', 'SOCIAL_DEDUCTIONS', 'MUSIC']
-
-    # Create new workbook
-    workbook = xlsxwriter.Workbook('OND-JFM EXACT PLAN STRUCTURE V12.xlsx', {'nan_inf_to_errors': True})
-
-    # Define formats
-    header_format = workbook.add_format({
+    formats = {}
+    formats['header'] = workbook.add_format({
         'bold': True, 'bg_color': '#4472C4', 'font_color': 'white',
         'border': 1, 'align': 'center', 'valign': 'vcenter'
     })
 
-    max_scaling_format = workbook.add_format({
+    formats['max_scaling'] = workbook.add_format({
         'bold': True, 'bg_color': '#FF0000', 'font_color': 'white',
         'border': 1, 'align': 'center'
     })
 
-    high_priority_format = workbook.add_format({
+    formats['high_priority'] = workbook.add_format({
         'bold': True, 'bg_color': '#FF6B6B', 'font_color': 'white',
         'border': 1, 'align': 'center'
     })
 
-    medium_priority_format = workbook.add_format({
+    formats['medium_priority'] = workbook.add_format({
         'bold': True, 'bg_color': '#FFA500', 'font_color': 'white',
         'border': 1, 'align': 'center'
     })
 
-    data_format = workbook.add_format({'border': 1, 'align': 'left', 'text_wrap': True})
-    number_format = workbook.add_format({'border': 1, 'align': 'center', 'num_format': '#,##0'})
-    currency_format = workbook.add_format({'border': 1, 'align': 'center', 'num_format': '₹#,##0'})
-    dropdown_format = workbook.add_format({
+    formats['data'] = workbook.add_format({'border': 1, 'align': 'left', 'text_wrap': True})
+    formats['number'] = workbook.add_format({'border': 1, 'align': 'center', 'num_format': '#,##0'})
+    formats['currency'] = workbook.add_format({'border': 1, 'align': 'center', 'num_format': '₹#,##0'})
+    formats['dropdown'] = workbook.add_format({
         'border': 1, 'align': 'center', 'bg_color': '#F2F2F2', 'locked': False
     })
 
-    # Enhanced target days for TOP 3 maximum scaling
-    enhanced_target_days = {
-        ('BOARDGAMING', 'GCR Extn.', 'Gurgaon'): 'Monday, Tuesday, Wednesday, Thursday, Friday, Saturday, Sunday',
-        ('BOARDGAMING', 'Golf Course Road', 'Gurgaon'): 'Monday, Wednesday, Thursday, Friday, Saturday, Sunday',
-        ('BOARDGAMING', 'MG Road', 'Gurgaon'): 'Monday, Tuesday, Thursday, Friday, Saturday, Sunday',
-        ('SOCIAL_DEDUCTIONS', 'GCR Extn.', 'Gurgaon'): 'Monday, Wednesday, Thursday, Friday, Saturday, Sunday',
-        ('SOCIAL_DEDUCTIONS', 'South City', 'Gurgaon'): 'Monday, Tuesday, Thursday, Friday, Saturday, Sunday',
-        ('MUSIC', 'GCR Extn.', 'Gurgaon'): 'Monday, Tuesday, Wednesday, Thursday, Saturday, Sunday',
-        ('MUSIC', 'Golf Course Road', 'Gurgaon'): 'Monday, Wednesday, Thursday, Friday, Saturday, Sunday',
-        ('MUSIC', 'South City', 'Gurgaon'): 'Monday, Tuesday, Thursday, Friday, Saturday, Sunday',
-    }
-
-    # Generate all actions first
-    club_launch_actions = []
-    club_expansion_actions = []
-    launch_counter = 1
-    expansion_counter = 1
-    start_date = datetime(2024, 10, 28)
-
-    # GENERATE CLUB LAUNCH ACTIONS
-    working_sheet_sorted = working_sheet.copy()
-    working_sheet_sorted['Revenue_Impact'] = working_sheet_sorted['Revenue by March'] - working_sheet_sorted['Current revenue']
-    working_sheet_sorted = working_sheet_sorted.sort_values('Revenue_Impact', ascending=False)
-
-    for idx, row in working_sheet_sorted.iterrows():
-        activity = row['Activity']
-        city = row['City']
-        area = row['Area']
-        current_clubs = row['Current_Clubs_Count'] if pd.notna(row['Current_Clubs_Count']) else 0
-        clubs_needed_feb = row['Clubs_Needed_Feb'] if pd.notna(row['Clubs_Needed_Feb']) else current_clubs
-
-        new_clubs_needed = clubs_needed_feb - current_clubs if clubs_needed_feb > current_clubs else 0
-
-        if new_clubs_needed > 0:
-            is_top3 = activity in TOP_3_MAXIMUM_SCALING
-
-            target_attendance = row['Total people in a meetup']
-            price = row['Average Price per Person (₹)']
-            target_revenue = row['Revenue by March']
-            current_revenue = row['Current revenue']
-            revenue_increase = target_revenue - current_revenue
-
-            # Get target days
-            key = (activity, area, city)
-            if key in enhanced_target_days:
-                target_days = enhanced_target_days[key]
-                target_meetups = len([d.strip() for d in target_days.split(',') if d.strip()])
-            else:
-                target_days = str(row['Target days by December in a week'])
-                try:
-                    if pd.notna(target_days) and target_days != 'nan':
-                        target_meetups = len([d.strip() for d in target_days.split(',') if d.strip()])
-                    else:
-                        target_meetups = 3
-                        target_days = 'Monday, Wednesday, Friday'
-                except:
-                    target_meetups = 3
-                    target_days = 'Monday, Wednesday, Friday'
-
-            revenue_per_club = revenue_increase / new_clubs_needed if new_clubs_needed > 0 else 0
-
-            # Timeline based on priority
-            if is_top3:
-                base_week = 2
-                priority_label = "HIGH"
-            else:
-                if revenue_per_club > 50000:
-                    base_week = 5
-                    priority_label = "MEDIUM"
-                else:
-                    base_week = 8
-                    priority_label = "LOW"
-
-            # Create individual launch actions for each new club
-            for club_num in range(1, int(new_clubs_needed) + 1):
-                target_week = base_week + ((launch_counter - 1) % 3)
-                target_date = (start_date + timedelta(weeks=target_week-1)).strftime('%b %d, %Y')
-
-                if new_clubs_needed == 1:
-                    club_name = f"{activity} Club - {area}"
-                    club_identifier = f"First club in {area}"
-                else:
-                    club_name = f"{activity} Club #{club_num} - {area}"
-                    club_identifier = f"Club {club_num} of {int(new_clubs_needed)} planned clubs"
-
-                if is_top3:
-                    action_prefix = "🔥 MAX SCALING LAUNCH"
-                else:
-                    action_prefix = "STANDARD LAUNCH"
-
-                specific_action = f"{action_prefix}: Launch {club_name} with {target_meetups} days/week ({target_days})"
-                success_criteria = f"Club operational with {int(target_attendance)} people/meetup for {2 if is_top3 else 3}+ weeks"
-
-                dependencies = [
-                    f"Secure venue for {target_meetups} days/week in {area}",
-                    f"Recruit Community Manager for {area}",
-                    f"Marketing campaign for {activity} in {area}",
-                    f"Equipment/setup for {int(target_attendance)} people capacity"
-                ]
-                dependencies_str = " | ".join(dependencies)
-
-                club_strategy = row['Club_Strategy']
-                strategy_notes = f"NEW AREA: {club_identifier} | TARGET: {target_days} ({int(target_attendance)} people) | REVENUE TARGET: ₹{revenue_per_club:,.0f} | STRATEGY: {club_strategy}"
-
-                club_launch_actions.append({
-                    'ID': f'LAUNCH_{launch_counter:03d}',
-                    'Type': f'{activity} Launch',
-                    'Priority': priority_label,
-                    'City': city,
-                    'Area': area,
-                    'Activity': activity,
-                    'Club_Name': club_name,
-                    'Target_Schedule': target_days,
-                    'Target_Capacity': int(target_attendance) if pd.notna(target_attendance) else 20,
-                    'Specific_Action': specific_action,
-                    'Success_Criteria': success_criteria,
-                    'Revenue_Target': revenue_per_club,
-                    'Target_Week': target_week,
-                    'Target_Date': target_date,
-                    'Duration': 2 if is_top3 else 3,
-                    'Owner': f'{activity.title()} Launch Team',
-                    'Dependencies': dependencies_str,
-                    'Strategy_Notes': strategy_notes
-                })
-                launch_counter += 1
-
-    # GENERATE CLUB EXPANSION ACTIONS
-    for idx, row in working_sheet.iterrows():
-        activity = row['Activity']
-        city = row['City']
-        area = row['Area']
-        current_clubs = row['Current_Clubs_Count'] if pd.notna(row['Current_Clubs_Count']) else 0
-
-        if current_clubs <= 0:
-            continue
-
-        current_meetups = row['Number of Meetups per Week currenty']
-        current_attendance = row['Average Attendance per Meetup']
-        target_attendance = row['Total people in a meetup']
-        current_revenue = row['Current revenue']
-        target_revenue = row['Revenue by March']
-        club_strategy = row['Club_Strategy']
-
-        is_top3 = activity in TOP_3_MAXIMUM_SCALING
-
-        current_days = str(row['Current Days with Meetups'])
-        key = (activity, area, city)
-        if key in enhanced_target_days:
-            target_days = enhanced_target_days[key]
-        else:
-            target_days = str(row['Target days by December in a week'])
-
-        # Parse days properly
-        try:
-            if pd.notna(current_days) and current_days != 'nan':
-                current_days_list = [d.strip() for d in current_days.split(',') if d.strip()]
-                current_days_clean = ', '.join(current_days_list)
-                current_meetups_calc = len(current_days_list)
-            else:
-                current_days_clean = f"{int(current_meetups)} days/week"
-                current_meetups_calc = current_meetups
-        except:
-            current_days_clean = f"{int(current_meetups)} days/week"
-            current_meetups_calc = current_meetups
+    return formats
 
-        try:
-            if pd.notna(target_days) and target_days != 'nan':
-                target_days_list = [d.strip() for d in target_days.split(',') if d.strip()]
-                target_days_clean = ', '.join(target_days_list)
-                target_meetups_calc = len(target_days_list)
-            else:
-                target_days_clean = target_days
-                target_meetups_calc = current_meetups_calc
-        except:
-            target_days_clean = target_days
-            target_meetups_calc = current_meetups_calc
-
-        meetup_increase = target_meetups_calc - current_meetups_calc if target_meetups_calc > current_meetups_calc else 0
-        people_increase = target_attendance - current_attendance if pd.notna(target_attendance) and pd.notna(current_attendance) else 0
-        revenue_increase = target_revenue - current_revenue
-
-        if meetup_increase > 0 or people_increase > 0 or revenue_increase > 1000:
-            if current_clubs == 1:
-                club_to_expand = f"{activity} Club - {area}"
-                club_identifier = f"Only club in {area}"
-            else:
-                club_to_expand = f"{activity} Main Club - {area}"
-                club_identifier = f"Primary club (1 of {int(current_clubs)} clubs)"
-
-            changes = []
-            if meetup_increase > 0:
-                changes.append(f"Expand from {current_meetups_calc} to {target_meetups_calc} days/week")
-                changes.append(f"Current: {current_days_clean}")
-                changes.append(f"Target: {target_days_clean}")
-
-            if people_increase > 0:
-                changes.append(f"Increase capacity from {int(current_attendance)} to {int(target_attendance)} people/meetup")
-
-            if is_top3:
-                base_week = 1
-                priority_label = "HIGH"
-            else:
-                activity_revenue = working_sheet[working_sheet['Activity'] == activity]['Revenue by March'].sum() - working_sheet[working_sheet['Activity'] == activity]['Current revenue'].sum()
-                if activity_revenue > 300000:
-                    base_week = 6
-                    priority_label = "MEDIUM"
-                else:
-                    base_week = 10
-                    priority_label = "LOW"
-
-            target_week = base_week + (expansion_counter % 2)
-            target_date = (start_date + timedelta(weeks=target_week-1)).strftime('%b %d, %Y')
-
-            if is_top3:
-                action_prefix = "🔥 MAX SCALING"
-            else:
-                action_prefix = "STANDARD SCALING"
-
-            specific_action = f"{action_prefix}: Expand {club_to_expand} - {' | '.join(changes)}"
-            success_criteria = f"Club operational with target schedule and capacity for {2 if is_top3 else 3}+ consecutive weeks"
-
-            dependencies = []
-            if meetup_increase > 0:
-                dependencies.append(f"Secure venue access for {target_meetups_calc} days/week")
-                dependencies.append(f"Confirm {target_days_clean} availability")
-            if people_increase > 0:
-                dependencies.append(f"Venue capacity for {int(target_attendance)} people")
-            dependencies.append("Community Manager capacity planning")
-
-            dependencies_str = " | ".join(dependencies)
-            strategy_notes = f"CLUB: {club_identifier} | CURRENT: {current_days_clean} ({int(current_attendance)} people) | TARGET: {target_days_clean} ({int(target_attendance)} people) | STRATEGY: {club_strategy}"
-
-            club_expansion_actions.append({
-                'ID': f'EXP_{expansion_counter:03d}',
-                'Type': f'{activity} Expansion',
-                'Priority': priority_label,
-                'City': city,
-                'Area': area,
-                'Activity': activity,
-                'Club_To_Expand': club_to_expand,
-                'Current_Schedule': current_days_clean,
-                'Target_Schedule': target_days_clean,
-                'Current_Capacity': int(current_attendance) if pd.notna(current_attendance) else 0,
-                'Target_Capacity': int(target_attendance) if pd.notna(target_attendance) else 0,
-                'Specific_Action': specific_action,
-                'Success_Criteria': success_criteria,
-                'Revenue_Impact': revenue_increase,
-                'Target_Week': target_week,
-                'Target_Date': target_date,
-                'Duration': 2 if is_top3 else 3,
-                'Owner': f'{activity.title()} Expansion Team',
-                'Dependencies': dependencies_str,
-                'Strategy_Notes': strategy_notes
-            })
-            expansion_counter += 1
-
-    # 1. CLUB EXPANSION SHEET
-    print("📊 1. Creating Club Expansion sheet...")
-    ws_expansions = workbook.add_worksheet('Club_Expansion')
+def write_expansion_sheet(ws_expansions, formats, club_expansion_actions, top3_activities):
+    """
+    Club_Expansion: one row per expansion action of an ActionTable
+    """
+    header_format, max_scaling_format, data_format, number_format, currency_format, dropdown_format = (
+        formats['header'], formats['max_scaling'], formats['data'], formats['number'], formats['currency'], formats['dropdown']
+    )
 
     expansion_headers = [
         'Action ID', 'Week Group', 'Type', 'Priority', 'City', 'Area', 'Activity',
@@ -341,13 +89,11 @@ def create_exact_plan_structure():
         else:
             ws_expansions.set_column(col, col, 12)
 
-    club_expansion_actions.sort(key=lambda x: (0 if x['Activity'] in TOP_3_MAXIMUM_SCALING else 1, x['Target_Week']))
-
-    for row_idx, action in enumerate(club_expansion_actions, start=1):
+    for row_idx, action in enumerate(club_expansion_actions.records(), start=1):
         week = action['Target_Week']
         week_group = f"Nov 2024 (W{week})" if week <= 4 else f"Dec 2024 (W{week})" if week <= 8 else f"Jan 2025 (W{week})" if week <= 13 else f"Feb 2025 (W{week})"
 
-        is_top3_action = action['Activity'] in TOP_3_MAXIMUM_SCALING
+        is_top3_action = action['Activity'] in top3_activities
         format_to_use = max_scaling_format if is_top3_action else data_format
 
         ws_expansions.write(row_idx, 0, action['ID'], format_to_use)
@@ -378,9 +124,13 @@ def create_exact_plan_structure():
         ws_expansions.write(row_idx, 19, action['Dependencies'], data_format)
         ws_expansions.write(row_idx, 20, action['Strategy_Notes'], data_format)
 
-    # 2. CLUB LAUNCHES SHEET
-    print("📊 2. Creating Club Launches sheet...")
-    ws_launches = workbook.add_worksheet('Club_Launches')
+def write_launch_sheet(ws_launches, formats, club_launch_actions, top3_activities):
+    """
+    Club_Launches: one row per launch action of an ActionTable
+    """
+    header_format, max_scaling_format, data_format, number_format, currency_format, dropdown_format = (
+        formats['header'], formats['max_scaling'], formats['data'], formats['number'], formats['currency'], formats['dropdown']
+    )
 
     launch_headers = [
         'Action ID', 'Week Group', 'Type', 'Priority', 'City', 'Area', 'Activity',
@@ -398,13 +148,11 @@ def create_exact_plan_structure():
         else:
             ws_launches.set_column(col, col, 12)
 
-    club_launch_actions.sort(key=lambda x: (0 if x['Activity'] in TOP_3_MAXIMUM_SCALING else 1, x['Target_Week']))
-
-    for row_idx, action in enumerate(club_launch_actions, start=1):
+    for row_idx, action in enumerate(club_launch_actions.records(), start=1):
         week = action['Target_Week']
         week_group = f"Nov 2024 (W{week})" if week <= 4 else f"Dec 2024 (W{week})" if week <= 8 else f"Jan 2025 (W{week})" if week <= 13 else f"Feb 2025 (W{week})"
 
-        is_top3_action = action['Activity'] in TOP_3_MAXIMUM_SCALING
+        is_top3_action = action['Activity'] in top3_activities
         format_to_use = max_scaling_format if is_top3_action else data_format
 
         ws_launches.write(row_idx, 0, action['ID'], format_to_use)
@@ -433,9 +181,13 @@ def create_exact_plan_structure():
         ws_launches.write(row_idx, 17, action['Dependencies'], data_format)
         ws_launches.write(row_idx, 18, action['Strategy_Notes'], data_format)
 
-    # 3. SUMMARY SHEET
-    print("📊 3. Creating Summary sheet...")
-    ws_summary = workbook.add_worksheet('Summary')
+def write_summary_sheet(ws_summary, formats, summary_data):
+    """
+    Summary: high-level metrics and targets
+    """
+    header_format, max_scaling_format, high_priority_format, medium_priority_format, data_format = (
+        formats['header'], formats['max_scaling'], formats['high_priority'], formats['medium_priority'], formats['data']
+    )
 
     summary_headers = [
         'Metric', 'Current State', 'Target State', 'Gap', 'Actions Required', 'Timeline', 'Priority'
@@ -445,14 +197,271 @@ def create_exact_plan_structure():
         ws_summary.write(0, col, header, header_format)
         ws_summary.set_column(col, col, 18)
 
-    total_current_clubs = working_sheet['Current_Clubs_Count'].sum()
-    total_target_clubs = working_sheet['Clubs_Needed_Feb'].sum()
-    total_current_revenue = working_sheet['Current revenue'].sum()
-    total_target_revenue = working_sheet['Revenue by March'].sum()
+    for row_idx, data in enumerate(summary_data, start=1):
+        priority_format_to_use = max_scaling_format if data['Priority'] == 'CRITICAL' else high_priority_format if data['Priority'] == 'HIGH' else medium_priority_format
+
+        ws_summary.write(row_idx, 0, data['Metric'], priority_format_to_use)
+        ws_summary.write(row_idx, 1, data['Current'], data_format)
+        ws_summary.write(row_idx, 2, data['Target'], data_format)
+        ws_summary.write(row_idx, 3, data['Gap'], data_format)
+        ws_summary.write(row_idx, 4, data['Actions'], data_format)
+        ws_summary.write(row_idx, 5, data['Timeline'], data_format)
+        ws_summary.write(row_idx, 6, data['Priority'], priority_format_to_use)
+
+def write_weekly_sheet(ws_weekly, formats, weekly_plan):
+    """
+    Weekly_Execution: 16-week execution plan
+    """
+    header_format, high_priority_format, medium_priority_format, data_format, number_format, currency_format = (
+        formats['header'], formats['high_priority'], formats['medium_priority'], formats['data'], formats['number'], formats['currency']
+    )
+
+    weekly_headers = [
+        'Week', 'Period', 'Focus Area', 'Launch Actions', 'Expansion Actions',
+        'Revenue Target (₹)', 'Key Activities', 'Success Metrics', 'Risks & Mitigation'
+    ]
+
+    for col, header in enumerate(weekly_headers):
+        ws_weekly.write(0, col, header, header_format)
+        ws_weekly.set_column(col, col, 20)
+
+    for row_idx, plan in enumerate(weekly_plan, start=1):
+        week_num = row_idx
+        is_priority_week = week_num <= 8
+        format_to_use = high_priority_format if is_priority_week else medium_priority_format
+
+        ws_weekly.write(row_idx, 0, plan['Week'], format_to_use)
+        ws_weekly.write(row_idx, 1, plan['Period'], format_to_use)
+        ws_weekly.write(row_idx, 2, plan['Focus'], format_to_use)
+        ws_weekly.write(row_idx, 3, plan['Launch_Actions'], number_format)
+        ws_weekly.write(row_idx, 4, plan['Expansion_Actions'], number_format)
+        ws_weekly.write(row_idx, 5, plan['Revenue_Target'], currency_format)
+        ws_weekly.write(row_idx, 6, plan['Activities'], data_format)
+        ws_weekly.write(row_idx, 7, plan['Metrics'], data_format)
+        ws_weekly.write(row_idx, 8, plan['Risks'], data_format)
+
+def write_milestone_sheet(ws_milestone, formats, milestones):
+    """
+    Milestone: key milestone tracking
+    """
+    header_format, max_scaling_format, high_priority_format, data_format, number_format, dropdown_format = (
+        formats['header'], formats['max_scaling'], formats['high_priority'], formats['data'], formats['number'], formats['dropdown']
+    )
+
+    milestone_headers = [
+        'Milestone ID', 'Description', 'Target Date', 'Priority', 'Dependencies',
+        'Success Criteria', 'Owner', 'Status', 'Progress %', 'Notes'
+    ]
+
+    for col, header in enumerate(milestone_headers):
+        ws_milestone.write(0, col, header, header_format)
+        ws_milestone.set_column(col, col, 18)
+
+    for row_idx, milestone in enumerate(milestones, start=1):
+        priority_format_to_use = max_scaling_format if milestone['Priority'] == 'CRITICAL' else high_priority_format
+
+        ws_milestone.write(row_idx, 0, milestone['ID'], priority_format_to_use)
+        ws_milestone.write(row_idx, 1, milestone['Description'], data_format)
+        ws_milestone.write(row_idx, 2, milestone['Date'], data_format)
+        ws_milestone.write(row_idx, 3, milestone['Priority'], priority_format_to_use)
+        ws_milestone.write(row_idx, 4, milestone['Dependencies'], data_format)
+        ws_milestone.write(row_idx, 5, milestone['Success'], data_format)
+        ws_milestone.write(row_idx, 6, milestone['Owner'], data_format)
+
+        ws_milestone.data_validation(row_idx, 7, row_idx, 7, {
+            'validate': 'list',
+            'source': ['NOT_STARTED', 'IN_PROGRESS', 'BLOCKED', 'DONE']
+        })
+        ws_milestone.write(row_idx, 7, milestone['Status'], dropdown_format)
+
+        ws_milestone.write(row_idx, 8, milestone['Progress'], number_format)
+        ws_milestone.write(row_idx, 9, milestone['Notes'], data_format)
+
+def write_city_progress_sheet(ws_city, formats, city_progress, top3_activities):
+    """
+    City_Progress: progress by city and activity
+    """
+    header_format, max_scaling_format, data_format, number_format, currency_format = (
+        formats['header'], formats['max_scaling'], formats['data'], formats['number'], formats['currency']
+    )
+
+    city_headers = [
+        'City', 'Activity', 'Current Clubs', 'Target Clubs', 'New Clubs Needed',
+        'Current Revenue', 'Target Revenue', 'Revenue Gap', 'Progress %',
+        'Launch Actions', 'Expansion Actions', 'Total Actions', 'Priority Level'
+    ]
+
+    for col, header in enumerate(city_headers):
+        ws_city.write(0, col, header, header_format)
+        ws_city.set_column(col, col, 15)
+
+    for row_idx, progress in enumerate(city_progress, start=1):
+        is_top3_activity = progress['Activity'] in top3_activities
+        format_to_use = max_scaling_format if is_top3_activity else data_format
+
+        ws_city.write(row_idx, 0, progress['City'], data_format)
+        ws_city.write(row_idx, 1, progress['Activity'], format_to_use)
+        ws_city.write(row_idx, 2, progress['Current_Clubs'], number_format)
+        ws_city.write(row_idx, 3, progress['Target_Clubs'], number_format)
+        ws_city.write(row_idx, 4, progress['New_Clubs_Needed'], number_format)
+        ws_city.write(row_idx, 5, progress['Current_Revenue'], currency_format)
+        ws_city.write(row_idx, 6, progress['Target_Revenue'], currency_format)
+        ws_city.write(row_idx, 7, progress['Revenue_Gap'], currency_format)
+        ws_city.write(row_idx, 8, progress['Progress_Pct'], number_format)
+        ws_city.write(row_idx, 9, progress['Launch_Actions'], number_format)
+        ws_city.write(row_idx, 10, progress['Expansion_Actions'], number_format)
+        ws_city.write(row_idx, 11, progress['Total_Actions'], number_format)
+        ws_city.write(row_idx, 12, progress['Priority_Level'], format_to_use)
+
+def write_working_sheet(ws_working, formats, working_sheet):
+    """
+    Working_Sheet: the original master data
+    """
+    header_format, data_format = formats['header'], formats['data']
+
+    for col_idx, col_name in enumerate(working_sheet.columns):
+        ws_working.write(0, col_idx, col_name, header_format)
+        ws_working.set_column(col_idx, col_idx, 15 if col_idx < 9 else 12)
+
+    for row_idx, (idx, row) in enumerate(working_sheet.iterrows(), start=1):
+        for col_idx, value in enumerate(row):
+            if pd.isna(value):
+                value = ""
+            ws_working.write(row_idx, col_idx, value, data_format)
+
+def write_events_sheet(ws_events, formats, events_sheet):
+    """
+    Events: the original events data, kept as is
+    """
+    header_format, data_format = formats['header'], formats['data']
+
+    if events_sheet is not None:
+        for col_idx, col_name in enumerate(events_sheet.columns):
+            ws_events.write(0, col_idx, col_name, header_format)
+            ws_events.set_column(col_idx, col_idx, 15)
+
+        for row_idx, (idx, row) in enumerate(events_sheet.iterrows(), start=1):
+            for col_idx, value in enumerate(row):
+                if pd.isna(value):
+                    value = ""
+                ws_events.write(row_idx, col_idx, value, data_format)
+    else:
+        ws_events.write(0, 0, "Events sheet not found in original file", header_format)
+
+def write_logic_sheet(ws_logic, formats, logic_explanations):
+    """
+    Logic: calculation explanations and formulas
+    """
+    header_format, high_priority_format, data_format = (
+        formats['header'], formats['high_priority'], formats['data']
+    )
+
+    logic_headers = ['Component', 'Logic', 'Formula/Calculation', 'Purpose']
+
+    for col, header in enumerate(logic_headers):
+        ws_logic.write(0, col, header, header_format)
+        ws_logic.set_column(col, col, 25)
+
+    for row_idx, logic in enumerate(logic_explanations, start=1):
+        ws_logic.write(row_idx, 0, logic['Component'], high_priority_format)
+        ws_logic.write(row_idx, 1, logic['Logic'], data_format)
+        ws_logic.write(row_idx, 2, logic['Formula'], data_format)
+        ws_logic.write(row_idx, 3, logic['Purpose'], data_format)
+
+def build_plan(working_sheet, top3_activities=TOP_3_MAXIMUM_SCALING, enhanced_target_days=ENHANCED_TARGET_DAYS,
+               start_date=PLAN_START_DATE, launch_revenue_threshold=LAUNCH_REVENUE_THRESHOLD,
+               expansion_revenue_threshold=EXPANSION_REVENUE_THRESHOLD, plan_state=None, row_keys=None):
+    """
+    Compute the generated content of the plan from a parsed Working sheet
+
+    Returns a dict with the sorted launch/expansion actions and the Summary,
+    Weekly, Milestone, City_Progress and Logic rows. launch_revenue_threshold
+    is the MEDIUM cut-off for launch revenue per club and the City_Progress
+    revenue gap, expansion_revenue_threshold the one for the activity-wide
+    revenue gap of expansions.
+    """
+    # Per-activity aggregates shared by the generators, Summary and City_Progress
+    with span('activity_stats', rows_in=len(working_sheet)):
+        activity_stats = ActivityStats(working_sheet)
+
+    # GENERATE CLUB LAUNCH ACTIONS
+    with span('generate_launches', rows_in=len(working_sheet)) as stage:
+        club_launch_actions = generate_launch_actions(
+            working_sheet, top3_activities, enhanced_target_days, start_date,
+            fragment_cache=plan_state.launch_cache if plan_state else None, row_keys=row_keys,
+            revenue_threshold=launch_revenue_threshold
+        )
+        stage.rows_out = len(club_launch_actions)
+
+    # GENERATE CLUB EXPANSION ACTIONS
+    with span('generate_expansions', rows_in=len(working_sheet)) as stage:
+        club_expansion_actions = generate_expansion_actions(
+            working_sheet, top3_activities, enhanced_target_days, start_date, activity_stats,
+            fragment_cache=plan_state.expansion_cache if plan_state else None, row_keys=row_keys,
+            revenue_threshold=expansion_revenue_threshold
+        )
+        stage.rows_out = len(club_expansion_actions)
+
+    # TOP 3 first, then by target week
+    with span('sort_actions', rows_in=len(club_launch_actions) + len(club_expansion_actions)):
+        club_expansion_actions.sort_for_plan(top3_activities)
+        club_launch_actions.sort_for_plan(top3_activities)
+
+    with span('plan_rollups', rows_in=len(club_launch_actions) + len(club_expansion_actions)) as stage:
+        plan = _plan_rollups(working_sheet, club_launch_actions, club_expansion_actions, activity_stats,
+                             top3_activities, launch_revenue_threshold,
+                             city_cache=plan_state.city_cache if plan_state else None, row_keys=row_keys)
+        stage.rows_out = len(plan['city_progress'])
+    return plan
+
+def _city_progress_row(activity, city, current_clubs, target_clubs, current_revenue, target_revenue,
+                       launch_actions_count, expansion_actions_count, top3_activities, launch_revenue_threshold):
+    """
+    City_Progress row of one Working-sheet row and its (Activity, City) action counts
+    """
+    new_clubs_needed = target_clubs - current_clubs if target_clubs > current_clubs else 0
+    revenue_gap = target_revenue - current_revenue
+    progress_pct = (current_revenue / target_revenue * 100) if target_revenue > 0 else 100
+    total_actions = launch_actions_count + expansion_actions_count
+
+    is_top3 = activity in top3_activities
+    priority_level = "HIGH" if is_top3 else "MEDIUM" if revenue_gap > launch_revenue_threshold else "LOW"
+
+    return {
+        'City': city,
+        'Activity': activity,
+        'Current_Clubs': current_clubs,
+        'Target_Clubs': target_clubs,
+        'New_Clubs_Needed': new_clubs_needed,
+        'Current_Revenue': current_revenue,
+        'Target_Revenue': target_revenue,
+        'Revenue_Gap': revenue_gap,
+        'Progress_Pct': progress_pct,
+        'Launch_Actions': launch_actions_count,
+        'Expansion_Actions': expansion_actions_count,
+        'Total_Actions': total_actions,
+        'Priority_Level': priority_level
+    }
+
+def _plan_rollups(working_sheet, club_launch_actions, club_expansion_actions, activity_stats,
+                  top3_activities, launch_revenue_threshold, city_cache=None, row_keys=None):
+    """
+    Summary, Weekly, Milestone, City_Progress and Logic rows of the sorted actions
+
+    With a city_cache (plan_state.FragmentCache) and the Working-sheet
+    row_keys, a City_Progress row is only computed again when its
+    Working-sheet row or its (Activity, City) action counts changed.
+    """
+
+    # 3. SUMMARY SHEET
+    total_current_clubs = activity_stats.total_current_clubs
+    total_target_clubs = activity_stats.total_target_clubs
+    total_current_revenue = activity_stats.total_current_revenue
+    total_target_revenue = activity_stats.total_target_revenue
     total_launch_actions = len(club_launch_actions)
     total_expansion_actions = len(club_expansion_actions)
-    top3_launch_actions = len([a for a in club_launch_actions if a['Activity'] in TOP_3_MAXIMUM_SCALING])
-    top3_expansion_actions = len([a for a in club_expansion_actions if a['Activity'] in TOP_3_MAXIMUM_SCALING])
+    top3_launch_actions = club_launch_actions.count_activities(top3_activities)
+    top3_expansion_actions = club_expansion_actions.count_activities(top3_activities)
 
     summary_data = [
         {
@@ -493,29 +502,9 @@ def create_exact_plan_structure():
         }
     ]
 
-    for row_idx, data in enumerate(summary_data, start=1):
-        priority_format_to_use = max_scaling_format if data['Priority'] == 'CRITICAL' else high_priority_format if data['Priority'] == 'HIGH' else medium_priority_format
-
-        ws_summary.write(row_idx, 0, data['Metric'], priority_format_to_use)
-        ws_summary.write(row_idx, 1, data['Current'], data_format)
-        ws_summary.write(row_idx, 2, data['Target'], data_format)
-        ws_summary.write(row_idx, 3, data['Gap'], data_format)
-        ws_summary.write(row_idx, 4, data['Actions'], data_format)
-        ws_summary.write(row_idx, 5, data['Timeline'], data_format)
-        ws_summary.write(row_idx, 6, data['Priority'], priority_format_to_use)
-
     # 4. WEEKLY EXECUTION SHEET
-    print("📊 4. Creating Weekly Execution sheet...")
-    ws_weekly = workbook.add_worksheet('Weekly_Execution')
-
-    weekly_headers = [
-        'Week', 'Period', 'Focus Area', 'Launch Actions', 'Expansion Actions',
-        'Revenue Target (₹)', 'Key Activities', 'Success Metrics', 'Risks & Mitigation'
-    ]
-
-    for col, header in enumerate(weekly_headers):
-        ws_weekly.write(0, col, header, header_format)
-        ws_weekly.set_column(col, col, 20)
+    # Group the (sorted) actions once for the weekly and city rollups
+    action_index = ActionIndex(club_launch_actions, club_expansion_actions)
 
     weekly_plan = []
     for week in range(1, 17):
@@ -532,11 +521,11 @@ def create_exact_plan_structure():
             period = f"Feb 2025 (W{week})"
             focus = "Optimization & Final Push"
 
-        week_launches = len([a for a in club_launch_actions if a['Target_Week'] == week])
-        week_expansions = len([a for a in club_expansion_actions if a['Target_Week'] == week])
+        week_actions = action_index.for_week(week)
+        week_launches = week_actions['Launch_Actions']
+        week_expansions = week_actions['Expansion_Actions']
 
-        week_revenue = sum([a['Revenue_Target'] for a in club_launch_actions if a['Target_Week'] == week]) + \
-                      sum([a['Revenue_Impact'] for a in club_expansion_actions if a['Target_Week'] == week])
+        week_revenue = week_actions['Launch_Revenue'] + week_actions['Expansion_Revenue']
 
         if week <= 4:
             activities = "Expand existing TOP 3 clubs to maximum days"
@@ -567,34 +556,7 @@ def create_exact_plan_structure():
             'Risks': risks
         })
 
-    for row_idx, plan in enumerate(weekly_plan, start=1):
-        week_num = row_idx
-        is_priority_week = week_num <= 8
-        format_to_use = high_priority_format if is_priority_week else medium_priority_format
-
-        ws_weekly.write(row_idx, 0, plan['Week'], format_to_use)
-        ws_weekly.write(row_idx, 1, plan['Period'], format_to_use)
-        ws_weekly.write(row_idx, 2, plan['Focus'], format_to_use)
-        ws_weekly.write(row_idx, 3, plan['Launch_Actions'], number_format)
-        ws_weekly.write(row_idx, 4, plan['Expansion_Actions'], number_format)
-        ws_weekly.write(row_idx, 5, plan['Revenue_Target'], currency_format)
-        ws_weekly.write(row_idx, 6, plan['Activities'], data_format)
-        ws_weekly.write(row_idx, 7, plan['Metrics'], data_format)
-        ws_weekly.write(row_idx, 8, plan['Risks'], data_format)
-
     # 5. MILESTONE SHEET
-    print("📊 5. Creating Milestone sheet...")
-    ws_milestone = workbook.add_worksheet('Milestone')
-
-    milestone_headers = [
-        'Milestone ID', 'Description', 'Target Date', 'Priority', 'Dependencies',
-        'Success Criteria', 'Owner', 'Status', 'Progress %', 'Notes'
-    ]
-
-    for col, header in enumerate(milestone_headers):
-        ws_milestone.write(0, col, header, header_format)
-        ws_milestone.set_column(col, col, 18)
-
     milestones = [
         {
             'ID': 'M001',
@@ -646,137 +608,29 @@ def create_exact_plan_structure():
         }
     ]
 
-    for row_idx, milestone in enumerate(milestones, start=1):
-        priority_format_to_use = max_scaling_format if milestone['Priority'] == 'CRITICAL' else high_priority_format
-
-        ws_milestone.write(row_idx, 0, milestone['ID'], priority_format_to_use)
-        ws_milestone.write(row_idx, 1, milestone['Description'], data_format)
-        ws_milestone.write(row_idx, 2, milestone['Date'], data_format)
-        ws_milestone.write(row_idx, 3, milestone['Priority'], priority_format_to_use)
-        ws_milestone.write(row_idx, 4, milestone['Dependencies'], data_format)
-        ws_milestone.write(row_idx, 5, milestone['Success'], data_format)
-        ws_milestone.write(row_idx, 6, milestone['Owner'], data_format)
-
-        ws_milestone.data_validation(row_idx, 7, row_idx, 7, {
-            'validate': 'list',
-            'source': ['NOT_STARTED', 'IN_PROGRESS', 'BLOCKED', 'DONE']
-        })
-        ws_milestone.write(row_idx, 7, milestone['Status'], dropdown_format)
-
-        ws_milestone.write(row_idx, 8, milestone['Progress'], number_format)
-        ws_milestone.write(row_idx, 9, milestone['Notes'], data_format)
-
     # 6. CITY PROGRESS SHEET
-    print("📊 6. Creating City Progress sheet...")
-    ws_city = workbook.add_worksheet('City_Progress')
-
-    city_headers = [
-        'City', 'Activity', 'Current Clubs', 'Target Clubs', 'New Clubs Needed',
-        'Current Revenue', 'Target Revenue', 'Revenue Gap', 'Progress %',
-        'Launch Actions', 'Expansion Actions', 'Total Actions', 'Priority Level'
-    ]
-
-    for col, header in enumerate(city_headers):
-        ws_city.write(0, col, header, header_format)
-        ws_city.set_column(col, col, 15)
-
     city_progress = []
-    for idx, row in working_sheet.iterrows():
-        activity = row['Activity']
-        city = row['City']
-        current_clubs = row['Current_Clubs_Count'] if pd.notna(row['Current_Clubs_Count']) else 0
-        target_clubs = row['Clubs_Needed_Feb'] if pd.notna(row['Clubs_Needed_Feb']) else current_clubs
-        current_revenue = row['Current revenue']
-        target_revenue = row['Revenue by March']
-
-        new_clubs_needed = target_clubs - current_clubs if target_clubs > current_clubs else 0
-        revenue_gap = target_revenue - current_revenue
-        progress_pct = (current_revenue / target_revenue * 100) if target_revenue > 0 else 100
-
-        launch_actions_count = len([a for a in club_launch_actions if a['Activity'] == activity and a['City'] == city])
-        expansion_actions_count = len([a for a in club_expansion_actions if a['Activity'] == activity and a['City'] == city])
-        total_actions = launch_actions_count + expansion_actions_count
-
-        is_top3 = activity in TOP_3_MAXIMUM_SCALING
-        priority_level = "HIGH" if is_top3 else "MEDIUM" if revenue_gap > 50000 else "LOW"
-
-        city_progress.append({
-            'City': city,
-            'Activity': activity,
-            'Current_Clubs': current_clubs,
-            'Target_Clubs': target_clubs,
-            'New_Clubs_Needed': new_clubs_needed,
-            'Current_Revenue': current_revenue,
-            'Target_Revenue': target_revenue,
-            'Revenue_Gap': revenue_gap,
-            'Progress_Pct': progress_pct,
-            'Launch_Actions': launch_actions_count,
-            'Expansion_Actions': expansion_actions_count,
-            'Total_Actions': total_actions,
-            'Priority_Level': priority_level
-        })
-
-    city_progress.sort(key=lambda x: (0 if x['Activity'] in TOP_3_MAXIMUM_SCALING else 1, -x['Revenue_Gap']))
-
-    for row_idx, progress in enumerate(city_progress, start=1):
-        is_top3_activity = progress['Activity'] in TOP_3_MAXIMUM_SCALING
-        format_to_use = max_scaling_format if is_top3_activity else data_format
-
-        ws_city.write(row_idx, 0, progress['City'], data_format)
-        ws_city.write(row_idx, 1, progress['Activity'], format_to_use)
-        ws_city.write(row_idx, 2, progress['Current_Clubs'], number_format)
-        ws_city.write(row_idx, 3, progress['Target_Clubs'], number_format)
-        ws_city.write(row_idx, 4, progress['New_Clubs_Needed'], number_format)
-        ws_city.write(row_idx, 5, progress['Current_Revenue'], currency_format)
-        ws_city.write(row_idx, 6, progress['Target_Revenue'], currency_format)
-        ws_city.write(row_idx, 7, progress['Revenue_Gap'], currency_format)
-        ws_city.write(row_idx, 8, progress['Progress_Pct'], number_format)
-        ws_city.write(row_idx, 9, progress['Launch_Actions'], number_format)
-        ws_city.write(row_idx, 10, progress['Expansion_Actions'], number_format)
-        ws_city.write(row_idx, 11, progress['Total_Actions'], number_format)
-        ws_city.write(row_idx, 12, progress['Priority_Level'], format_to_use)
-
-    # 7. WORKING SHEET (Original)
-    print("📊 7. Creating Working Sheet (original)...")
-    ws_working = workbook.add_worksheet('Working_Sheet')
-
-    for col_idx, col_name in enumerate(working_sheet.columns):
-        ws_working.write(0, col_idx, col_name, header_format)
-        ws_working.set_column(col_idx, col_idx, 15 if col_idx < 9 else 12)
-
-    for row_idx, (idx, row) in enumerate(working_sheet.iterrows(), start=1):
-        for col_idx, value in enumerate(row):
-            if pd.isna(value):
-                value = ""
-            ws_working.write(row_idx, col_idx, value, data_format)
-
-    # 8. EVENTS SHEET (Original - keep as is)
-    print("📊 8. Creating Events sheet (original)...")
-    ws_events = workbook.add_worksheet('Events')
+    row_keys = row_keys.tolist() if row_keys is not None else [None] * len(working_sheet)
+    for row_key, activity, city, current_clubs, target_clubs, current_revenue, target_revenue in zip(
+            row_keys, working_sheet['Activity'], working_sheet['City'],
+            activity_stats.current_clubs.tolist(), activity_stats.target_clubs.tolist(),
+            working_sheet['Current revenue'].tolist(), working_sheet['Revenue by March'].tolist()):
+        city_actions = action_index.for_activity_city(activity, city)
+        launch_actions_count = city_actions['Launch_Actions']
+        expansion_actions_count = city_actions['Expansion_Actions']
+
+        row_args = (activity, city, current_clubs, target_clubs, current_revenue, target_revenue,
+                    launch_actions_count, expansion_actions_count, top3_activities, launch_revenue_threshold)
+        if city_cache is None:
+            city_progress.append(_city_progress_row(*row_args))
+        else:
+            city_progress.append(city_cache.get_or_render(
+                (row_key, launch_actions_count, expansion_actions_count), lambda: _city_progress_row(*row_args)
+            ))
 
-    if events_sheet is not None:
-        for col_idx, col_name in enumerate(events_sheet.columns):
-            ws_events.write(0, col_idx, col_name, header_format)
-            ws_events.set_column(col_idx, col_idx, 15)
-
-        for row_idx, (idx, row) in enumerate(events_sheet.iterrows(), start=1):
-            for col_idx, value in enumerate(row):
-                if pd.isna(value):
-                    value = ""
-                ws_events.write(row_idx, col_idx, value, data_format)
-    else:
-        ws_events.write(0, 0, "Events sheet not found in original file", header_format)
+    city_progress.sort(key=lambda x: (0 if x['Activity'] in top3_activities else 1, -x['Revenue_Gap']))
 
     # 9. LOGIC SHEET
-    print("📊 9. Creating Logic sheet...")
-    ws_logic = workbook.add_worksheet('Logic')
-
-    logic_headers = ['Component', 'Logic', 'Formula/Calculation', 'Purpose']
-
-    for col, header in enumerate(logic_headers):
-        ws_logic.write(0, col, header, header_format)
-        ws_logic.set_column(col, col, 25)
-
     logic_explanations = [
         {
             'Component': 'Club Launches',
@@ -810,22 +664,134 @@ def create_exact_plan_structure():
         },
         {
             'Component': 'Priority Assignment',
-            'Logic': 'HIGH for TOP 3, MEDIUM for revenue >50k, LOW for others',
-            'Formula': 'IF(TOP3, "HIGH", IF(revenue_gap > 50000, "MEDIUM", "LOW"))',
+            'Logic': f'HIGH for TOP 3, MEDIUM for revenue >{launch_revenue_threshold / 1000:g}k, LOW for others',
+            'Formula': f'IF(TOP3, "HIGH", IF(revenue_gap > {launch_revenue_threshold}, "MEDIUM", "LOW"))',
             'Purpose': 'Resource allocation based on impact'
         }
     ]
 
-    for row_idx, logic in enumerate(logic_explanations, start=1):
-        ws_logic.write(row_idx, 0, logic['Component'], high_priority_format)
-        ws_logic.write(row_idx, 1, logic['Logic'], data_format)
-        ws_logic.write(row_idx, 2, logic['Formula'], data_format)
-        ws_logic.write(row_idx, 3, logic['Purpose'], data_format)
+    return {
+        'club_expansion_actions': club_expansion_actions,
+        'club_launch_actions': club_launch_actions,
+        'summary_data': summary_data,
+        'weekly_plan': weekly_plan,
+        'milestones': milestones,
+        'city_progress': city_progress,
+        'logic_explanations': logic_explanations,
+    }
+
+def plan_sheet_jobs(plan, working_sheet, events_sheet, top3_activities=TOP_3_MAXIMUM_SCALING):
+    """
+    The nine plan sheets in order as (sheet name, write_sheet, args)
+    """
+    return [
+        ('Club_Expansion', write_expansion_sheet, (plan['club_expansion_actions'], top3_activities)),
+        ('Club_Launches', write_launch_sheet, (plan['club_launch_actions'], top3_activities)),
+        ('Summary', write_summary_sheet, (plan['summary_data'],)),
+        ('Weekly_Execution', write_weekly_sheet, (plan['weekly_plan'],)),
+        ('Milestone', write_milestone_sheet, (plan['milestones'],)),
+        ('City_Progress', write_city_progress_sheet, (plan['city_progress'], top3_activities)),
+        ('Working_Sheet', write_working_sheet, (working_sheet,)),
+        ('Events', write_events_sheet, (events_sheet,)),
+        ('Logic', write_logic_sheet, (plan['logic_explanations'],)),
+    ]
+
+def write_plan_workbook(output_file, sheet_jobs, parallel=False, plan_state=None):
+    """
+    Write the plan sheets into output_file, in a process pool when parallel
+
+    With a plan_state the sheets are assembled from worksheet parts, keeping
+    or patching the parts of the workbook already at output_file where the
+    state shows their rows unchanged; returns (rendered, patched, kept)
+    sheet counts then.
+    """
+    if plan_state is not None:
+        with span('render_incremental', sheets=len(sheet_jobs)):
+            changes = plan_state.sheet_changes(sheet_jobs)
+            return render_workbook_incremental(output_file, sheet_jobs, define_plan_formats, changes,
+                                               {'nan_inf_to_errors': True})
+    if parallel:
+        with span('render_parallel', sheets=len(sheet_jobs)):
+            render_workbook_parallel(output_file, sheet_jobs, define_plan_formats, {'nan_inf_to_errors': True})
+    else:
+        workbook = xlsxwriter.Workbook(output_file, {'nan_inf_to_errors': True})
+        formats = define_plan_formats(workbook)
+        for sheet_name, write_sheet, args in sheet_jobs:
+            with span(f'render {sheet_name}', rows_in=len(args[0]) if args[0] is not None else 0):
+                write_sheet(workbook.add_worksheet(sheet_name), formats, *args)
+        with span('save', sheets=len(sheet_jobs)):
+            workbook.close()
+
+def create_exact_plan_structure(incremental=False, parallel=False):
+    """
+    Create the exact plan structure as requested:
+    1. Club expansion
+    2. Club launches
+    3. Summary
+    4. Weekly execution
+    5. Milestone
+    6. City progress
+    7. Working sheet (original)
+    8. Events (original - keep as is)
+    9. Logic (calculations explanation)
+
+    incremental=True keeps a JSON state file next to the output: the rebuild
+    is skipped when nothing changed, and otherwise only Working-sheet rows
+    whose fingerprint changed get their launch/expansion actions and
+    City_Progress rows computed again, while unchanged worksheet parts of the
+    previous workbook are kept and the changed rows spliced into them.
+    parallel=True renders the nine sheets in a process pool and assembles
+    their worksheet parts into the output workbook.
+    """
+
+    file_path = 'OND-JFM Plan with actionbales V5.xlsx'
+    with span('read_inputs') as stage:
+        source = WorkbookSource(file_path)
+        working_sheet = source.sheet('Working sheet')
+
+        # Try to read events sheet
+        try:
+            events_sheet = source.sheet('Events')
+        except:
+            events_sheet = None
+        stage.rows_out = len(working_sheet)
+
+    print('🎯 CREATING EXACT PLAN STRUCTURE AS REQUESTED')
+    print('=' * 60)
 
-    workbook.close()
+    output_file = 'OND-JFM EXACT PLAN STRUCTURE V12.xlsx'
+
+    # Incremental mode: skip unchanged inputs, reuse unchanged rows' actions
+    plan_state = None
+    row_keys = None
+    if incremental:
+        plan_state = PlanState(output_file, (TOP_3_MAXIMUM_SCALING, sorted(ENHANCED_TARGET_DAYS.items()), PLAN_START_DATE,
+                                             LAUNCH_REVENUE_THRESHOLD, EXPANSION_REVENUE_THRESHOLD))
+        row_keys = row_fingerprints(working_sheet)
+        inputs_key = plan_state.inputs_key(working_sheet, events_sheet, row_keys)
+        if plan_state.is_current(inputs_key):
+            print(f"✅ {output_file} is up to date, nothing to regenerate")
+            return
+
+    with span('build_plan', rows_in=len(working_sheet)):
+        plan = build_plan(working_sheet, plan_state=plan_state, row_keys=row_keys)
+    club_launch_actions = plan['club_launch_actions']
+    club_expansion_actions = plan['club_expansion_actions']
+
+    sheet_jobs = plan_sheet_jobs(plan, working_sheet, events_sheet)
+    for number, (sheet_name, _, _) in enumerate(sheet_jobs, start=1):
+        print(f"📊 {number}. Creating {sheet_name} sheet...")
+    sheet_counts = write_plan_workbook(output_file, sheet_jobs, parallel, plan_state)
+
+    if plan_state:
+        plan_state.save(inputs_key)
+        reused = plan_state.launch_cache.reused + plan_state.expansion_cache.reused
+        rendered = plan_state.launch_cache.rendered + plan_state.expansion_cache.rendered
+        print(f"♻️ Incremental: {reused} rows reused, {rendered} rows rendered")
+        print(f"♻️ Sheets: {sheet_counts[2]} kept, {sheet_counts[1]} patched, {sheet_counts[0]} rendered")
 
     print("✅ Exact plan structure created!")
-    print(f"📁 File: OND-JFM EXACT PLAN STRUCTURE V12.xlsx")
+    print(f"📁 File: {output_file}")
 
     print(f"\n🎯 PLAN STRUCTURE SUMMARY:")
     print(f"📋 Total Actions: {len(club_launch_actions) + len(club_expansion_actions)}")
@@ -844,4 +810,5 @@ def create_exact_plan_structure():
     print("9. Logic - Calculation explanations and formulas")
 
 if __name__ == "__main__":
-    create_exact_plan_structure()
\ No newline at end of file
+    with trace_run():
+        create_exact_plan_structure(incremental='--incremental' in sys.argv, parallel='--parallel' in sys.argv)
\ No newline at end of file
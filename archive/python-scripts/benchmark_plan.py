@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+
+import os
+import gc
+import sys
+import json
+import time
+import shutil
+import argparse
+import platform
+import tempfile
+import tracemalloc
+from contextlib import redirect_stdout
+from datetime import datetime
+import pandas as pd
+from workbook_source import WorkbookSource, clear_workbook_cache
+from synthetic_plan import SYNTHETIC_SIZES, PLAN_INPUT, write_synthetic_inputs
+
+DEFAULT_SIZES = ['1k', '10k']
+
+# A stage slower than its baseline by more than this share (and by at least
+# MIN_REGRESSION_SECONDS) counts as a regression
+DEFAULT_TOLERANCE = 0.25
+MIN_REGRESSION_SECONDS = 0.05
+
+# Reference run committed next to this script, compared against by default
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'benchmark_baseline.json')
+
+def exact_plan_stages():
+    """
+    EXACT_PLAN_STRUCTURE: parse the plan input, build the plan, write the workbook
+    """
+    from EXACT_PLAN_STRUCTURE import build_plan, plan_sheet_jobs, write_plan_workbook
+    state = {}
+
+    def read_inputs():
+        source = WorkbookSource(PLAN_INPUT)
+        state['working_sheet'] = source.sheet('Working sheet')
+        state['events_sheet'] = source.sheet('Events')
+        return len(state['working_sheet'])
+
+    def build():
+        state['plan'] = build_plan(state['working_sheet'])
+        return len(state['plan']['club_launch_actions']) + len(state['plan']['club_expansion_actions'])
+
+    def write():
+        jobs = plan_sheet_jobs(state['plan'], state['working_sheet'], state['events_sheet'])
+        write_plan_workbook('OND-JFM EXACT PLAN STRUCTURE V12.xlsx', jobs)
+
+    return [('read_inputs', read_inputs), ('build_plan', build), ('write_workbook', write)]
+
+def replica_stages():
+    """
+    read_v2_and_create_replica: parse V2, extract club names, write the replica
+    """
+    import read_v2_and_create_replica as replica
+    state = {}
+
+    def read_inputs():
+        state['all_sheets'], state['working_sheet'] = replica.read_v2_and_create_replica()
+        return len(state['working_sheet'])
+
+    def parse_strategy():
+        state['expansion'], state['maintenance'] = replica.parse_club_strategy_for_expansion(state['working_sheet'])
+        return len(state['expansion']) + len(state['maintenance'])
+
+    def write():
+        replica.create_replica_with_maintenance(state['all_sheets'], state['working_sheet'],
+                                                state['expansion'], state['maintenance'])
+
+    return [('read_inputs', read_inputs), ('parse_club_strategy', parse_strategy), ('write_replica', write)]
+
+def dynamic_replica_stages():
+    """
+    create_dynamic_replica: parse V2, extract club names, write the formula replica
+    """
+    import create_dynamic_replica as dynamic
+    state = {}
+
+    def read_inputs():
+        state['all_sheets'] = dynamic.read_v2_and_create_dynamic_replica()
+        return len(state['all_sheets']['Working sheet'])
+
+    def parse_strategy():
+        working_sheet = state['all_sheets']['Working sheet']
+        state['expansion'], state['maintenance'] = dynamic.parse_club_strategy_for_expansion(working_sheet)
+        return len(state['expansion']) + len(state['maintenance'])
+
+    def write():
+        dynamic.create_dynamic_replica(state['all_sheets'], state['expansion'], state['maintenance'])
+
+    return [('read_inputs', read_inputs), ('parse_club_strategy', parse_strategy), ('write_replica', write)]
+
+def fix_formula_stages():
+    """
+    fix_formula_errors: rewrite the dynamic replica formulas, build the simple version
+    """
+    import fix_formula_errors as fix
+    return [('fix_formula_errors', fix.fix_formula_errors),
+            ('create_simple_formula_version', fix.create_simple_formula_version)]
+
+def verify_stages():
+    """
+    verify_correct_split and verify_column_h_updates on the replica, the
+    single-pass verify_plan checks, and the launch count and sheet structure
+    checks on V2
+    """
+    import verify_correct_split
+    import verify_column_h_updates
+    import verify_plan
+    import check_actual_launch_count
+    import check_current_sheets_structure
+    shutil.copy('OND-JFM Plan REPLICA with Club Maintenance.xlsx', 'OND-JFM Plan CORRECT REVENUE SPLIT.xlsx')
+
+    def actual_launch_count():
+        areas_needing_new_clubs, _ = check_actual_launch_count.check_actual_launch_count()
+        return check_actual_launch_count.analyze_club_launches_sheet() and areas_needing_new_clubs
+
+    def current_sheets_structure():
+        weekly_exec, milestones, club_launches, club_expansions = check_current_sheets_structure.check_current_sheets_structure()
+        if weekly_exec is None:
+            return False
+        return len(club_launches) + len(club_expansions)
+
+    return [('verify_correct_split', verify_correct_split.verify_correct_split),
+            ('verify_column_h_updates', verify_column_h_updates.verify_column_h_updates),
+            ('verify_plan', verify_plan.verify_plan),
+            ('check_actual_launch_count', actual_launch_count),
+            ('check_current_sheets_structure', current_sheets_structure)]
+
+# Suite name -> (stage factory, suites whose output it reads), in run order
+BENCHMARK_SUITES = {
+    'exact_plan': (exact_plan_stages, []),
+    'replica': (replica_stages, []),
+    'dynamic_replica': (dynamic_replica_stages, []),
+    'fix_formula_errors': (fix_formula_stages, ['dynamic_replica']),
+    'verify': (verify_stages, ['replica']),
+}
+
+def measure_stage(stage, track_memory=True):
+    """
+    Run one stage with its prints silenced; returns (result, wall seconds,
+    CPU seconds, peak traced MB or None)
+    """
+    gc.collect()
+    if track_memory:
+        tracemalloc.reset_peak()
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+
+    with open(os.devnull, 'w', encoding='utf-8') as devnull, redirect_stdout(devnull):
+        result = stage()
+
+    wall = time.perf_counter() - wall_start
+    cpu = time.process_time() - cpu_start
+    peak_mb = tracemalloc.get_traced_memory()[1] / 2**20 if track_memory else None
+    return result, wall, cpu, peak_mb
+
+def run_benchmarks(sizes=DEFAULT_SIZES, suites=None, seed=0, workdir=None, track_memory=True):
+    """
+    Benchmark every stage of the selected suites on synthetic inputs of each
+    size ('1k'...'1m' or a row count)
+
+    Inputs are generated into a fresh directory per size (under workdir, or
+    a temporary one that is removed afterwards) and the scripts run with it
+    as working directory. Peak memory is the tracemalloc peak of each stage,
+    which slows the stages down; pass track_memory=False for timings only.
+    Returns one result dict per stage.
+    """
+    suites = list(BENCHMARK_SUITES) if suites is None else suites
+    unknown = set(suites) - set(BENCHMARK_SUITES)
+    if unknown:
+        raise ValueError(f"Unknown benchmark suites: {', '.join(sorted(unknown))}")
+
+    # Suites reading another suite's output bring it along
+    selected = set(suites)
+    for suite in suites:
+        selected.update(BENCHMARK_SUITES[suite][1])
+    run_order = [suite for suite in BENCHMARK_SUITES if suite in selected]
+
+    results = []
+    base_dir = workdir or tempfile.mkdtemp(prefix='plan_benchmark_')
+    original_dir = os.getcwd()
+    if track_memory:
+        tracemalloc.start()
+
+    try:
+        for size in sizes:
+            rows = SYNTHETIC_SIZES[size] if size in SYNTHETIC_SIZES else int(size)
+            size_dir = os.path.join(base_dir, f'synthetic_{size}')
+            print(f'🧪 {size}: generating {rows:,} synthetic rows...')
+            write_synthetic_inputs(size_dir, rows, seed)
+
+            os.chdir(size_dir)
+            try:
+                for suite in run_order:
+                    clear_workbook_cache()
+                    for stage_name, stage in BENCHMARK_SUITES[suite][0]():
+                        result, wall, cpu, peak_mb = measure_stage(stage, track_memory)
+                        results.append({
+                            'size': size,
+                            'rows': rows,
+                            'suite': suite,
+                            'stage': stage_name,
+                            'ok': result is not False,
+                            'rows_out': result if isinstance(result, int) and not isinstance(result, bool) else None,
+                            'wall_s': round(wall, 4),
+                            'cpu_s': round(cpu, 4),
+                            'peak_mb': round(peak_mb, 2) if peak_mb is not None else None,
+                        })
+                        status = '✅' if result is not False else '❌'
+                        memory = f', peak {peak_mb:,.1f} MB' if peak_mb is not None else ''
+                        print(f'   {status} {suite}.{stage_name}: {wall:.3f}s{memory}')
+            finally:
+                os.chdir(original_dir)
+    finally:
+        if track_memory:
+            tracemalloc.stop()
+        if workdir is None:
+            shutil.rmtree(base_dir, ignore_errors=True)
+
+    return results
+
+def save_results(path, results, seed=0):
+    report = {
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'seed': seed,
+        'results': results,
+    }
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    return path
+
+def compare_to_baseline(results, baseline, tolerance=DEFAULT_TOLERANCE):
+    """
+    DataFrame of every stage against the baseline report (a saved results
+    JSON as a dict); Regression is True where the stage got slower than the
+    tolerance allows or started failing
+    """
+    previous = {(r['size'], r['suite'], r['stage']): r for r in baseline.get('results', [])}
+    rows = []
+    for result in results:
+        base = previous.get((result['size'], result['suite'], result['stage']))
+        row = {
+            'Size': result['size'],
+            'Stage': f"{result['suite']}.{result['stage']}",
+            'Wall (s)': result['wall_s'],
+            'Baseline (s)': base['wall_s'] if base else None,
+            'Wall Ratio': None,
+            'Peak (MB)': result['peak_mb'],
+            'Baseline Peak (MB)': base['peak_mb'] if base else None,
+            'Regression': False,
+        }
+        if base:
+            if base['wall_s'] > 0:
+                row['Wall Ratio'] = round(result['wall_s'] / base['wall_s'], 3)
+            slower = result['wall_s'] - base['wall_s']
+            row['Regression'] = (not result['ok'] and base['ok']) or (
+                slower > MIN_REGRESSION_SECONDS and result['wall_s'] > base['wall_s'] * (1 + tolerance))
+        rows.append(row)
+    return pd.DataFrame(rows)
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the planning scripts stage by stage on synthetic inputs')
+    parser.add_argument('--sizes', default=','.join(DEFAULT_SIZES), help='comma separated: 1k,10k,100k,1m or row counts')
+    parser.add_argument('--suites', default=','.join(BENCHMARK_SUITES), help='comma separated suite names')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--workdir', help='keep the generated inputs and outputs here')
+    parser.add_argument('--no-memory', action='store_true', help='skip tracemalloc peak memory tracking')
+    parser.add_argument('--output', default='benchmark_results.json', help='where to save this run')
+    parser.add_argument('--baseline', default=BASELINE_FILE,
+                        help='baseline results JSON to compare against (default: the committed benchmark_baseline.json)')
+    parser.add_argument('--no-baseline', action='store_true', help='skip the baseline comparison')
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE)
+    args = parser.parse_args()
+
+    print('⏱️ PLAN STAGE BENCHMARKS')
+    print('=' * 60)
+
+    results = run_benchmarks(args.sizes.split(','), args.suites.split(','), args.seed,
+                             args.workdir, track_memory=not args.no_memory)
+    save_results(args.output, results, args.seed)
+    print(f'\n📁 Results saved: {args.output}')
+
+    if args.baseline and not args.no_baseline:
+        try:
+            with open(args.baseline, encoding='utf-8') as f:
+                baseline = json.load(f)
+        except OSError as e:
+            print(f'\n⚠️ No baseline to compare against: {e}')
+            return
+        comparison = compare_to_baseline(results, baseline, args.tolerance)
+        print(f'\n📊 AGAINST BASELINE {args.baseline}:')
+        print(comparison.to_string(index=False))
+
+        regressions = comparison[comparison['Regression']]
+        if len(regressions):
+            print(f'\n❌ {len(regressions)} stage(s) regressed beyond {args.tolerance:.0%}')
+            sys.exit(1)
+        print('\n✅ No regressions')
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
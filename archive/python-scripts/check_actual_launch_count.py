@@ -2,6 +2,7 @@
 
 import pandas as pd
 import numpy as np
+from workbook_source import WorkbookSource
 
 def check_actual_launch_count():
     """
@@ -15,8 +16,9 @@ def check_actual_launch_count():
         print('=' * 50)
 
         # Read all relevant sheets
-        working_sheet = pd.read_excel(v2_file, sheet_name='Working sheet')
-        club_launches = pd.read_excel(v2_file, sheet_name='Club_Launches')
+        source = WorkbookSource(v2_file)
+        working_sheet = source.sheet('Working sheet')
+        club_launches = source.sheet('Club_Launches')
 
         print(f'📊 CLUB_LAUNCHES SHEET:')
         print(f'   Total rows in Club_Launches: {len(club_launches)}')
@@ -131,7 +133,7 @@ def analyze_club_launches_sheet():
     v2_file = 'OND-JFM Plan with actionbales final V2.xlsx'
 
     try:
-        club_launches = pd.read_excel(v2_file, sheet_name='Club_Launches')
+        club_launches = WorkbookSource(v2_file).sheet('Club_Launches')
 
         print(f'📋 SAMPLE ENTRIES FROM CLUB_LAUNCHES:')
         print(f'   Total entries: {len(club_launches)}')
@@ -1,6 +1,6 @@
 #!/usr/bin/env python3
 
-import pandas as pd
+from workbook_source import WorkbookSource
 
 def check_current_sheets_structure():
     """
@@ -10,8 +10,10 @@ def check_current_sheets_structure():
     v2_file = 'OND-JFM Plan with actionbales final V2.xlsx'
 
     try:
+        source = WorkbookSource(v2_file)
+
         # Read Weekly_Execution sheet
-        weekly_exec = pd.read_excel(v2_file, sheet_name='Weekly_Execution')
+        weekly_exec = source.sheet('Weekly_Execution')
         print('📊 WEEKLY_EXECUTION SHEET STRUCTURE:')
         print('=' * 50)
         print(f'Shape: {weekly_exec.shape}')
@@ -20,7 +22,7 @@ def check_current_sheets_structure():
         print(weekly_exec.head())
 
         # Read Milestones sheet
-        milestones = pd.read_excel(v2_file, sheet_name='Milestones')
+        milestones = source.sheet('Milestones')
         print('\n📊 MILESTONES SHEET STRUCTURE:')
         print('=' * 50)
         print(f'Shape: {milestones.shape}')
@@ -29,7 +31,7 @@ def check_current_sheets_structure():
         print(milestones.head())
 
         # Check Club_Launches for status column
-        club_launches = pd.read_excel(v2_file, sheet_name='Club_Launches')
+        club_launches = source.sheet('Club_Launches')
         print('\n📊 CLUB_LAUNCHES STATUS COLUMN:')
         print('=' * 50)
         if 'Status' in club_launches.columns:
@@ -39,7 +41,7 @@ def check_current_sheets_structure():
             print('No Status column found in Club_Launches')
 
         # Check Club_Expansions for status column
-        club_expansions = pd.read_excel(v2_file, sheet_name='Club_Expansions')
+        club_expansions = source.sheet('Club_Expansions')
         print('\n📊 CLUB_EXPANSIONS STATUS COLUMN:')
         print('=' * 50)
         if 'Status' in club_expansions.columns:
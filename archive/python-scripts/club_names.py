@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+
+import re
+import pandas as pd
+
+# (required literal, pattern) - a pattern only runs when its literal occurs in the text
+CLUB_NAME_PATTERNS = [
+    ('lub', re.compile(r'([A-Z][a-zA-Z\s]+?)\s+(?:club|Club)')),       # "GameMasters club"
+    ('Launch', re.compile(r'Launch\s+([A-Z][a-zA-Z\s]+?)\s+')),         # "Launch Ballers "
+    ('Expand', re.compile(r'Expand\s+([A-Z][a-zA-Z\s]+?)\s+')),         # "Expand Ballers "
+    ('Scale', re.compile(r'Scale\s+([A-Z][a-zA-Z\s]+?)\s+')),           # "Scale GameMasters "
+    ('', re.compile(r'([A-Z][a-zA-Z]+(?:\s+[A-Z][a-zA-Z]+)*)')),        # General capitalized words
+]
+
+EXCLUDED_NAMES = frozenset(['Launch', 'Expand', 'Scale', 'Club', 'Area', 'Month'])
+
+class ClubNameExtractor:
+    """
+    Extract club names from Club_Strategy text, memoized per distinct string
+
+    The patterns overlap, so each one still scans the text on its own: fused
+    into one alternation, a span taken by one pattern is no longer seen by
+    the others. Of the 8 names in "Expand GameMasters club and Launch Ballers
+    in Sector 29. Scale Dice Club" only 4 would be left ("GameMasters",
+    "Dice", "Launch Ballers" and "Scale Dice Club" are lost to spans the
+    club and Launch patterns consume first). Instead the keyword patterns are
+    skipped when their keyword is absent and every distinct strategy string
+    is only parsed once. Names come back sorted.
+    """
+
+    def __init__(self):
+        self._cache = {}
+
+    def _extract(self, strategy_text):
+        club_names = set()
+        for literal, pattern in CLUB_NAME_PATTERNS:
+            if literal not in strategy_text:
+                continue
+            for match in pattern.findall(strategy_text):
+                clean_name = match.strip()
+                if len(clean_name) > 2 and clean_name not in EXCLUDED_NAMES:
+                    club_names.add(clean_name)
+
+        # If no specific names found, create generic ones based on activity
+        if not club_names:
+            lowered = strategy_text.lower()
+            if 'launch' in lowered or 'expand' in lowered or 'scale' in lowered:
+                return ['Primary Club']
+
+        return sorted(club_names)
+
+    def extract(self, strategy_text):
+        """
+        Club names for one strategy string
+        """
+        club_names = self._cache.get(strategy_text)
+        if club_names is None:
+            club_names = self._cache[strategy_text] = self._extract(strategy_text)
+        return list(club_names)
+
+    def extract_many(self, strategies):
+        """
+        Club names for every entry of a Club_Strategy column, parsing each
+        unique value once; blanks are treated as ''. Returns a Series of lists
+        aligned with the input, where rows with the same text share one list.
+        """
+        codes, uniques = pd.factorize(strategies)
+
+        # Code -1 marks blanks, which index the trailing '' entry
+        names_by_code = [self.extract(str(text)) for text in uniques] + [self.extract('')]
+        return pd.Series([names_by_code[code] for code in codes], index=strategies.index, dtype=object)
+
+club_name_extractor = ClubNameExtractor()
+
+def first_match_index(keys, values):
+    """
+    {key: value} keeping the first value seen for each key, the dictionary
+    equivalent of scanning a list and stopping at the first match. Keys with
+    a missing part are skipped since NaN never compared equal in the scan.
+    """
+    index = {}
+    for key, value in zip(keys, values):
+        if any(pd.isna(part) for part in key):
+            continue
+        index.setdefault(key, value)
+    return index
+
+def club_name_index(expansion_data):
+    """
+    First Club_Name per (Area, Activity) from parse_club_strategy_for_expansion output
+    """
+    return first_match_index(
+        ((exp_data['Area'], exp_data['Activity']) for exp_data in expansion_data),
+        (exp_data['Club_Name'] for exp_data in expansion_data)
+    )
+
+def join_club_names(areas, activities, index, default='TBD'):
+    """
+    Club name for every (area, activity) pair, default when nothing matched
+    """
+    return [index.get(key, default) for key in zip(areas, activities)]
\ No newline at end of file
@@ -1,13 +1,18 @@
 #!/usr/bin/env python3
 
 import pandas as pd
-import numpy as np
-from openpyxl import Workbook
-from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
-from openpyxl.utils.dataframe import dataframe_to_rows
-from openpyxl.formula.translate import Translator
-import re
-
+import sys
+from workbook_source import WorkbookSource
+from replica_writer import create_replica_writer, copy_dataframe_to_sheet, column_formula
+from club_names import club_name_extractor, club_name_index, join_club_names
+from status_rollup import StatusRollup
+from plan_trace import span, traced, trace_run
+
+# Per-row formula columns (1-based) written once per column with column_formulas
+WEEKLY_ROW_FORMULA_COLUMNS = [6, 9, 10, 11, 12]
+MILESTONE_ROW_FORMULA_COLUMNS = [15, 16]
+
+@traced('read_inputs', rows_out=lambda all_sheets: sum(len(df) for df in all_sheets.values()))
 def read_v2_and_create_dynamic_replica():
     """
     Read OND-JFM Plan with actionables final V2.xlsx and create replica with dynamic sheets
@@ -20,15 +25,15 @@ def read_v2_and_create_dynamic_replica():
 
     try:
         # Read all sheets from V2 file
-        xl_file = pd.ExcelFile(v2_file)
-        sheet_names = xl_file.sheet_names
+        source = WorkbookSource(v2_file)
+        sheet_names = source.sheet_names
         print(f'📊 Found {len(sheet_names)} sheets: {sheet_names}')
 
         # Read all sheets
         all_sheets = {}
         for sheet_name in sheet_names:
             try:
-                all_sheets[sheet_name] = pd.read_excel(v2_file, sheet_name=sheet_name)
+                all_sheets[sheet_name] = source.sheet(sheet_name)
                 print(f'✅ Read {sheet_name}: {all_sheets[sheet_name].shape}')
             except Exception as e:
                 print(f'❌ Error reading {sheet_name}: {e}')
@@ -42,6 +47,7 @@ def read_v2_and_create_dynamic_replica():
         print(f'❌ Error reading file: {e}')
         return None
 
+@traced('parse_club_strategy', rows_out=lambda result: len(result[0]) + len(result[1]))
 def parse_club_strategy_for_expansion(working_sheet):
     """
     Parse club strategy column to extract club names for expansion
@@ -51,7 +57,13 @@ def parse_club_strategy_for_expansion(working_sheet):
     expansion_data = []
     maintenance_data = []
 
-    for idx, row in working_sheet.iterrows():
+    # Extract club names once per distinct strategy text
+    if 'Club_Strategy' in working_sheet.columns:
+        club_names_by_row = club_name_extractor.extract_many(working_sheet['Club_Strategy'])
+    else:
+        club_names_by_row = [club_name_extractor.extract('')] * len(working_sheet)
+
+    for (idx, row), club_names in zip(working_sheet.iterrows(), club_names_by_row):
         activity = row.get('Activity', '')
         city = row.get('City', '')
         area = row.get('Area', '')
@@ -59,9 +71,6 @@ def parse_club_strategy_for_expansion(working_sheet):
         current_clubs = row.get('Current_Clubs_Count', 0) if pd.notna(row.get('Current_Clubs_Count')) else 0
         clubs_needed = row.get('Clubs_Needed_Feb', 0) if pd.notna(row.get('Clubs_Needed_Feb')) else 0
 
-        # Extract club names from strategy text
-        club_names = extract_club_names_from_strategy(club_strategy)
-
         new_clubs_needed = max(0, clubs_needed - current_clubs)
 
         if new_clubs_needed > 0 and club_names:
@@ -98,27 +107,7 @@ def extract_club_names_from_strategy(strategy_text):
     """
     Extract club names from strategy text
     """
-    club_names = []
-
-    patterns = [
-        r'([A-Z][a-zA-Z\s]+?)\s+(?:club|Club)',
-        r'Launch\s+([A-Z][a-zA-Z\s]+?)\s+',
-        r'Expand\s+([A-Z][a-zA-Z\s]+?)\s+',
-        r'Scale\s+([A-Z][a-zA-Z\s]+?)\s+',
-        r'([A-Z][a-zA-Z]+(?:\s+[A-Z][a-zA-Z]+)*)',
-    ]
-
-    for pattern in patterns:
-        matches = re.findall(pattern, strategy_text)
-        for match in matches:
-            clean_name = match.strip()
-            if len(clean_name) > 2 and clean_name not in ['Launch', 'Expand', 'Scale', 'Club', 'Area', 'Month']:
-                club_names.append(clean_name)
-
-    if not club_names and any(keyword in strategy_text.lower() for keyword in ['launch', 'expand', 'scale']):
-        club_names = ['Primary Club']
-
-    return list(set(club_names))
+    return club_name_extractor.extract(strategy_text)
 
 def generate_specific_action_from_strategy(original_action, club_name, activity, area):
     """
@@ -143,42 +132,61 @@ def generate_specific_action_from_strategy(original_action, club_name, activity,
 
     return action
 
-def create_dynamic_replica(all_sheets, expansion_data, maintenance_data):
+def create_dynamic_replica(all_sheets, expansion_data, maintenance_data, streaming=False, rollup=False,
+                           column_formulas=False):
     """
     Create replica with dynamic Weekly_Execution and Milestones
+
+    streaming=True writes through the constant-memory xlsxwriter backend
+    instead of building the whole workbook in memory. rollup=True points the
+    Weekly_Execution and Milestones counts at a hidden Status_Rollup range
+    instead of per-row COUNTIFS/SUMIFS over the action sheets.
+    column_formulas=True writes the per-row ratio, total and status formulas
+    of those two sheets once per column (see column_formula).
     """
     print('\n📝 Creating dynamic replica with all sheets...')
 
-    wb = Workbook()
-    wb.remove(wb.active)
+    output_file = 'OND-JFM Plan DYNAMIC REPLICA.xlsx'
+    writer = create_replica_writer(output_file, streaming)
+    status_rollup = StatusRollup() if rollup else None
 
     # Create all sheets
     for sheet_name, df in all_sheets.items():
-        if sheet_name == 'Club_Expansions':
-            create_enhanced_club_expansion_sheet(wb, expansion_data, df)
-        elif sheet_name == 'Weekly_Execution':
-            create_dynamic_weekly_execution_sheet(wb, df)
-        elif sheet_name == 'Milestones':
-            create_dynamic_milestones_sheet(wb, df)
-        else:
-            ws = wb.create_sheet(title=sheet_name)
-            copy_dataframe_to_sheet(ws, df)
+        with span(f'render {sheet_name}', rows_in=len(df)):
+            if sheet_name == 'Club_Expansions':
+                create_enhanced_club_expansion_sheet(writer, expansion_data, df, status_rollup)
+            elif sheet_name == 'Weekly_Execution':
+                create_dynamic_weekly_execution_sheet(writer, df, status_rollup, column_formulas)
+            elif sheet_name == 'Milestones':
+                create_dynamic_milestones_sheet(writer, df, status_rollup, column_formulas)
+            else:
+                ws = writer.add_sheet(sheet_name)
+                copy_dataframe_to_sheet(ws, df)
+                if status_rollup and sheet_name == 'Club_Launches':
+                    status_rollup.add_source('Launch', df)
+                    ws.add_table(sheet_name, list(df.columns))
 
     # Create new Club Maintenance sheet
-    create_club_maintenance_sheet(wb, maintenance_data)
+    with span('render Club_Maintenance', rows_in=len(maintenance_data)):
+        create_club_maintenance_sheet(writer, maintenance_data)
+
+    if status_rollup:
+        with span('render Status_Rollup'):
+            status_rollup.write_sheet(writer)
 
     # Save the file
-    output_file = 'OND-JFM Plan DYNAMIC REPLICA.xlsx'
-    wb.save(output_file)
+    with span('save'):
+        writer.save()
     print(f'✅ Saved dynamic replica to: {output_file}')
 
     return output_file
 
-def create_enhanced_club_expansion_sheet(wb, expansion_data, original_club_expansions):
+def create_enhanced_club_expansion_sheet(writer, expansion_data, original_club_expansions, status_rollup=None):
     """
-    Create enhanced club expansion sheet with club names and specific actions
+    Create enhanced club expansion sheet with club names and specific actions;
+    with a status_rollup the sheet becomes the Club_Expansions table
     """
-    ws = wb.create_sheet(title='Club_Expansions')
+    ws = writer.add_sheet('Club_Expansions', max_column_width=50)
 
     headers = ['Action ID', 'Week Group', 'Type', 'Priority', 'City', 'Area', 'Activity',
               'Specific Action', 'Success Criteria', 'Revenue Impact (₹)', 'Status',
@@ -186,56 +194,55 @@ def create_enhanced_club_expansion_sheet(wb, expansion_data, original_club_expan
               'Owner.1', 'Club Name']
 
     # Add headers
-    for col, header in enumerate(headers, 1):
-        cell = ws.cell(row=1, column=col, value=header)
-        cell.font = Font(bold=True)
-        cell.fill = PatternFill(start_color='366092', end_color='366092', fill_type='solid')
-        cell.font = Font(color='FFFFFF', bold=True)
+    ws.append(headers, style='expansion_header')
+
+    # Match every row to its first (Area, Activity) expansion in one pass
+    club_names = join_club_names(
+        original_club_expansions.get('Area', pd.Series('', index=original_club_expansions.index)),
+        original_club_expansions.get('Activity', pd.Series('', index=original_club_expansions.index)),
+        club_name_index(expansion_data)
+    )
 
     # Copy all original data and enhance
-    for row_idx, (_, original_row) in enumerate(original_club_expansions.iterrows(), 2):
-        for col_idx, col_name in enumerate(original_club_expansions.columns, 1):
-            if col_idx <= 17:
-                ws.cell(row=row_idx, column=col_idx, value=original_row[col_name])
+    for (_, original_row), club_name in zip(original_club_expansions.iterrows(), club_names):
+        values = [original_row[col_name] for col_name in original_club_expansions.columns[:17]]
+        values += [None] * (17 - len(values))
 
         # Add club name and enhanced specific action
         area = original_row.get('Area', '')
         activity = original_row.get('Activity', '')
 
-        club_name = 'TBD'
-        for exp_data in expansion_data:
-            if (exp_data['Area'] == area and exp_data['Activity'] == activity):
-                club_name = exp_data['Club_Name']
-                break
-
-        ws.cell(row=row_idx, column=18, value=club_name)
-
-        specific_action = generate_specific_action_from_strategy(
+        values[7] = generate_specific_action_from_strategy(
             original_row.get('Specific Action', ''),
             club_name,
             activity,
             area
         )
-        ws.cell(row=row_idx, column=8, value=specific_action)
+        values.append(club_name)
+        ws.append(values)
+
+    if status_rollup:
+        columns = original_club_expansions.columns[:17]
+        status_rollup.add_source('Expansion', original_club_expansions[columns].set_axis(headers[:len(columns)], axis=1))
+        ws.add_table('Club_Expansions', headers)
 
     # Auto-adjust column widths
-    for column in ws.columns:
-        max_length = 0
-        column_letter = column[0].column_letter
-        for cell in column:
-            try:
-                if len(str(cell.value)) > max_length:
-                    max_length = len(str(cell.value))
-            except:
-                pass
-        adjusted_width = min(max_length + 2, 50)
-        ws.column_dimensions[column_letter].width = adjusted_width
-
-def create_dynamic_weekly_execution_sheet(wb, original_weekly):
+    ws.fit_columns()
+
+def _column_formulas(values, columns, row_idx, last_row):
+    """
+    Swap the per-row formulas in columns (1-based) for column formulas over
+    rows 2..last_row on row 2, leaving the cells below to them
+    """
+    for column in columns:
+        values[column - 1] = column_formula(column, values[column - 1], 2, last_row) if row_idx == 2 else None
+    return values
+
+def create_dynamic_weekly_execution_sheet(writer, original_weekly, status_rollup=None, column_formulas=False):
     """
     Create dynamic Weekly_Execution sheet with formulas
     """
-    ws = wb.create_sheet(title='Weekly_Execution')
+    ws = writer.add_sheet('Weekly_Execution', max_column_width=30)
 
     # Headers
     headers = ['Week', 'Dates', 'Month', 'Expansion Total', 'Expansion Done', 'Expansion %',
@@ -243,67 +250,75 @@ def create_dynamic_weekly_execution_sheet(wb, original_weekly):
               'Overall %', 'Weekly Revenue Impact (₹)', 'Key Activities This Week']
 
     # Add headers
-    for col, header in enumerate(headers, 1):
-        cell = ws.cell(row=1, column=col, value=header)
-        cell.font = Font(bold=True)
-        cell.fill = PatternFill(start_color='4F81BD', end_color='4F81BD', fill_type='solid')
-        cell.font = Font(color='FFFFFF', bold=True)
+    ws.append(headers, style='weekly_header')
+
+    # Percentage columns are formatted on rows 2-19
+    percent_columns = {6: 'percent', 9: 'percent', 12: 'percent'}
 
     # Copy basic data and add dynamic formulas
+    row_idx = 1
+    last_row = len(original_weekly) + 1
     for row_idx, (_, original_row) in enumerate(original_weekly.iterrows(), 2):
-        # Basic data columns
-        ws.cell(row=row_idx, column=1, value=original_row['Week'])
-        ws.cell(row=row_idx, column=2, value=original_row['Dates'])
-        ws.cell(row=row_idx, column=3, value=original_row['Month'])
-
         # Dynamic formulas for tracking
         week_group = f"'{original_row['Month']} 2024 (Weeks {row_idx-1}-{min(row_idx+2, 18)})'"
 
-        # Expansion metrics with COUNTIFS
-        ws.cell(row=row_idx, column=4, value=f'=COUNTIFS(Club_Expansions[Week Group],"{week_group}")')
-        ws.cell(row=row_idx, column=5, value=f'=COUNTIFS(Club_Expansions[Week Group],"{week_group}",Club_Expansions[Status],"COMPLETED")')
-        ws.cell(row=row_idx, column=6, value=f'=IF(D{row_idx}=0,0,E{row_idx}/D{row_idx})')
-
-        # Launch metrics with COUNTIFS
-        ws.cell(row=row_idx, column=7, value=f'=COUNTIFS(Club_Launches[Week Group],"{week_group}")')
-        ws.cell(row=row_idx, column=8, value=f'=COUNTIFS(Club_Launches[Week Group],"{week_group}",Club_Launches[Status],"COMPLETED")')
-        ws.cell(row=row_idx, column=9, value=f'=IF(G{row_idx}=0,0,H{row_idx}/G{row_idx})')
-
-        # Overall metrics
-        ws.cell(row=row_idx, column=10, value=f'=D{row_idx}+G{row_idx}')
-        ws.cell(row=row_idx, column=11, value=f'=E{row_idx}+H{row_idx}')
-        ws.cell(row=row_idx, column=12, value=f'=IF(J{row_idx}=0,0,K{row_idx}/J{row_idx})')
-
-        # Revenue impact
-        ws.cell(row=row_idx, column=13, value=f'=SUMIFS(Club_Expansions[Revenue Impact (₹)],Club_Expansions[Week Group],"{week_group}",Club_Expansions[Status],"COMPLETED")+SUMIFS(Club_Launches[Revenue Impact (₹)],Club_Launches[Week Group],"{week_group}",Club_Launches[Status],"COMPLETED")')
-
-        # Key activities
-        ws.cell(row=row_idx, column=14, value=f'Week {row_idx-1} focus areas')
-
-    # Format percentage columns
-    for row in range(2, 20):
-        for col in [6, 9, 12]:  # Percentage columns
-            cell = ws.cell(row=row, column=col)
-            cell.number_format = '0.0%'
+        if status_rollup:
+            rollup_cell = lambda status, measure: status_rollup.cell('Week Group', week_group, status, measure)
+            expansion_total = f'={rollup_cell("ALL", "Expansion Count")}'
+            expansion_done = f'={rollup_cell("COMPLETED", "Expansion Count")}'
+            launch_total = f'={rollup_cell("ALL", "Launch Count")}'
+            launch_done = f'={rollup_cell("COMPLETED", "Launch Count")}'
+            revenue_done = f'={rollup_cell("COMPLETED", "Expansion Revenue")}+{rollup_cell("COMPLETED", "Launch Revenue")}'
+        else:
+            expansion_total = f'=COUNTIFS(Club_Expansions[Week Group],"{week_group}")'
+            expansion_done = f'=COUNTIFS(Club_Expansions[Week Group],"{week_group}",Club_Expansions[Status],"COMPLETED")'
+            launch_total = f'=COUNTIFS(Club_Launches[Week Group],"{week_group}")'
+            launch_done = f'=COUNTIFS(Club_Launches[Week Group],"{week_group}",Club_Launches[Status],"COMPLETED")'
+            revenue_done = f'=SUMIFS(Club_Expansions[Revenue Impact (₹)],Club_Expansions[Week Group],"{week_group}",Club_Expansions[Status],"COMPLETED")+SUMIFS(Club_Launches[Revenue Impact (₹)],Club_Launches[Week Group],"{week_group}",Club_Launches[Status],"COMPLETED")'
+
+        values = [
+            # Basic data columns
+            original_row['Week'],
+            original_row['Dates'],
+            original_row['Month'],
+
+            # Expansion metrics
+            expansion_total,
+            expansion_done,
+            f'=IF(D{row_idx}=0,0,E{row_idx}/D{row_idx})',
+
+            # Launch metrics
+            launch_total,
+            launch_done,
+            f'=IF(G{row_idx}=0,0,H{row_idx}/G{row_idx})',
+
+            # Overall metrics
+            f'=D{row_idx}+G{row_idx}',
+            f'=E{row_idx}+H{row_idx}',
+            f'=IF(J{row_idx}=0,0,K{row_idx}/J{row_idx})',
+
+            # Revenue impact
+            revenue_done,
+
+            # Key activities
+            f'Week {row_idx-1} focus areas'
+        ]
+        if column_formulas:
+            _column_formulas(values, WEEKLY_ROW_FORMULA_COLUMNS, row_idx, last_row)
+        ws.append(values, column_styles=percent_columns if row_idx < 20 else None)
+
+    # Format the remaining percentage cells
+    for row in range(row_idx + 1, 20):
+        ws.append([None] * 12, column_styles=percent_columns)
 
     # Auto-adjust column widths
-    for column in ws.columns:
-        max_length = 0
-        column_letter = column[0].column_letter
-        for cell in column:
-            try:
-                if len(str(cell.value)) > max_length:
-                    max_length = len(str(cell.value))
-            except:
-                pass
-        adjusted_width = min(max_length + 2, 30)
-        ws.column_dimensions[column_letter].width = adjusted_width
-
-def create_dynamic_milestones_sheet(wb, original_milestones):
+    ws.fit_columns()
+
+def create_dynamic_milestones_sheet(writer, original_milestones, status_rollup=None, column_formulas=False):
     """
     Create dynamic Milestones sheet with formulas
     """
-    ws = wb.create_sheet(title='Milestones')
+    ws = writer.add_sheet('Milestones', max_column_width=30)
 
     # Headers
     headers = ['Monthly Milestone', 'Target Date', 'Week', 'Description', 'Revenue Target (₹)',
@@ -311,110 +326,85 @@ def create_dynamic_milestones_sheet(wb, original_milestones):
               'Quality Metric', 'Team Focus', 'Total Actions', 'Completed', 'Progress %', 'Notes']
 
     # Add headers
-    for col, header in enumerate(headers, 1):
-        cell = ws.cell(row=1, column=col, value=header)
-        cell.font = Font(bold=True)
-        cell.fill = PatternFill(start_color='9BBB59', end_color='9BBB59', fill_type='solid')
-        cell.font = Font(color='FFFFFF', bold=True)
+    ws.append(headers, style='milestone_header')
+
+    # Percentage column is formatted on rows 2-9
+    percent_columns = {15: 'percent'}
 
     # Copy data and add dynamic formulas
+    row_idx = 1
+    last_row = len(original_milestones) + 1
     for row_idx, (_, original_row) in enumerate(original_milestones.iterrows(), 2):
         # Basic data columns (1-12)
-        for col_idx in range(1, 13):
-            col_name = original_milestones.columns[col_idx-1]
-            ws.cell(row=row_idx, column=col_idx, value=original_row[col_name])
+        values = [original_row[original_milestones.columns[col_idx-1]] for col_idx in range(1, 13)]
 
         # Dynamic formulas for tracking
         week_num = original_row.get('Week', row_idx-1)
 
-        # Total Actions (sum of expansions and launches for this week)
-        ws.cell(row=row_idx, column=13, value=f'=COUNTIFS(Club_Expansions[Week],{week_num})+COUNTIFS(Club_Launches[Week],{week_num})')
+        if status_rollup:
+            rollup_cell = lambda status, measure: status_rollup.cell('Week', week_num, status, measure)
+            total_actions = f'={rollup_cell("ALL", "Expansion Count")}+{rollup_cell("ALL", "Launch Count")}'
+            completed_actions = f'={rollup_cell("COMPLETED", "Expansion Count")}+{rollup_cell("COMPLETED", "Launch Count")}'
+        else:
+            total_actions = f'=COUNTIFS(Club_Expansions[Week],{week_num})+COUNTIFS(Club_Launches[Week],{week_num})'
+            completed_actions = f'=COUNTIFS(Club_Expansions[Week],{week_num},Club_Expansions[Status],"COMPLETED")+COUNTIFS(Club_Launches[Week],{week_num},Club_Launches[Status],"COMPLETED")'
+
+        values += [
+            # Total Actions (sum of expansions and launches for this week)
+            total_actions,
 
-        # Completed Actions
-        ws.cell(row=row_idx, column=14, value=f'=COUNTIFS(Club_Expansions[Week],{week_num},Club_Expansions[Status],"COMPLETED")+COUNTIFS(Club_Launches[Week],{week_num},Club_Launches[Status],"COMPLETED")')
+            # Completed Actions
+            completed_actions,
 
-        # Progress %
-        ws.cell(row=row_idx, column=15, value=f'=IF(M{row_idx}=0,0,N{row_idx}/M{row_idx})')
+            # Progress %
+            f'=IF(M{row_idx}=0,0,N{row_idx}/M{row_idx})',
 
-        # Notes - dynamic based on progress
-        ws.cell(row=row_idx, column=16, value=f'=IF(O{row_idx}>=0.8,"On Track",IF(O{row_idx}>=0.5,"Delayed","Critical"))')
+            # Notes - dynamic based on progress
+            f'=IF(O{row_idx}>=0.8,"On Track",IF(O{row_idx}>=0.5,"Delayed","Critical"))'
+        ]
+        if column_formulas:
+            _column_formulas(values, MILESTONE_ROW_FORMULA_COLUMNS, row_idx, last_row)
+        ws.append(values, column_styles=percent_columns if row_idx < 10 else None)
 
-    # Format percentage column
-    for row in range(2, 10):
-        cell = ws.cell(row=row, column=15)
-        cell.number_format = '0.0%'
+    # Format the remaining percentage cells
+    for row in range(row_idx + 1, 10):
+        ws.append([None] * 15, column_styles=percent_columns)
 
     # Auto-adjust column widths
-    for column in ws.columns:
-        max_length = 0
-        column_letter = column[0].column_letter
-        for cell in column:
-            try:
-                if len(str(cell.value)) > max_length:
-                    max_length = len(str(cell.value))
-            except:
-                pass
-        adjusted_width = min(max_length + 2, 30)
-        ws.column_dimensions[column_letter].width = adjusted_width
-
-def create_club_maintenance_sheet(wb, maintenance_data):
+    ws.fit_columns()
+
+def create_club_maintenance_sheet(writer, maintenance_data):
     """
     Create club maintenance sheet
     """
-    ws = wb.create_sheet(title='Club to be Maintained')
+    ws = writer.add_sheet('Club to be Maintained', max_column_width=30)
 
     headers = ['Activity', 'City', 'Area', 'Club Names', 'Current Clubs',
                'Maintenance Strategy', 'Focus Area', 'Expected Outcome']
 
     # Add headers
-    for col, header in enumerate(headers, 1):
-        cell = ws.cell(row=1, column=col, value=header)
-        cell.font = Font(bold=True)
-        cell.fill = PatternFill(start_color='2F5233', end_color='2F5233', fill_type='solid')
-        cell.font = Font(color='FFFFFF', bold=True)
+    ws.append(headers, style='maintenance_header')
 
     # Add data
-    for row_idx, data in enumerate(maintenance_data, 2):
-        ws.cell(row=row_idx, column=1, value=data['Activity'])
-        ws.cell(row=row_idx, column=2, value=data['City'])
-        ws.cell(row=row_idx, column=3, value=data['Area'])
-        ws.cell(row=row_idx, column=4, value=data['Club_Names'])
-        ws.cell(row=row_idx, column=5, value=data['Current_Clubs'])
-
+    for data in maintenance_data:
         if data['Activity'] in ['MUSIC', 'BOARDGAMING', 'SOCIAL_DEDUCTIONS']:
             strategy = 'Maximize engagement and frequency'
         else:
             strategy = 'Maintain quality and consistency'
-        ws.cell(row=row_idx, column=6, value=strategy)
 
-        ws.cell(row=row_idx, column=7, value='Member retention and activity scaling')
-        ws.cell(row=row_idx, column=8, value=f'Sustain {data["Current_Clubs"]} active clubs')
+        ws.append([
+            data['Activity'],
+            data['City'],
+            data['Area'],
+            data['Club_Names'],
+            data['Current_Clubs'],
+            strategy,
+            'Member retention and activity scaling',
+            f'Sustain {data["Current_Clubs"]} active clubs'
+        ])
 
     # Auto-adjust column widths
-    for column in ws.columns:
-        max_length = 0
-        column_letter = column[0].column_letter
-        for cell in column:
-            try:
-                if len(str(cell.value)) > max_length:
-                    max_length = len(str(cell.value))
-            except:
-                pass
-        adjusted_width = min(max_length + 2, 30)
-        ws.column_dimensions[column_letter].width = adjusted_width
-
-def copy_dataframe_to_sheet(ws, df):
-    """
-    Copy dataframe to worksheet
-    """
-    for r in dataframe_to_rows(df, index=False, header=True):
-        ws.append(r)
-
-    # Format headers
-    if ws.max_row > 0:
-        for cell in ws[1]:
-            cell.font = Font(bold=True)
-            cell.fill = PatternFill(start_color='D9E1F2', end_color='D9E1F2', fill_type='solid')
+    ws.fit_columns()
 
 def main():
     print('🚀 CREATING DYNAMIC REPLICA WITH FORMULAS')
@@ -432,7 +422,9 @@ def main():
     expansion_data, maintenance_data = parse_club_strategy_for_expansion(working_sheet)
 
     # Create dynamic replica
-    output_file = create_dynamic_replica(all_sheets, expansion_data, maintenance_data)
+    output_file = create_dynamic_replica(all_sheets, expansion_data, maintenance_data,
+                                         streaming='--streaming' in sys.argv, rollup='--rollup' in sys.argv,
+                                         column_formulas='--column-formulas' in sys.argv)
 
     print(f'\n✅ DYNAMIC REPLICA CREATED: {output_file}')
     print('📊 Features added:')
@@ -443,4 +435,5 @@ def main():
     print('   • All formulas reference Club_Expansions and Club_Launches sheets')
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    with trace_run():
+        main()
\ No newline at end of file
@@ -0,0 +1,468 @@
+#!/usr/bin/env python3
+
+import os
+import sys
+import json
+import pandas as pd
+
+try:
+    import pyarrow.feather as feather
+except ImportError:
+    feather = None
+
+# Top-level nodes the carnival manager keeps in the Realtime Database
+EXPORT_NODES = ['carnivals', 'clubs', 'tasks', 'mandatoryTasks', 'revenue']
+
+READ_CHUNK_CHARS = 1 << 16
+
+# Rows buffered per table before they are packed into typed columns
+TABLE_CHUNK_ROWS = 50000
+
+TABLE_COMPRESSION = 'zstd'
+
+WHITESPACE = ' \t\n\r'
+
+TASK_FIELDS = {
+    'description': 'str',
+    'team': 'category',
+    'owner': 'category',
+    'status': 'category',
+    'priority': 'category',
+    'progress': 'float',
+    'task_type': 'category',
+    'created_at': 'date',
+    'expected_date': 'date',
+    'actual_date': 'date',
+    'updated_at': 'timestamp',
+    'link': 'str',
+    'notes': 'str',
+}
+
+# Table name -> {column: kind}; kinds are str, category, int, float, date, timestamp.
+# carnival_id and club_id are str: they are database keys as often as record
+# ids, and keys like 'just-dink-it-test' are not numbers
+TABLE_SCHEMAS = {
+    'carnivals': {
+        'carnival_id': 'str',
+        'carnival_key': 'str',
+        'name': 'str',
+        'description': 'str',
+        'start_date': 'date',
+        'end_date': 'date',
+    },
+    'clubs': {
+        'club_id': 'str',
+        'club_key': 'str',
+        'name': 'str',
+        'activity': 'category',
+        'commission_type': 'category',
+        'commission_amount': 'float',
+    },
+    'club_carnivals': {
+        'club_id': 'str',
+        'carnival_id': 'str',
+    },
+    'tasks': {
+        'carnival_id': 'str',
+        'club_id': 'str',
+        'scope': 'category',
+        'task_key': 'str',
+        'task_id': 'str',
+        **TASK_FIELDS,
+    },
+    'mandatory_tasks': {
+        'template_id': 'int',
+        **TASK_FIELDS,
+    },
+    'revenue_entries': {
+        'carnival_id': 'str',
+        'club_id': 'str',
+        'entry_index': 'int',
+        'amount': 'float',
+        'date': 'date',
+        'description': 'str',
+        'timestamp': 'timestamp',
+        'updated_at': 'timestamp',
+    },
+    'revenue_totals': {
+        'carnival_id': 'str',
+        'club_id': 'str',
+        'total': 'float',
+    },
+}
+
+# Record field -> column, for the fields that are not named the same
+FIELD_COLUMNS = {
+    'startDate': 'start_date',
+    'endDate': 'end_date',
+    'commissionType': 'commission_type',
+    'commissionAmount': 'commission_amount',
+    'taskType': 'task_type',
+    'createdAt': 'created_at',
+    'expectedDate': 'expected_date',
+    'actualDate': 'actual_date',
+    'updatedAt': 'updated_at',
+}
+
+class _JsonStream:
+    """
+    Incremental reader over a text stream handing out structural characters
+    one at a time and whole JSON values decoded by the C decoder, keeping
+    only the unread part of the current chunk in memory
+    """
+
+    def __init__(self, fp, chunk_chars=READ_CHUNK_CHARS):
+        self.fp = fp
+        self.chunk_chars = chunk_chars
+        self.decoder = json.JSONDecoder()
+        self.buffer = ''
+        self.pos = 0
+        self.offset = 0
+        self.eof = False
+
+    def _fill(self, minimum=1):
+        """
+        Read until at least minimum characters are buffered past pos; False
+        when the stream ended first
+        """
+        if self.pos:
+            self.offset += self.pos
+            self.buffer = self.buffer[self.pos:]
+            self.pos = 0
+        while len(self.buffer) < minimum and not self.eof:
+            chunk = self.fp.read(max(self.chunk_chars, minimum - len(self.buffer)))
+            if not chunk:
+                self.eof = True
+                break
+            self.buffer += chunk
+        return len(self.buffer) >= minimum
+
+    def error(self, message):
+        return ValueError(f'{message} at character {self.offset + self.pos}')
+
+    def peek(self):
+        """
+        Next non-whitespace character without consuming it; '' at the end
+        """
+        while True:
+            buffer = self.buffer
+            pos = self.pos
+            while pos < len(buffer) and buffer[pos] in WHITESPACE:
+                pos += 1
+            self.pos = pos
+            if pos < len(buffer):
+                return buffer[pos]
+            if not self._fill():
+                return ''
+
+    def expect(self, chars):
+        char = self.peek()
+        if not char or char not in chars:
+            raise self.error(f'Expected one of {chars!r}, found {char!r}')
+        self.pos += 1
+        return char
+
+    def value(self):
+        """
+        Decode the next complete value, reading more of the stream while it
+        is cut off at the end of the buffer
+        """
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+                end = None
+            # A number reaching the end of the buffer may continue in the next chunk
+            if end is not None and (end < len(self.buffer) or self.eof):
+                self.pos = end
+                return value
+            # Grow geometrically so a huge value is decoded a bounded number of times
+            self._fill(2 * (len(self.buffer) - self.pos) + self.chunk_chars)
+
+def is_export_record(path):
+    """
+    True where the export path holds one record of the carnival manager
+    schema (decoded whole); containers elsewhere are walked key by key
+    """
+    depth = len(path)
+    node = path[0] if depth else None
+    if node in ('carnivals', 'clubs', 'mandatoryTasks'):
+        return depth == 2
+    if node == 'tasks':
+        return (depth == 4 and path[2] == 'carnivalTasks') or (depth == 5 and path[2] == 'clubs')
+    if node == 'revenue':
+        return (depth == 5 and path[3] == 'entries') or (depth == 4 and path[3] != 'entries')
+    return False
+
+def _walk(stream, path, is_record):
+    if is_record(path):
+        yield path, stream.value()
+        return
+
+    char = stream.peek()
+    if char == '{':
+        stream.pos += 1
+        if stream.peek() == '}':
+            stream.pos += 1
+            return
+        while True:
+            if stream.peek() != '"':
+                raise stream.error('Expected an object key')
+            key = stream.value()
+            stream.expect(':')
+            yield from _walk(stream, path + (key,), is_record)
+            if stream.expect(',}') == '}':
+                return
+    elif char == '[':
+        stream.pos += 1
+        if stream.peek() == ']':
+            stream.pos += 1
+            return
+        index = 0
+        while True:
+            yield from _walk(stream, path + (index,), is_record)
+            index += 1
+            if stream.expect(',]') == ']':
+                return
+    elif char:
+        # Scalars outside the record positions are read and dropped
+        stream.value()
+    else:
+        raise stream.error('Unexpected end of export')
+
+def iter_export_records(fp, root=None, is_record=is_export_record, chunk_chars=READ_CHUNK_CHARS):
+    """
+    Stream (path, value) pairs out of a database export without loading it
+    whole: every position where is_record(path) holds is decoded as one
+    value, everything around it is walked a character at a time
+
+    fp is a text file object. root is the database path the export was
+    taken at ('tasks' for a GET of /tasks.json); paths are tuples of object
+    keys and array indices starting with it.
+    """
+    stream = _JsonStream(fp, chunk_chars)
+    path = tuple(part for part in root.strip('/').split('/') if part) if root else ()
+    yield from _walk(stream, path, is_record)
+    if stream.peek():
+        raise stream.error('Unexpected data after the export')
+
+def _typed_column(values, kind):
+    if kind == 'int':
+        return pd.to_numeric(pd.Series(values, dtype=object), errors='coerce').astype('Int64')
+    if kind == 'float':
+        return pd.to_numeric(pd.Series(values, dtype=object), errors='coerce').astype('Float64')
+    if kind in ('date', 'timestamp'):
+        parsed = pd.to_datetime(pd.Series(values, dtype=object), errors='coerce', utc=True, format='ISO8601')
+        if kind == 'date':
+            return parsed.dt.tz_localize(None).dt.normalize().astype('datetime64[us]')
+        return parsed.astype('datetime64[us, UTC]')
+    return pd.Series([None if value is None else str(value) for value in values], dtype='string')
+
+class TableBuilder:
+    """
+    Row sink for one table: rows are buffered as column lists and packed
+    into typed frames every chunk_rows rows
+    """
+
+    def __init__(self, schema, chunk_rows=TABLE_CHUNK_ROWS):
+        self.schema = schema
+        self.chunk_rows = chunk_rows
+        self.columns = {column: [] for column in schema}
+        self.pending = 0
+        self.chunks = []
+
+    def append(self, row):
+        for column, values in self.columns.items():
+            values.append(row.get(column))
+        self.pending += 1
+        if self.pending >= self.chunk_rows:
+            self.flush()
+
+    def flush(self):
+        if not self.pending:
+            return
+        # Categories are assigned once over all chunks in frame()
+        self.chunks.append(pd.DataFrame({
+            column: _typed_column(self.columns[column], 'str' if kind == 'category' else kind)
+            for column, kind in self.schema.items()
+        }))
+        self.columns = {column: [] for column in self.schema}
+        self.pending = 0
+
+    def frame(self):
+        self.flush()
+        if self.chunks:
+            df = pd.concat(self.chunks, ignore_index=True) if len(self.chunks) > 1 else self.chunks[0]
+        else:
+            df = pd.DataFrame({column: _typed_column([], 'str' if kind == 'category' else kind)
+                               for column, kind in self.schema.items()})
+        for column, kind in self.schema.items():
+            if kind == 'category':
+                df[column] = df[column].astype('category')
+        self.chunks = []
+        return df
+
+def _record_fields(record):
+    """
+    Record keys renamed to table columns
+    """
+    return {FIELD_COLUMNS.get(key, key): value for key, value in record.items()}
+
+def _id_list(value):
+    if isinstance(value, dict):
+        return list(value.values())
+    if isinstance(value, list):
+        return value
+    return []
+
+class ExportTables:
+    """
+    Routes the records of iter_export_records into one TableBuilder per
+    table
+    """
+
+    def __init__(self, chunk_rows=TABLE_CHUNK_ROWS):
+        self.builders = {name: TableBuilder(schema, chunk_rows) for name, schema in TABLE_SCHEMAS.items()}
+        self.skipped = 0
+
+    def add(self, path, value):
+        node = path[0]
+        if value is None:
+            return
+        if node == 'revenue':
+            if path[3] == 'entries':
+                if isinstance(value, dict):
+                    self.builders['revenue_entries'].append({
+                        **_record_fields(value), 'carnival_id': path[1], 'club_id': path[2], 'entry_index': path[4]})
+                    return
+            elif path[3] == 'total':
+                self.builders['revenue_totals'].append({'carnival_id': path[1], 'club_id': path[2], 'total': value})
+                return
+            self.skipped += 1
+            return
+
+        if not isinstance(value, dict):
+            self.skipped += 1
+            return
+        fields = _record_fields(value)
+        if node == 'carnivals':
+            self.builders['carnivals'].append({**fields, 'carnival_id': fields.get('id', path[1]), 'carnival_key': path[1]})
+        elif node == 'clubs':
+            club_id = fields.get('id', path[1])
+            self.builders['clubs'].append({**fields, 'club_id': club_id, 'club_key': path[1]})
+            for carnival_id in _id_list(fields.get('carnivals')):
+                self.builders['club_carnivals'].append({'club_id': club_id, 'carnival_id': carnival_id})
+        elif node == 'mandatoryTasks':
+            self.builders['mandatory_tasks'].append({**fields, 'template_id': fields.get('id', path[1])})
+        elif node == 'tasks':
+            club_task = path[2] == 'clubs'
+            self.builders['tasks'].append({
+                **fields,
+                'carnival_id': path[1],
+                'club_id': path[3] if club_task else None,
+                'scope': 'club' if club_task else 'carnival',
+                'task_key': path[-1],
+                'task_id': fields.get('id', path[-1]),
+            })
+
+    def frames(self):
+        return {name: builder.frame() for name, builder in self.builders.items()}
+
+def resolve_foreign_keys(tables):
+    """
+    Add carnival_name / club_name / activity to the tables keyed by
+    carnival_id and club_id; returns {table: {column: orphan row count}}
+    for the references that point at no carnival or club
+    """
+    carnivals = tables['carnivals'].drop_duplicates('carnival_id').set_index('carnival_id')
+    clubs = tables['clubs'].drop_duplicates('club_id').set_index('club_id')
+    orphans = {}
+
+    for name in ('tasks', 'club_carnivals', 'revenue_entries', 'revenue_totals'):
+        df = tables[name]
+        counts = {}
+        if 'carnival_id' in df.columns:
+            df['carnival_name'] = df['carnival_id'].map(carnivals['name'])
+            counts['carnival_id'] = int((df['carnival_id'].notna() & ~df['carnival_id'].isin(carnivals.index)).sum())
+        if 'club_id' in df.columns:
+            df['club_name'] = df['club_id'].map(clubs['name'])
+            df['activity'] = df['club_id'].map(clubs['activity'])
+            counts['club_id'] = int((df['club_id'].notna() & ~df['club_id'].isin(clubs.index)).sum())
+        orphans[name] = {column: count for column, count in counts.items() if count}
+    return {name: counts for name, counts in orphans.items() if counts}
+
+def tables_from_records(records, resolve=True, chunk_rows=TABLE_CHUNK_ROWS):
+    """
+    Typed tables of (path, value) records as iter_export_records yields them
+    """
+    tables = ExportTables(chunk_rows)
+    for record_path, value in records:
+        tables.add(record_path, value)
+
+    frames = tables.frames()
+    if resolve:
+        frames['orphans'] = resolve_foreign_keys(frames)
+    return frames
+
+def read_firebase_export(path, root=None, resolve=True, chunk_rows=TABLE_CHUNK_ROWS):
+    """
+    Typed tables of a Realtime Database JSON export:
+
+        carnivals, clubs, club_carnivals, tasks, mandatory_tasks,
+        revenue_entries, revenue_totals
+
+    path is a file path or an open text file. With resolve=True the tables
+    keyed by carnival_id / club_id get the carnival and club names joined
+    on, and the orphan references are returned under 'orphans'.
+    """
+    if hasattr(path, 'read'):
+        return tables_from_records(iter_export_records(path, root), resolve, chunk_rows)
+    with open(path, encoding='utf-8') as f:
+        return tables_from_records(iter_export_records(f, root), resolve, chunk_rows)
+
+def save_tables(tables, out_dir):
+    """
+    Write every table to out_dir as feather (or CSV without pyarrow)
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    written = []
+    for name, df in tables.items():
+        if not isinstance(df, pd.DataFrame):
+            continue
+        if feather is not None:
+            file_path = os.path.join(out_dir, f'{name}.feather')
+            feather.write_feather(df, file_path, compression=TABLE_COMPRESSION)
+        else:
+            file_path = os.path.join(out_dir, f'{name}.csv')
+            df.to_csv(file_path, index=False)
+        written.append(file_path)
+    return written
+
+def main():
+    if len(sys.argv) < 2:
+        print('Usage: python3 firebase_export.py <export.json> [out_dir] [root]')
+        sys.exit(1)
+
+    export_path = sys.argv[1]
+    out_dir = sys.argv[2] if len(sys.argv) > 2 else None
+    root = sys.argv[3] if len(sys.argv) > 3 else None
+
+    print(f'📥 Reading Firebase export: {export_path}')
+    tables = read_firebase_export(export_path, root)
+
+    for name, df in tables.items():
+        if isinstance(df, pd.DataFrame):
+            print(f'   📊 {name}: {len(df):,} rows')
+    for name, counts in tables['orphans'].items():
+        for column, count in counts.items():
+            print(f'   ⚠️ {name}: {count:,} rows reference an unknown {column}')
+
+    if out_dir:
+        written = save_tables(tables, out_dir)
+        print(f'📁 Saved {len(written)} tables to {out_dir}')
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+
+import io
+import json
+import queue
+import argparse
+import http.client
+from collections import deque
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit, quote, urlencode
+from firebase_export import EXPORT_NODES, iter_export_records, tables_from_records, save_tables
+
+# Database the carnival manager web app talks to (index.html)
+DEFAULT_DATABASE_URL = 'https://event-management-app-fbbae-default-rtdb.asia-southeast1.firebasedatabase.app/'
+
+DEFAULT_POOL_SIZE = 8
+DEFAULT_PAGE_SIZE = 500
+DEFAULT_TIMEOUT = 60
+
+# Query parameters sent as they are; the others are JSON encoded
+RAW_PARAMS = {'auth', 'access_token', 'print', 'format', 'timeout', 'writeSizeLimit'}
+
+# Connection errors after which a request on a reused keep-alive connection
+# is retried once on a fresh one
+STALE_CONNECTION_ERRORS = (http.client.RemoteDisconnected, http.client.BadStatusLine,
+                           ConnectionResetError, BrokenPipeError)
+
+class RTDBError(Exception):
+    """
+    Error response of the Realtime Database REST API
+    """
+
+    def __init__(self, status, message, path):
+        super().__init__(f'{status} on {path}: {message}')
+        self.status = status
+        self.message = message
+        self.path = path
+
+def key_order(key):
+    """
+    Sort key of a child key in orderBy="$key" order: keys that parse as
+    32-bit integers first, numerically, then the rest as strings
+    """
+    key = str(key)
+    if key.lstrip('-').isdigit() and (key == '0' or not key.lstrip('-').startswith('0')):
+        number = int(key)
+        if -2**31 <= number < 2**31:
+            return (0, number, '')
+    return (1, 0, key)
+
+class RTDBClient:
+    """
+    Realtime Database REST client over a pool of keep-alive connections
+
+    pool_size bounds the connections, and so the requests in flight from
+    all threads together. auth is a database secret or ID token sent with
+    every request.
+    """
+
+    def __init__(self, database_url=DEFAULT_DATABASE_URL, auth=None, pool_size=DEFAULT_POOL_SIZE,
+                 timeout=DEFAULT_TIMEOUT):
+        parts = urlsplit(database_url)
+        self.secure = parts.scheme == 'https'
+        self.host = parts.hostname
+        self.port = parts.port
+        self.base_path = parts.path.rstrip('/')
+        self.auth = auth
+        self.pool_size = pool_size
+        self.timeout = timeout
+        # Idle connections; None stands for a slot not connected yet
+        self._pool = queue.LifoQueue()
+        for _ in range(pool_size):
+            self._pool.put(None)
+
+    def _connect(self):
+        connection_class = http.client.HTTPSConnection if self.secure else http.client.HTTPConnection
+        return connection_class(self.host, self.port, timeout=self.timeout)
+
+    def _url(self, path, params=None):
+        params = dict(params or {})
+        if self.auth:
+            params['auth'] = self.auth
+        query = urlencode({key: value if key in RAW_PARAMS else json.dumps(value)
+                           for key, value in params.items()})
+        url = quote(f"{self.base_path}/{path.strip('/')}.json")
+        return f'{url}?{query}' if query else url
+
+    @contextmanager
+    def _response(self, method, path, params=None, data=None):
+        """
+        Open response of one request on a pooled connection; the connection
+        goes back to the pool when the body was read to the end
+        """
+        url = self._url(path, params)
+        body = json.dumps(data).encode('utf-8') if data is not None or method in ('PUT', 'PATCH', 'POST') else None
+        headers = {'Connection': 'keep-alive'}
+        if body is not None:
+            headers['Content-Type'] = 'application/json'
+
+        connection = self._pool.get()
+        reusable = False
+        try:
+            for attempt in range(2):
+                reused = connection is not None
+                if connection is None:
+                    connection = self._connect()
+                try:
+                    connection.request(method, url, body=body, headers=headers)
+                    response = connection.getresponse()
+                    break
+                except STALE_CONNECTION_ERRORS:
+                    connection.close()
+                    connection = None
+                    # POST is not idempotent, and a fresh connection failing is a real error
+                    if attempt or not reused or method == 'POST':
+                        raise
+
+            if response.status >= 300:
+                payload = response.read()
+                try:
+                    message = json.loads(payload).get('error', payload.decode('utf-8', 'replace'))
+                except (ValueError, AttributeError):
+                    message = payload.decode('utf-8', 'replace')
+                raise RTDBError(response.status, message, path)
+
+            yield response
+            reusable = response.isclosed() and not response.will_close
+        finally:
+            if connection is not None and not reusable:
+                connection.close()
+                connection = None
+            self._pool.put(connection)
+
+    def request(self, method, path, params=None, data=None):
+        """
+        Decoded JSON response of one request (None for an empty body)
+        """
+        with self._response(method, path, params, data) as response:
+            payload = response.read()
+        return json.loads(payload) if payload else None
+
+    def get(self, path, **params):
+        return self.request('GET', path, params)
+
+    @contextmanager
+    def open_stream(self, path, **params):
+        """
+        Text stream of a GET response body, for iter_export_records
+        """
+        with self._response('GET', path, params) as response:
+            stream = io.TextIOWrapper(response, encoding='utf-8')
+            yield stream
+            # Drain what the reader left so the connection can be reused
+            while response.read(1 << 16):
+                pass
+
+    def shallow_keys(self, path):
+        """
+        Child keys of a node in $key order, without their values
+        """
+        children = self.get(path, shallow=True)
+        if isinstance(children, dict):
+            return sorted(children, key=key_order)
+        if isinstance(children, list):
+            return [str(index) for index, child in enumerate(children) if child is not None]
+        return []
+
+    def iter_pages(self, path, page_size=DEFAULT_PAGE_SIZE, start_after=None):
+        """
+        Yield the children of a node page by page as {key: value} dicts in
+        $key order, following a startAt cursor with limitToFirst, one
+        request at a time
+        """
+        cursor = start_after
+        while True:
+            params = {'orderBy': '$key', 'limitToFirst': page_size + (cursor is not None)}
+            if cursor is not None:
+                params['startAt'] = str(cursor)
+            children = self.get(path, **params) or {}
+            keys = sorted(children, key=key_order)
+            if cursor is not None and keys and keys[0] == str(cursor):
+                keys = keys[1:]
+            if not keys:
+                return
+            yield {key: children[key] for key in keys}
+            if len(keys) < page_size:
+                return
+            cursor = keys[-1]
+
+    def key_ranges(self, path, page_size=DEFAULT_PAGE_SIZE):
+        """
+        (first key, key count) of every page of a node, from a shallow read
+        """
+        keys = self.shallow_keys(path)
+        return [(keys[start], len(keys[start:start + page_size])) for start in range(0, len(keys), page_size)]
+
+    def map_pages(self, func, path, page_size=DEFAULT_PAGE_SIZE, workers=None):
+        """
+        Yield func(first key, key count) for every page of a node, run on a
+        thread pool with at most workers pages in flight, in page order
+        """
+        workers = workers or self.pool_size
+        ranges = self.key_ranges(path, page_size)
+        with ThreadPoolExecutor(workers) as executor:
+            pending = deque()
+            for first_key, count in ranges:
+                pending.append(executor.submit(func, first_key, count))
+                if len(pending) >= workers:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+
+    def fetch_pages(self, path, page_size=DEFAULT_PAGE_SIZE, workers=None):
+        """
+        Same pages as iter_pages, fetched concurrently
+        """
+        def fetch(first_key, count):
+            children = self.get(path, orderBy='$key', startAt=first_key, limitToFirst=count) or {}
+            return {key: children[key] for key in sorted(children, key=key_order)}
+        return self.map_pages(fetch, path, page_size, workers)
+
+    def iter_records(self, node, page_size=DEFAULT_PAGE_SIZE, workers=None):
+        """
+        Export records (see firebase_export.iter_export_records) of one
+        top-level node, streamed page by page: every page is parsed from
+        the response as it arrives, so memory stays bounded by the pages in
+        flight
+        """
+        def fetch(first_key, count):
+            with self.open_stream(node, orderBy='$key', startAt=first_key, limitToFirst=count) as stream:
+                return list(iter_export_records(stream, root=node))
+        for records in self.map_pages(fetch, node, page_size, workers):
+            yield from records
+
+    def read_tables(self, nodes=EXPORT_NODES, page_size=DEFAULT_PAGE_SIZE, workers=None, resolve=True):
+        """
+        Typed tables (see firebase_export.read_firebase_export) of the live
+        database, read node by node in pages
+        """
+        def records():
+            for node in nodes:
+                yield from self.iter_records(node, page_size, workers)
+        return tables_from_records(records(), resolve)
+
+    def close(self):
+        while True:
+            try:
+                connection = self._pool.get_nowait()
+            except queue.Empty:
+                break
+            if connection is not None:
+                connection.close()
+        for _ in range(self.pool_size):
+            self._pool.put(None)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+def main():
+    parser = argparse.ArgumentParser(description='Read the carnival manager database into typed tables')
+    parser.add_argument('nodes', nargs='*', default=EXPORT_NODES)
+    parser.add_argument('--url', default=DEFAULT_DATABASE_URL)
+    parser.add_argument('--auth', help='database secret or ID token')
+    parser.add_argument('--page-size', type=int, default=DEFAULT_PAGE_SIZE)
+    parser.add_argument('--workers', type=int, default=DEFAULT_POOL_SIZE)
+    parser.add_argument('--out', help='save the tables to this directory')
+    args = parser.parse_args()
+
+    print(f'📥 Reading {", ".join(args.nodes)} from {args.url}')
+    with RTDBClient(args.url, args.auth, pool_size=args.workers) as client:
+        tables = client.read_tables(args.nodes, args.page_size, args.workers)
+
+    for name, df in tables.items():
+        if name != 'orphans':
+            print(f'   📊 {name}: {len(df):,} rows')
+    for name, counts in tables['orphans'].items():
+        for column, count in counts.items():
+            print(f'   ⚠️ {name}: {count:,} rows reference an unknown {column}')
+
+    if args.out:
+        written = save_tables(tables, args.out)
+        print(f'📁 Saved {len(written)} tables to {args.out}')
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+
+import json
+import argparse
+from collections import Counter
+from firebase_rest import RTDBClient, RTDBError, DEFAULT_DATABASE_URL
+from firebase_task_export import with_retries
+from local_rtdb import LocalRTDB, prune
+
+# Nodes synced by default; nodes missing from the desired tree are left alone
+SYNC_NODES = ['carnivals', 'clubs', 'tasks']
+
+# Paths per multi-location update; larger diffs are split into several
+DEFAULT_MAX_PATHS = 5000
+
+REPORT_LIMIT = 40
+
+def _items(value):
+    """
+    Children of a container keyed the way the database stores them
+    """
+    if isinstance(value, list):
+        return {str(index): child for index, child in enumerate(value) if not _is_empty(child)}
+    return {key: child for key, child in value.items() if not _is_empty(child)}
+
+def _is_empty(value):
+    """
+    Whether the database would store nothing for the value
+    """
+    return value is None or value == {} or value == []
+
+def _record_ids(records):
+    """
+    ids of an array of records, or None unless every entry is a record with
+    its own distinct id
+    """
+    ids = []
+    for record in records:
+        if record is None:
+            continue
+        if not isinstance(record, dict) or 'id' not in record or isinstance(record['id'], (dict, list)):
+            return None
+        ids.append(record['id'])
+    return ids if len(set(ids)) == len(ids) else None
+
+def _keyed_layout(current, desired):
+    """
+    Desired records laid out over the current array: records that stay
+    keep their place (and are diffed in place) and new ones are appended,
+    so one new or changed record is one write. Removed records close up,
+    rewriting the records after them, as the app reads arrays without gaps.
+    """
+    remaining = {record['id']: record for record in desired if record is not None}
+    layout = [None if record is None else remaining.pop(record['id']) for record in current
+              if record is None or record['id'] in remaining]
+    return layout + [record for record in desired if record is not None and record['id'] in remaining]
+
+def _diff(current, desired, path, changes):
+    if current == desired:
+        return
+    current = None if _is_empty(current) else current
+    desired = None if _is_empty(desired) else desired
+    if not (isinstance(current, (dict, list)) and isinstance(desired, (dict, list))):
+        if current == desired:
+            return
+        desired = prune(desired)
+        op = 'delete' if desired is None else 'set' if current is None else 'patch'
+        if current is not None or desired is not None:
+            changes.append((op, path, current, desired))
+        return
+
+    # Arrays of records (carnivals, clubs, task lists) are matched by id
+    if isinstance(current, list) and isinstance(desired, list) \
+            and _record_ids(current) is not None and _record_ids(desired) is not None:
+        desired = _keyed_layout(current, desired)
+
+    old, new = _items(current), _items(desired)
+    child_changes = []
+    for key in list(old) + [key for key in new if key not in old]:
+        _diff(old.get(key), new.get(key), path + (key,), child_changes)
+
+    # No child kept: one write of the node instead
+    if path and len(child_changes) > 1 and not (old.keys() & new.keys()):
+        changes.append(('patch', path, current, prune(desired)))
+    else:
+        changes.extend(child_changes)
+
+def diff_trees(current, desired, nodes=SYNC_NODES):
+    """
+    Smallest list of (op, path, old value, new value) turning the current
+    tree into the desired one for the given top-level nodes
+
+    op is 'set' for a new path, 'patch' for a changed value and 'delete'
+    for a removed one; paths are tuples of keys. Unchanged subtrees are
+    skipped with one comparison, nulls and empty containers count as
+    missing like in the database, and arrays of records with ids are
+    matched by id, so they keep the live tree's order.
+    """
+    current = current or {}
+    changes = []
+    for node in nodes:
+        if node in desired:
+            _diff(current.get(node), desired[node], (node,), changes)
+    return changes
+
+def update_body(changes):
+    """
+    Multi-location update body of a diff: path -> new value (None deletes)
+    """
+    return {'/'.join(str(part) for part in path): new for _, path, _, new in changes}
+
+def _short(value, width=60):
+    text = json.dumps(value, ensure_ascii=False, default=str)
+    return text if len(text) <= width else text[:width - 3] + '...'
+
+def diff_report(changes, limit=REPORT_LIMIT):
+    """
+    Dry-run report lines: write counts per node and operation, then the
+    first limit changes
+    """
+    counts = Counter((change[1][0], change[0]) for change in changes)
+    lines = [f'🔍 {len(changes):,} writes']
+    for (node, op), count in sorted(counts.items()):
+        lines.append(f'   {node}: {count:,} {op}')
+    for op, path, old, new in changes[:limit]:
+        path_text = '/'.join(str(part) for part in path)
+        if op == 'delete':
+            lines.append(f'   - {path_text}')
+        elif op == 'set':
+            lines.append(f'   + {path_text} = {_short(new)}')
+        else:
+            lines.append(f'   ~ {path_text}: {_short(old, 30)} -> {_short(new)}')
+    if len(changes) > limit:
+        lines.append(f'   ... {len(changes) - limit:,} more')
+    return lines
+
+def load_tree(source, nodes=SYNC_NODES):
+    """
+    {node: value} of the current tree from an RTDBClient or a JSON file
+    """
+    if isinstance(source, RTDBClient):
+        return {node: source.get(node) for node in nodes}
+    with open(source, encoding='utf-8') as f:
+        tree = json.load(f) or {}
+    return {node: tree.get(node) for node in nodes}
+
+def apply_changes(client, changes, max_paths=DEFAULT_MAX_PATHS):
+    """
+    Write the diff as multi-location updates at the database root of at
+    most max_paths paths each; returns the number of requests
+    """
+    body = update_body(changes)
+    paths = list(body)
+    requests = 0
+    for start in range(0, len(paths), max_paths):
+        chunk = {path: body[path] for path in paths[start:start + max_paths]}
+        with_retries(lambda: client.request('PATCH', '', {'print': 'silent'}, chunk))
+        requests += 1
+    return requests
+
+def apply_to_file(path, changes):
+    """
+    Apply the diff to a JSON tree file, as the database would
+    """
+    database = LocalRTDB.from_file(path)
+    for _, change_path, _, new in changes:
+        database.set([str(part) for part in change_path], new)
+    return database.save(path)
+
+def main():
+    parser = argparse.ArgumentParser(description='Sync a desired carnival manager tree to the database with minimal writes')
+    parser.add_argument('desired', help='JSON file with the desired carnivals / clubs / tasks')
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument('--url', default=DEFAULT_DATABASE_URL, help='database to sync')
+    target.add_argument('--current', help='JSON tree file standing in for the database')
+    parser.add_argument('--auth', help='database secret or ID token')
+    parser.add_argument('--nodes', default=','.join(SYNC_NODES))
+    parser.add_argument('--apply', action='store_true', help='write the changes (default is a dry run)')
+    parser.add_argument('--report', help='save the changes as JSON here')
+    parser.add_argument('--max-paths', type=int, default=DEFAULT_MAX_PATHS)
+    args = parser.parse_args()
+
+    nodes = args.nodes.split(',')
+    with open(args.desired, encoding='utf-8') as f:
+        desired = json.load(f)
+
+    print('🔄 FIREBASE SYNC' + ('' if args.apply else ' (dry run)'))
+    print('=' * 60)
+
+    client = None if args.current else RTDBClient(args.url, args.auth)
+    try:
+        current = load_tree(args.current or client, nodes)
+        changes = diff_trees(current, desired, nodes)
+        for line in diff_report(changes):
+            print(line)
+
+        if args.report:
+            with open(args.report, 'w', encoding='utf-8') as f:
+                json.dump([{'op': op, 'path': '/'.join(str(part) for part in path), 'old': old, 'new': new}
+                           for op, path, old, new in changes], f, indent=2, default=str)
+            print(f'📁 Report saved: {args.report}')
+
+        if args.apply and changes:
+            if args.current:
+                apply_to_file(args.current, changes)
+                print(f'✅ Applied {len(changes):,} writes to {args.current}')
+            else:
+                requests = apply_changes(client, changes, args.max_paths)
+                print(f'✅ Applied {len(changes):,} writes in {requests} update(s)')
+    except RTDBError as e:
+        print(f'❌ Sync failed: {e}')
+        raise SystemExit(1)
+    finally:
+        if client:
+            client.close()
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+
+import sys
+import time
+import random
+import hashlib
+import argparse
+import http.client
+from datetime import date, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from firebase_rest import RTDBClient, RTDBError, DEFAULT_DATABASE_URL, DEFAULT_POOL_SIZE
+
+# Tasks per multi-location PATCH
+DEFAULT_CHUNK_SIZE = 500
+
+MAX_RETRIES = 5
+BACKOFF_SECONDS = 0.5
+MAX_BACKOFF_SECONDS = 30
+
+# Responses worth retrying: rate limiting and transient server errors
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# App team of each action kind (the app's teams are Operations, Marketing, Finance)
+TASK_TEAMS = {'Launch': 'Operations', 'Expansion': 'Operations'}
+
+# Plan priority -> app task priority
+TASK_PRIORITIES = {'HIGH': 'high', 'MEDIUM': 'medium', 'LOW': 'low'}
+
+def task_key(kind, record):
+    """
+    Database key of an action's task, derived from what the action is
+    (kind, city, area, activity and club) rather than its LAUNCH_xxx /
+    EXP_xxx number, so re-exporting a regenerated plan hits the same keys
+    """
+    club = record.get('Club_Name') or record.get('Club_To_Expand') or ''
+    identity = '|'.join(str(part) for part in (kind, record['City'], record['Area'], record['Activity'], club))
+    return f"plan_{kind.lower()}_{hashlib.sha1(identity.encode('utf-8')).hexdigest()[:16]}"
+
+def action_tasks(action_table, created_at=None, team=None):
+    """
+    Yield (key, task) for every action of an ActionTable, mapped to the
+    app's task schema
+    """
+    created_at = created_at or date.today().isoformat()
+    team = team or TASK_TEAMS[action_table.kind]
+    expected_dates = {}
+    seen = set()
+
+    for record in action_table.records():
+        key = task_key(action_table.kind, record)
+        # Two actions with the same identity keep distinct keys, in plan order
+        base_key, suffix = key, 2
+        while key in seen:
+            key = f'{base_key}_{suffix}'
+            suffix += 1
+        seen.add(key)
+
+        week = record['Target_Week']
+        if week not in expected_dates:
+            expected_dates[week] = (action_table.start_date + timedelta(weeks=week - 1)).strftime('%Y-%m-%d')
+
+        yield key, {
+            'id': key,
+            'description': record['Specific_Action'],
+            'team': team,
+            'owner': record['Owner'],
+            'status': 'pending',
+            'priority': TASK_PRIORITIES.get(record['Priority'], 'medium'),
+            'progress': 0,
+            'createdAt': created_at,
+            'expectedDate': expected_dates[week],
+            'planActionId': record['ID'],
+        }
+
+def plan_tasks(action_tables, created_at=None):
+    """
+    {key: task} of the actions of several ActionTables
+    """
+    tasks = {}
+    for action_table in action_tables:
+        tasks.update(action_tasks(action_table, created_at))
+    return tasks
+
+def tasks_path(carnival_id, club_id=None):
+    """
+    Node holding the tasks: a carnival's carnivalTasks, or one club's tasks
+    within the carnival
+    """
+    if club_id is None:
+        return f'tasks/{carnival_id}/carnivalTasks'
+    return f'tasks/{carnival_id}/clubs/{club_id}'
+
+def with_retries(func, max_retries=MAX_RETRIES, backoff=BACKOFF_SECONDS):
+    """
+    Call func, retrying transient failures (RETRY_STATUSES responses and
+    connection errors) with exponential backoff and jitter
+    """
+    for attempt in range(max_retries + 1):
+        try:
+            return func()
+        except RTDBError as e:
+            if e.status not in RETRY_STATUSES or attempt == max_retries:
+                raise
+        except (OSError, http.client.HTTPException):
+            if attempt == max_retries:
+                raise
+        time.sleep(min(MAX_BACKOFF_SECONDS, backoff * 2 ** attempt) * random.uniform(0.5, 1.0))
+
+def upload_tasks(client, tasks, carnival_id, club_id=None, chunk_size=DEFAULT_CHUNK_SIZE, overwrite=False,
+                 workers=1, max_retries=MAX_RETRIES, backoff=BACKOFF_SECONDS):
+    """
+    Write {key: task} under the carnival (or club) tasks node with one
+    multi-location PATCH per chunk_size tasks
+
+    Keys are stable, so running the upload again is safe: tasks already in
+    the database are skipped, keeping the status and progress the team set
+    in the app, unless overwrite=True. Returns (uploaded, skipped).
+    """
+    path = tasks_path(carnival_id, club_id)
+    # The app keeps numeric carnival and club ids on every task
+    owners = {'carnivalId': int(carnival_id) if str(carnival_id).isdigit() else carnival_id}
+    if club_id is not None:
+        owners['clubId'] = int(club_id) if str(club_id).isdigit() else club_id
+
+    if not overwrite:
+        existing = set(with_retries(lambda: client.shallow_keys(path), max_retries, backoff))
+        pending = {key: task for key, task in tasks.items() if key not in existing}
+    else:
+        pending = dict(tasks)
+
+    keys = list(pending)
+    chunks = [keys[start:start + chunk_size] for start in range(0, len(keys), chunk_size)]
+
+    def upload(chunk):
+        payload = {key: {**pending[key], **owners} for key in chunk}
+        with_retries(lambda: client.request('PATCH', path, {'print': 'silent'}, payload), max_retries, backoff)
+        return len(chunk)
+
+    uploaded = 0
+    with ThreadPoolExecutor(max(1, workers)) as executor:
+        for count in executor.map(upload, chunks):
+            uploaded += count
+            print(f'   ⬆️ {uploaded:,}/{len(keys):,} tasks uploaded')
+    return uploaded, len(tasks) - len(pending)
+
+def export_plan_tasks(client, carnival_id, club_id=None, plan=None, created_at=None, **upload_options):
+    """
+    Build the plan (unless given) and upload its launch and expansion
+    actions as tasks; returns (uploaded, skipped)
+    """
+    if plan is None:
+        from EXACT_PLAN_STRUCTURE import build_plan
+        from workbook_source import WorkbookSource
+        working_sheet = WorkbookSource('OND-JFM Plan with actionbales V5.xlsx').sheet('Working sheet')
+        plan = build_plan(working_sheet)
+
+    tasks = plan_tasks([plan['club_launch_actions'], plan['club_expansion_actions']], created_at)
+    print(f'📋 {len(tasks):,} plan actions mapped to tasks under {tasks_path(carnival_id, club_id)}')
+    return upload_tasks(client, tasks, carnival_id, club_id, **upload_options)
+
+def main():
+    parser = argparse.ArgumentParser(description='Upload the plan launch/expansion actions as carnival manager tasks')
+    parser.add_argument('carnival_id', help='carnival the tasks belong to')
+    parser.add_argument('--club', help='file the tasks under this club of the carnival')
+    parser.add_argument('--url', default=DEFAULT_DATABASE_URL)
+    parser.add_argument('--auth', help='database secret or ID token')
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--overwrite', action='store_true', help='replace tasks that already exist')
+    args = parser.parse_args()
+
+    print('🚀 EXPORTING PLAN ACTIONS AS TASKS')
+    print('=' * 60)
+    with RTDBClient(args.url, args.auth, pool_size=max(args.workers, DEFAULT_POOL_SIZE)) as client:
+        try:
+            uploaded, skipped = export_plan_tasks(client, args.carnival_id, args.club, chunk_size=args.chunk_size,
+                                                  overwrite=args.overwrite, workers=args.workers)
+        except RTDBError as e:
+            print(f'❌ Upload failed: {e}')
+            sys.exit(1)
+
+    print(f'✅ {uploaded:,} tasks uploaded, {skipped:,} already in the database')
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -1,21 +1,37 @@
 #!/usr/bin/env python3
 
-import pandas as pd
-import numpy as np
-from openpyxl import load_workbook
 from openpyxl.styles import Font, PatternFill
-import re
+from openpyxl.utils import get_column_letter
+import sys
+from workbook_source import WorkbookSource
+from sheet_surgery import WorkbookPatch, SharedFormula
 
-def fix_formula_errors():
+def set_row_formula(ws, row_idx, column, formula, first_row, last_row, column_formulas=False):
+    """
+    Write a formula repeated down rows first_row..last_row of a column: the
+    row's own formula, or with column_formulas one shared formula written
+    from the first row that Excel stores and parses once
+    """
+    if not column_formulas:
+        ws.cell(row=row_idx, column=column, value=formula)
+    elif row_idx == first_row:
+        letter = get_column_letter(column)
+        ws.cell(row=row_idx, column=column, value=SharedFormula(f'{letter}{first_row}:{letter}{last_row}', formula))
+
+def fix_formula_errors(column_formulas=False):
     """
     Check and fix #NAME? errors in the dynamic replica
+
+    Only the Weekly_Execution and Milestones sheet parts are rewritten; the
+    other sheets are copied from the replica as they are. column_formulas
+    writes the per-row ratio, total and status formulas as shared formulas.
     """
 
     file_path = 'OND-JFM Plan DYNAMIC REPLICA.xlsx'
 
     try:
-        # Load workbook
-        wb = load_workbook(file_path)
+        # Open the workbook for sheet-level patching
+        wb = WorkbookPatch(file_path)
 
         print('🔍 CHECKING FOR FORMULA ERRORS')
         print('=' * 50)
@@ -24,17 +40,18 @@ def fix_formula_errors():
         if 'Weekly_Execution' in wb.sheetnames:
             ws_weekly = wb['Weekly_Execution']
             print('\n📊 FIXING WEEKLY_EXECUTION FORMULAS:')
-            fix_weekly_execution_formulas(ws_weekly)
+            fix_weekly_execution_formulas(ws_weekly, column_formulas)
 
         # Check Milestones formulas
         if 'Milestones' in wb.sheetnames:
             ws_milestones = wb['Milestones']
             print('\n📊 FIXING MILESTONES FORMULAS:')
-            fix_milestones_formulas(ws_milestones)
+            fix_milestones_formulas(ws_milestones, column_formulas)
 
         # Save the fixed file
         output_file = 'OND-JFM Plan DYNAMIC REPLICA FIXED.xlsx'
         wb.save(output_file)
+        wb.close()
         print(f'\n✅ Fixed file saved as: {output_file}')
 
         return True
@@ -43,7 +60,7 @@ def fix_formula_errors():
         print(f'❌ Error: {e}')
         return False
 
-def fix_weekly_execution_formulas(ws):
+def fix_weekly_execution_formulas(ws, column_formulas=False):
     """
     Fix Weekly_Execution formulas to prevent #NAME? errors
     """
@@ -70,31 +87,32 @@ def fix_weekly_execution_formulas(ws):
         'Mar 2025 (Weeks 18-22)'
     ]
 
-    for row_idx in range(2, min(20, len(week_groups) + 2)):
+    last_row = min(19, len(week_groups) + 1)
+    for row_idx in range(2, last_row + 1):
         week_group = week_groups[row_idx - 2] if row_idx - 2 < len(week_groups) else f'Week {row_idx-1} Group'
 
         # Use COUNTIFS with proper sheet references (without table notation)
         # Expansion metrics
         ws.cell(row=row_idx, column=4, value=f'=COUNTIFS(Club_Expansions.K:K,"{week_group}")')
         ws.cell(row=row_idx, column=5, value=f'=COUNTIFS(Club_Expansions.K:K,"{week_group}",Club_Expansions.K:K,"COMPLETED")')
-        ws.cell(row=row_idx, column=6, value=f'=IF(D{row_idx}=0,0,E{row_idx}/D{row_idx})')
+        set_row_formula(ws, row_idx, 6, f'=IF(D{row_idx}=0,0,E{row_idx}/D{row_idx})', 2, last_row, column_formulas)
 
         # Launch metrics
         ws.cell(row=row_idx, column=7, value=f'=COUNTIFS(Club_Launches.B:B,"{week_group}")')
         ws.cell(row=row_idx, column=8, value=f'=COUNTIFS(Club_Launches.B:B,"{week_group}",Club_Launches.K:K,"COMPLETED")')
-        ws.cell(row=row_idx, column=9, value=f'=IF(G{row_idx}=0,0,H{row_idx}/G{row_idx})')
+        set_row_formula(ws, row_idx, 9, f'=IF(G{row_idx}=0,0,H{row_idx}/G{row_idx})', 2, last_row, column_formulas)
 
         # Overall metrics
-        ws.cell(row=row_idx, column=10, value=f'=D{row_idx}+G{row_idx}')
-        ws.cell(row=row_idx, column=11, value=f'=E{row_idx}+H{row_idx}')
-        ws.cell(row=row_idx, column=12, value=f'=IF(J{row_idx}=0,0,K{row_idx}/J{row_idx})')
+        set_row_formula(ws, row_idx, 10, f'=D{row_idx}+G{row_idx}', 2, last_row, column_formulas)
+        set_row_formula(ws, row_idx, 11, f'=E{row_idx}+H{row_idx}', 2, last_row, column_formulas)
+        set_row_formula(ws, row_idx, 12, f'=IF(J{row_idx}=0,0,K{row_idx}/J{row_idx})', 2, last_row, column_formulas)
 
         # Revenue impact
         ws.cell(row=row_idx, column=13, value=f'=SUMIFS(Club_Expansions.J:J,Club_Expansions.B:B,"{week_group}",Club_Expansions.K:K,"COMPLETED")+SUMIFS(Club_Launches.J:J,Club_Launches.B:B,"{week_group}",Club_Launches.K:K,"COMPLETED")')
 
         print(f'  Fixed formulas for Week {row_idx-1} with group: {week_group}')
 
-def fix_milestones_formulas(ws):
+def fix_milestones_formulas(ws, column_formulas=False):
     """
     Fix Milestones formulas to prevent #NAME? errors
     """
@@ -110,16 +128,18 @@ def fix_milestones_formulas(ws):
         ws.cell(row=row_idx, column=14, value=f'=COUNTIFS(Club_Expansions.L:L,{week_num},Club_Expansions.K:K,"COMPLETED")+COUNTIFS(Club_Launches.L:L,{week_num},Club_Launches.K:K,"COMPLETED")')
 
         # Progress %
-        ws.cell(row=row_idx, column=15, value=f'=IF(M{row_idx}=0,0,N{row_idx}/M{row_idx})')
+        set_row_formula(ws, row_idx, 15, f'=IF(M{row_idx}=0,0,N{row_idx}/M{row_idx})', 2, 9, column_formulas)
 
         # Status notes
-        ws.cell(row=row_idx, column=16, value=f'=IF(O{row_idx}>=0.8,"On Track",IF(O{row_idx}>=0.5,"Delayed","Critical"))')
+        set_row_formula(ws, row_idx, 16, f'=IF(O{row_idx}>=0.8,"On Track",IF(O{row_idx}>=0.5,"Delayed","Critical"))',
+                        2, 9, column_formulas)
 
         print(f'  Fixed formulas for Milestone row {row_idx}')
 
-def create_simple_formula_version():
+def create_simple_formula_version(column_formulas=False):
     """
-    Create a version with simpler formulas that won't cause #NAME? errors
+    Create a version with simpler formulas that won't cause #NAME? errors;
+    column_formulas writes the per-row formulas as shared formulas
     """
 
     print('\n🔧 CREATING SIMPLE FORMULA VERSION')
@@ -128,29 +148,31 @@ def create_simple_formula_version():
     try:
         # Read the original sheets to get structure
         v2_file = 'OND-JFM Plan with actionbales final V2.xlsx'
-        weekly_exec = pd.read_excel(v2_file, sheet_name='Weekly_Execution')
-        milestones = pd.read_excel(v2_file, sheet_name='Milestones')
+        source = WorkbookSource(v2_file)
+        weekly_exec = source.sheet('Weekly_Execution')
+        milestones = source.sheet('Milestones')
 
-        # Load the dynamic replica
-        wb = load_workbook('OND-JFM Plan DYNAMIC REPLICA.xlsx')
+        # Open the dynamic replica for sheet-level patching
+        wb = WorkbookPatch('OND-JFM Plan DYNAMIC REPLICA.xlsx')
 
         # Replace Weekly_Execution with simpler version
         if 'Weekly_Execution' in wb.sheetnames:
             del wb['Weekly_Execution']
 
         ws_weekly = wb.create_sheet('Weekly_Execution')
-        create_simple_weekly_execution(ws_weekly, weekly_exec)
+        create_simple_weekly_execution(ws_weekly, weekly_exec, column_formulas)
 
         # Replace Milestones with simpler version
         if 'Milestones' in wb.sheetnames:
             del wb['Milestones']
 
         ws_milestones = wb.create_sheet('Milestones')
-        create_simple_milestones(ws_milestones, milestones)
+        create_simple_milestones(ws_milestones, milestones, column_formulas)
 
         # Save the simple version
         output_file = 'OND-JFM Plan SIMPLE REPLICA.xlsx'
         wb.save(output_file)
+        wb.close()
         print(f'✅ Simple version saved as: {output_file}')
 
         return True
@@ -159,7 +181,7 @@ def create_simple_formula_version():
         print(f'❌ Error creating simple version: {e}')
         return False
 
-def create_simple_weekly_execution(ws, original_data):
+def create_simple_weekly_execution(ws, original_data, column_formulas=False):
     """
     Create Weekly_Execution with simple formulas
     """
@@ -176,6 +198,7 @@ def create_simple_weekly_execution(ws, original_data):
         cell.font = Font(color='FFFFFF', bold=True)
 
     # Add data with simple formulas
+    last_row = len(original_data) + 1
     for row_idx, (_, original_row) in enumerate(original_data.iterrows(), 2):
         # Basic data columns
         ws.cell(row=row_idx, column=1, value=original_row['Week'])
@@ -185,16 +208,16 @@ def create_simple_weekly_execution(ws, original_data):
         # Simple placeholder values and formulas
         ws.cell(row=row_idx, column=4, value=10)  # Expansion Total
         ws.cell(row=row_idx, column=5, value=0)   # Expansion Done
-        ws.cell(row=row_idx, column=6, value=f'=IF(D{row_idx}=0,0,E{row_idx}/D{row_idx})')
+        set_row_formula(ws, row_idx, 6, f'=IF(D{row_idx}=0,0,E{row_idx}/D{row_idx})', 2, last_row, column_formulas)
 
         ws.cell(row=row_idx, column=7, value=15)  # Launch Total
         ws.cell(row=row_idx, column=8, value=0)   # Launch Done
-        ws.cell(row=row_idx, column=9, value=f'=IF(G{row_idx}=0,0,H{row_idx}/G{row_idx})')
+        set_row_formula(ws, row_idx, 9, f'=IF(G{row_idx}=0,0,H{row_idx}/G{row_idx})', 2, last_row, column_formulas)
 
         # Overall metrics
-        ws.cell(row=row_idx, column=10, value=f'=D{row_idx}+G{row_idx}')
-        ws.cell(row=row_idx, column=11, value=f'=E{row_idx}+H{row_idx}')
-        ws.cell(row=row_idx, column=12, value=f'=IF(J{row_idx}=0,0,K{row_idx}/J{row_idx})')
+        set_row_formula(ws, row_idx, 10, f'=D{row_idx}+G{row_idx}', 2, last_row, column_formulas)
+        set_row_formula(ws, row_idx, 11, f'=E{row_idx}+H{row_idx}', 2, last_row, column_formulas)
+        set_row_formula(ws, row_idx, 12, f'=IF(J{row_idx}=0,0,K{row_idx}/J{row_idx})', 2, last_row, column_formulas)
 
         # Revenue and activities
         ws.cell(row=row_idx, column=13, value=0)
@@ -206,7 +229,7 @@ def create_simple_weekly_execution(ws, original_data):
             cell = ws.cell(row=row, column=col)
             cell.number_format = '0.0%'
 
-def create_simple_milestones(ws, original_data):
+def create_simple_milestones(ws, original_data, column_formulas=False):
     """
     Create Milestones with simple formulas
     """
@@ -223,6 +246,7 @@ def create_simple_milestones(ws, original_data):
         cell.font = Font(color='FFFFFF', bold=True)
 
     # Add data with simple formulas
+    last_row = len(original_data) + 1
     for row_idx, (_, original_row) in enumerate(original_data.iterrows(), 2):
         # Copy basic data columns (1-12)
         for col_idx in range(1, 13):
@@ -232,8 +256,9 @@ def create_simple_milestones(ws, original_data):
         # Simple tracking formulas
         ws.cell(row=row_idx, column=13, value=25)  # Total Actions
         ws.cell(row=row_idx, column=14, value=0)   # Completed
-        ws.cell(row=row_idx, column=15, value=f'=IF(M{row_idx}=0,0,N{row_idx}/M{row_idx})')
-        ws.cell(row=row_idx, column=16, value=f'=IF(O{row_idx}>=0.8,"On Track",IF(O{row_idx}>=0.5,"Delayed","Critical"))')
+        set_row_formula(ws, row_idx, 15, f'=IF(M{row_idx}=0,0,N{row_idx}/M{row_idx})', 2, last_row, column_formulas)
+        set_row_formula(ws, row_idx, 16, f'=IF(O{row_idx}>=0.8,"On Track",IF(O{row_idx}>=0.5,"Delayed","Critical"))',
+                        2, last_row, column_formulas)
 
     # Format percentage column
     for row in range(2, 10):
@@ -244,11 +269,13 @@ def main():
     print('🔧 FIXING FORMULA ERRORS AND CREATING SIMPLE VERSION')
     print('=' * 60)
 
+    column_formulas = '--column-formulas' in sys.argv
+
     # Try to fix existing formulas
-    fix_formula_errors()
+    fix_formula_errors(column_formulas)
 
     # Create simple version as backup
-    create_simple_formula_version()
+    create_simple_formula_version(column_formulas)
 
     print('\n✅ COMPLETED:')
     print('   • Fixed complex formulas in DYNAMIC REPLICA FIXED.xlsx')
@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+
+import sys
+import json
+import time
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs, unquote
+from firebase_rest import key_order
+
+def _split_path(path):
+    path = unquote(path)
+    if path.endswith('.json'):
+        path = path[:-len('.json')]
+    return [part for part in path.split('/') if part]
+
+def _child(value, key):
+    if isinstance(value, dict):
+        return value.get(key)
+    if isinstance(value, list) and key.isdigit() and int(key) < len(value):
+        return value[int(key)]
+    return None
+
+def _children(value):
+    """
+    (key, child) pairs of a node, arrays keyed by index like the database does
+    """
+    if isinstance(value, dict):
+        return [(key, child) for key, child in value.items() if child is not None]
+    if isinstance(value, list):
+        return [(str(index), child) for index, child in enumerate(value) if child is not None]
+    return []
+
+def prune(value):
+    """
+    Drop nulls and empty containers, which the database never stores
+    """
+    if isinstance(value, dict):
+        pruned = {key: prune(child) for key, child in value.items()}
+        pruned = {key: child for key, child in pruned.items() if child is not None}
+        return pruned or None
+    if isinstance(value, list):
+        pruned = [prune(child) for child in value]
+        return pruned if any(child is not None for child in pruned) else None
+    return value
+
+class LocalRTDB:
+    """
+    Local stand-in for the Realtime Database REST API serving one JSON
+    document from memory over HTTP/1.1 keep-alive
+
+    Supports GET with shallow=true and orderBy="$key" with startAt, endAt,
+    limitToFirst and limitToLast, and PUT, PATCH (multi-location), POST and
+    DELETE. latency adds a delay per request to mimic the network and
+    fail_next() makes requests fail. Every request is logged in requests as
+    (method, path, params).
+    """
+
+    def __init__(self, data=None, port=0, latency=0.0):
+        self.data = data
+        self.port = port
+        self.latency = latency
+        self.lock = threading.Lock()
+        self.requests = []
+        self.server = None
+        self.thread = None
+        self._push_counter = 0
+        self._failures = []
+
+    def fail_next(self, count=1, status=503):
+        """
+        Answer the next count requests with an error status, for retry tests
+        """
+        with self.lock:
+            self._failures.extend([status] * count)
+
+    @classmethod
+    def from_file(cls, path, **kwargs):
+        with open(path, encoding='utf-8') as f:
+            return cls(json.load(f), **kwargs)
+
+    @property
+    def url(self):
+        return f'http://127.0.0.1:{self.server.server_address[1]}/'
+
+    def start(self):
+        database = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, format, *args):
+                pass
+
+            def _handle(self):
+                parts = urlsplit(self.path)
+                params = {key: values[-1] for key, values in parse_qs(parts.query).items()}
+                length = int(self.headers.get('Content-Length') or 0)
+                body = self.rfile.read(length) if length else b''
+                try:
+                    status, result = database.handle(self.command, _split_path(parts.path), params, body)
+                except ValueError as e:
+                    status, result = 400, {'error': str(e)}
+                payload = b'' if params.get('print') == 'silent' and status < 300 else json.dumps(result).encode('utf-8')
+                self.send_response(204 if not payload else status)
+                self.send_header('Content-Type', 'application/json; charset=utf-8')
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            do_GET = do_PUT = do_PATCH = do_POST = do_DELETE = _handle
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', self.port), Handler)
+        self.server.daemon_threads = True
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        if self.server:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+        return False
+
+    def handle(self, method, parts, params, body):
+        """
+        (status, JSON result) of one REST request on the document
+        """
+        with self.lock:
+            self.requests.append((method, '/' + '/'.join(parts), params))
+        if self.latency:
+            time.sleep(self.latency)
+
+        with self.lock:
+            if self._failures:
+                return self._failures.pop(0), {'error': 'Injected failure'}
+            if method == 'GET':
+                return 200, self.query(parts, params)
+            data = json.loads(body) if body else None
+            if method == 'PUT':
+                self.set(parts, data)
+                return 200, data
+            if method == 'PATCH':
+                if not isinstance(data, dict):
+                    raise ValueError('PATCH body must be an object')
+                for key, value in data.items():
+                    self.set(parts + [part for part in key.split('/') if part], value)
+                return 200, data
+            if method == 'POST':
+                self._push_counter += 1
+                name = f'-local{int(time.time() * 1000):013d}{self._push_counter:07d}'
+                self.set(parts + [name], data)
+                return 200, {'name': name}
+            if method == 'DELETE':
+                self.set(parts, None)
+                return 200, None
+        return 405, {'error': f'Method {method} not supported'}
+
+    def query(self, parts, params):
+        value = self.data
+        for part in parts:
+            value = _child(value, part)
+
+        if params.get('shallow') == 'true':
+            if isinstance(value, (dict, list)):
+                return {key: True if isinstance(child, (dict, list)) else child for key, child in _children(value)}
+            return value
+
+        order_by = params.get('orderBy')
+        if order_by is None:
+            return value
+        if json.loads(order_by) != '$key':
+            raise ValueError('Only orderBy="$key" is supported by the local stand-in')
+
+        children = sorted(_children(value), key=lambda item: key_order(item[0]))
+        if 'startAt' in params:
+            start = key_order(json.loads(params['startAt']))
+            children = [item for item in children if key_order(item[0]) >= start]
+        if 'endAt' in params:
+            end = key_order(json.loads(params['endAt']))
+            children = [item for item in children if key_order(item[0]) <= end]
+        if 'limitToFirst' in params:
+            children = children[:int(params['limitToFirst'])]
+        if 'limitToLast' in params:
+            children = children[-int(params['limitToLast']):]
+        return dict(children)
+
+    def set(self, parts, value):
+        """
+        Write value at the path, creating parents; None deletes
+        """
+        value = prune(value)
+        if not parts:
+            self.data = value
+            return
+        if value is None:
+            self._delete(parts)
+            return
+        if not isinstance(self.data, (dict, list)):
+            self.data = {}
+        parent = self.data
+        for depth, part in enumerate(parts[:-1]):
+            child = _child(parent, part)
+            if not isinstance(child, (dict, list)):
+                child = {}
+                parent = self._assign(parent, parts[:depth], part, child)
+            parent = child
+        self._assign(parent, parts[:-1], parts[-1], value)
+
+    def _delete(self, parts):
+        """
+        Remove the value at the path and the parents it leaves empty
+        """
+        chain = [self.data]
+        for part in parts[:-1]:
+            child = _child(chain[-1], part)
+            if not isinstance(child, (dict, list)):
+                return
+            chain.append(child)
+
+        for container, key in zip(reversed(chain), reversed(parts)):
+            if isinstance(container, dict):
+                container.pop(key, None)
+            elif isinstance(container, list) and key.isdigit() and int(key) < len(container):
+                container[int(key)] = None
+                while container and container[-1] is None:
+                    container.pop()
+            if _children(container):
+                return
+        self.data = None
+
+    def _assign(self, container, parent_parts, key, value):
+        if isinstance(container, list):
+            if key.isdigit() and int(key) < len(container):
+                container[int(key)] = value
+                return container
+            if key.isdigit() and int(key) == len(container):
+                container.append(value)
+                return container
+            # Arrays become objects once written past their end
+            as_object = {str(index): child for index, child in enumerate(container) if child is not None}
+            as_object[key] = value
+            self._replace(parent_parts, as_object)
+            return as_object
+        container[key] = value
+        return container
+
+    def _replace(self, parts, value):
+        if not parts:
+            self.data = value
+            return
+        parent = self.data
+        for part in parts[:-1]:
+            parent = _child(parent, part)
+        if isinstance(parent, list):
+            parent[int(parts[-1])] = value
+        else:
+            parent[parts[-1]] = value
+
+    def save(self, path):
+        with self.lock:
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(self.data, f)
+        return path
+
+def main():
+    port = int(sys.argv[2]) if len(sys.argv) > 2 else 9000
+    database = LocalRTDB.from_file(sys.argv[1], port=port) if len(sys.argv) > 1 else LocalRTDB({}, port=port)
+    database.start()
+    print(f'🔥 Local Realtime Database stand-in: {database.url}')
+    try:
+        database.thread.join()
+    except KeyboardInterrupt:
+        database.stop()
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+
+import os
+import re
+import zipfile
+import tempfile
+import functools
+from concurrent.futures import ProcessPoolExecutor
+import xlsxwriter
+from plan_trace import current_tracer, span, start_tracing, stop_tracing
+
+SHEET_PART = re.compile(r'^xl/worksheets/sheet(\d+)\.xml$')
+
+# The selected-tab flag sits in <sheetViews> near the top of a worksheet part
+SHEET_HEAD_BYTES = 1 << 16
+
+COPY_CHUNK_BYTES = 1 << 20
+
+def _fix_format_indices(formats):
+    """
+    Give every format its style index in creation order, so a format has the
+    same index in every process no matter which sheet uses it first
+    """
+    for cell_format in formats.values():
+        cell_format._get_xf_index()
+
+class _RowMap:
+    """
+    Worksheet proxy for a writer given only some data rows: its data row n
+    (1-based) is written to sheet row rows[n - 1] + 1, the header row stays
+    """
+
+    # Worksheet methods and the positions of their row arguments
+    ROW_ARGUMENTS = {'set_row': (0,), 'data_validation': (0, 2), 'conditional_format': (0, 2), 'merge_range': (0, 2)}
+
+    def __init__(self, worksheet, rows):
+        self._worksheet = worksheet
+        self._rows = [0] + [row + 1 for row in rows]
+
+    def __getattr__(self, name):
+        method = getattr(self._worksheet, name)
+        row_arguments = (0,) if name.startswith('write') else self.ROW_ARGUMENTS.get(name)
+        if row_arguments is None:
+            return method
+
+        def mapped(*args, **kwargs):
+            args = list(args)
+            for position in row_arguments:
+                args[position] = self._rows[args[position]]
+            return method(*args, **kwargs)
+
+        setattr(self, name, mapped)
+        return mapped
+
+def _render_sheet_part(job):
+    """
+    Worker: write one sheet into its own single-sheet workbook and return the
+    path; with rows, only those data rows (0-based) are written from args
+    """
+    part_path, sheet_name, write_sheet, args, define_formats, options = job[:6]
+    rows = job[6] if len(job) > 6 else None
+
+    # constant_memory writes strings inline, so the sheet part does not
+    # depend on a workbook-wide shared string table
+    workbook = xlsxwriter.Workbook(part_path, {**options, 'constant_memory': True})
+    formats = define_formats(workbook)
+    _fix_format_indices(formats)
+    worksheet = workbook.add_worksheet(sheet_name)
+    write_sheet(worksheet if rows is None else _RowMap(worksheet, rows), formats, *args)
+    workbook.close()
+    return part_path
+
+def _render_traced_part(job, memory):
+    """
+    Worker: _render_sheet_part inside a 'render <sheet>' span of its own
+    tracer; returns (part path, span records, tracer epoch, pid) for the
+    parent to merge
+    """
+    sheet_name, args = job[1], job[3]
+    tracer = start_tracing(memory)
+    try:
+        # Same rows_in as the serial writer: the length of the sheet's rows argument
+        with span(f'render {sheet_name}', rows_in=len(args[0]) if args[0] is not None else 0):
+            part_path = _render_sheet_part(job)
+    finally:
+        stop_tracing()
+    return part_path, tracer.records, tracer.epoch, tracer.pid
+
+def _write_skeleton(skeleton_path, sheet_names, define_formats, options):
+    """
+    Workbook with the final sheet list and styles but empty sheets
+    """
+    workbook = xlsxwriter.Workbook(skeleton_path, options)
+    _fix_format_indices(define_formats(workbook))
+    for sheet_name in sheet_names:
+        workbook.add_worksheet(sheet_name)
+    workbook.close()
+
+def _check_sheet_part(part, part_path):
+    if any(name.startswith('xl/worksheets/_rels/') for name in part.namelist()):
+        raise ValueError(f'{part_path}: sheets with tables, comments or links cannot be assembled')
+
+def _read_sheet_xml(part_path):
+    with zipfile.ZipFile(part_path) as part:
+        _check_sheet_part(part, part_path)
+        return part.read('xl/worksheets/sheet1.xml')
+
+def _copy_sheet_part(part_path, out, info, selected):
+    with zipfile.ZipFile(part_path) as part:
+        _check_sheet_part(part, part_path)
+
+        with part.open('xl/worksheets/sheet1.xml') as src, out.open(info, 'w', force_zip64=True) as dst:
+            head = src.read(SHEET_HEAD_BYTES)
+            if not selected:
+                head = head.replace(b' tabSelected="1"', b'', 1)
+            dst.write(head)
+            for chunk in iter(lambda: src.read(COPY_CHUNK_BYTES), b''):
+                dst.write(chunk)
+
+def _row_element(sheet_xml, row_number, start=0):
+    """
+    (start, end) of the <row> element of 1-based row_number in a worksheet part
+    """
+    begin = sheet_xml.find(b'<row r="%d"' % row_number, start)
+    if begin < 0:
+        raise ValueError(f'row {row_number} not found in the worksheet part')
+    tag_end = sheet_xml.index(b'>', begin) + 1
+    if sheet_xml[tag_end - 2:tag_end] == b'/>':
+        return begin, tag_end
+    return begin, sheet_xml.index(b'</row>', tag_end) + len(b'</row>')
+
+def splice_rows(sheet_xml, patch_xml, rows):
+    """
+    Worksheet part sheet_xml with the <row> elements of the data rows
+    (0-based, ascending) replaced by those in patch_xml, a part holding only
+    the header and these rows; the rest of sheet_xml is kept byte for byte
+    """
+    pieces = []
+    position = patch_position = 0
+    for row in rows:
+        begin, end = _row_element(sheet_xml, row + 2, position)
+        patch_begin, patch_end = _row_element(patch_xml, row + 2, patch_position)
+        pieces.append(sheet_xml[position:begin])
+        pieces.append(patch_xml[patch_begin:patch_end])
+        position, patch_position = end, patch_end
+    pieces.append(sheet_xml[position:])
+    return b''.join(pieces)
+
+def _assemble(output_file, skeleton_path, parts):
+    """
+    Copy the skeleton into output_file with its worksheet parts taken from
+    parts: a single-sheet workbook path, or the final part XML as bytes
+    """
+    with zipfile.ZipFile(skeleton_path) as skeleton, \
+            zipfile.ZipFile(output_file, 'w', zipfile.ZIP_DEFLATED) as out:
+        for info in skeleton.infolist():
+            match = SHEET_PART.match(info.filename)
+            out_info = zipfile.ZipInfo(info.filename, date_time=info.date_time)
+            out_info.compress_type = zipfile.ZIP_DEFLATED
+            if not match:
+                out.writestr(out_info, skeleton.read(info.filename))
+                continue
+            sheet_index = int(match.group(1))
+            part = parts[sheet_index - 1]
+            if isinstance(part, bytes):
+                with out.open(out_info, 'w', force_zip64=True) as dst:
+                    dst.write(part)
+            else:
+                _copy_sheet_part(part, out, out_info, selected=sheet_index == 1)
+
+def render_workbook_parallel(output_file, sheet_jobs, define_formats, options=None, processes=None):
+    """
+    Render the sheets of one xlsxwriter workbook in a process pool
+
+    sheet_jobs is a list of (sheet name, write_sheet, args); each
+    write_sheet(worksheet, formats, *args) must be a module-level function and
+    write its rows in order. Every worker builds its sheet in a separate
+    single-sheet workbook with the formats from define_formats(workbook), and
+    the worksheet parts are then copied into a skeleton workbook holding the
+    sheet list and the shared styles. While tracing is on, every worker
+    traces its sheet in a 'render <sheet>' span merged into this process's
+    tracer.
+    """
+    options = options or {}
+    processes = processes or min(len(sheet_jobs), os.cpu_count() or 1)
+
+    with tempfile.TemporaryDirectory(prefix='plan_parts_') as tmp_dir:
+        jobs = [
+            (os.path.join(tmp_dir, f'sheet{index}.xlsx'), sheet_name, write_sheet, args, define_formats, options)
+            for index, (sheet_name, write_sheet, args) in enumerate(sheet_jobs, start=1)
+        ]
+
+        skeleton_path = os.path.join(tmp_dir, 'skeleton.xlsx')
+        tracer = current_tracer()
+        with ProcessPoolExecutor(max_workers=processes) as pool:
+            if tracer is None:
+                parts = pool.map(_render_sheet_part, jobs)
+            else:
+                parts = pool.map(functools.partial(_render_traced_part, memory=tracer.memory), jobs)
+            _write_skeleton(skeleton_path, [sheet_name for sheet_name, _, _ in sheet_jobs], define_formats, options)
+            part_paths = list(parts)
+        if tracer is not None:
+            for _, records, epoch, pid in part_paths:
+                tracer.merge(records, epoch, pid)
+            part_paths = [part[0] for part in part_paths]
+
+        _assemble(output_file, skeleton_path, part_paths)
+
+    return output_file
+
+def render_workbook_incremental(output_file, sheet_jobs, define_formats, changes, options=None):
+    """
+    Write sheet_jobs like render_workbook_parallel (in this process), reusing
+    the worksheet parts of the workbook that output_file holds now
+
+    changes has one entry per sheet: None renders the sheet in full, and
+    (rows, args) keeps the previous part of that sheet with only the data
+    rows (0-based, ascending, maybe none) rendered again by
+    write_sheet(worksheet, formats, *args), where args carry just those rows
+    in order. The previous workbook must have been written by this function
+    or render_workbook_parallel with the same sheet list. Returns the number
+    of sheets (rendered, patched, kept).
+    """
+    options = options or {}
+    counts = {'rendered': 0, 'patched': 0, 'kept': 0}
+
+    with tempfile.TemporaryDirectory(prefix='plan_parts_') as tmp_dir:
+        previous = {}
+        if any(change is not None for change in changes):
+            with zipfile.ZipFile(output_file) as workbook:
+                for index, change in enumerate(changes, start=1):
+                    if change is not None:
+                        previous[index] = workbook.read(f'xl/worksheets/sheet{index}.xml')
+
+        parts = []
+        for index, ((sheet_name, write_sheet, args), change) in enumerate(zip(sheet_jobs, changes), start=1):
+            part_path = os.path.join(tmp_dir, f'sheet{index}.xlsx')
+            if change is not None and not change[0]:
+                counts['kept'] += 1
+                parts.append(previous[index])
+                continue
+            if change is not None:
+                rows, patch_args = change
+                _render_sheet_part((part_path, sheet_name, write_sheet, patch_args, define_formats, options, rows))
+                try:
+                    parts.append(splice_rows(previous[index], _read_sheet_xml(part_path), rows))
+                    counts['patched'] += 1
+                    continue
+                except ValueError:
+                    pass
+            counts['rendered'] += 1
+            parts.append(_render_sheet_part((part_path, sheet_name, write_sheet, args, define_formats, options)))
+
+        skeleton_path = os.path.join(tmp_dir, 'skeleton.xlsx')
+        _write_skeleton(skeleton_path, [sheet_name for sheet_name, _, _ in sheet_jobs], define_formats, options)
+        _assemble(output_file, skeleton_path, parts)
+
+    return counts['rendered'], counts['patched'], counts['kept']
\ No newline at end of file
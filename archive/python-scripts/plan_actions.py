@@ -0,0 +1,501 @@
+#!/usr/bin/env python3
+
+import pandas as pd
+import numpy as np
+from datetime import timedelta
+from collections import defaultdict
+from week_schedule import WeekSchedule
+
+DEFAULT_TARGET_DAYS = 'Monday, Wednesday, Friday'
+
+EMPTY_ACTION_GROUP = {'Launch_Actions': 0, 'Expansion_Actions': 0, 'Launch_Revenue': 0, 'Expansion_Revenue': 0}
+
+# Non-TOP 3 priority cut-offs: revenue per new club for launches and the
+# activity-wide revenue gap for expansions
+LAUNCH_REVENUE_THRESHOLD = 50000
+EXPANSION_REVENUE_THRESHOLD = 300000
+
+def week_to_target_date(weeks, start_date):
+    """
+    Map target weeks to 'Mon DD, YYYY' dates, formatting each distinct week once
+    """
+    week_dates = {week: (start_date + timedelta(weeks=week-1)).strftime('%b %d, %Y') for week in set(weeks)}
+    return [week_dates[week] for week in weeks]
+
+class ActivityStats:
+    """
+    Working-sheet aggregates built once and shared by the action generators,
+    City_Progress and Summary stages
+
+    by_activity holds per-activity revenue and club sums (indexed by Activity),
+    current_clubs/target_clubs are the per-row club counts with blanks filled
+    the way the plan treats them, and the total_* attributes are the
+    whole-sheet column sums.
+    """
+
+    def __init__(self, working_sheet):
+        self.current_clubs = working_sheet['Current_Clubs_Count'].fillna(0)
+        self.target_clubs = working_sheet['Clubs_Needed_Feb'].fillna(self.current_clubs)
+
+        grouped = working_sheet.groupby('Activity')
+        self.by_activity = pd.DataFrame({
+            'Rows': grouped.size(),
+            'Current_Clubs': grouped['Current_Clubs_Count'].sum(),
+            'Target_Clubs': grouped['Clubs_Needed_Feb'].sum(),
+            'Current_Revenue': grouped['Current revenue'].sum(),
+            'Target_Revenue': grouped['Revenue by March'].sum(),
+        })
+        self.by_activity['Revenue_Gap'] = self.by_activity['Target_Revenue'] - self.by_activity['Current_Revenue']
+
+        self.total_current_clubs = working_sheet['Current_Clubs_Count'].sum()
+        self.total_target_clubs = working_sheet['Clubs_Needed_Feb'].sum()
+        self.total_current_revenue = working_sheet['Current revenue'].sum()
+        self.total_target_revenue = working_sheet['Revenue by March'].sum()
+
+    def revenue_gap(self, activities):
+        """
+        Activity-wide revenue gap (Revenue by March - Current revenue) for each
+        entry of an Activity column; unknown activities map to 0
+        """
+        return activities.map(self.by_activity['Revenue_Gap']).fillna(0)
+
+def _factorized_category(values, positions):
+    """
+    Categorical of values[positions] built from the distinct values once;
+    blank (NaN) values stay blank
+    """
+    codes, uniques = pd.factorize(pd.Series(values, dtype=object))
+    return pd.Categorical.from_codes(codes[positions], uniques)
+
+def _derived_category(category, render):
+    """
+    Categorical of render(value) for every entry, rendering each category once
+    """
+    labels, codes = np.unique([render(value) for value in category.categories], return_inverse=True)
+    codes = np.asarray(codes, dtype=np.int32)
+    return pd.Categorical.from_codes(np.where(category.codes >= 0, codes[category.codes], -1), labels.tolist())
+
+def _render_launch_text(row, club):
+    """
+    Text fields of one launch action: the club-th (0-based) new club of a
+    Working-sheet row given as a dict of ActionTable params
+    """
+    activity, area, attendance, days, meetups = row['Activity'], row['Area'], row['Attendance'], row['Days'], row['Meetups']
+    new_clubs, revenue_per_club, top3 = row['New_Clubs'], row['Revenue_Per_Club'], row['Top3']
+
+    action_prefix = "🔥 MAX SCALING LAUNCH" if top3 else "STANDARD LAUNCH"
+
+    dependencies_str = " | ".join([
+        f"Secure venue for {meetups} days/week in {area}",
+        f"Recruit Community Manager for {area}",
+        f"Marketing campaign for {activity} in {area}",
+        f"Equipment/setup for {int(attendance)} people capacity"
+    ])
+
+    club_num = club + 1
+    if new_clubs == 1:
+        club_name = f"{activity} Club - {area}"
+        club_identifier = f"First club in {area}"
+    else:
+        club_name = f"{activity} Club #{club_num} - {area}"
+        club_identifier = f"Club {club_num} of {int(new_clubs)} planned clubs"
+
+    return {
+        'Type': f'{activity} Launch',
+        'Club_Name': club_name,
+        'Target_Schedule': days,
+        'Target_Capacity': int(attendance) if pd.notna(attendance) else 20,
+        'Specific_Action': f"{action_prefix}: Launch {club_name} with {meetups} days/week ({days})",
+        'Success_Criteria': f"Club operational with {int(attendance)} people/meetup for {2 if top3 else 3}+ weeks",
+        'Duration': 2 if top3 else 3,
+        'Dependencies': dependencies_str,
+        'Strategy_Notes': f"NEW AREA: {club_identifier} | TARGET: {days} ({int(attendance)} people) | REVENUE TARGET: ₹{revenue_per_club:,.0f} | STRATEGY: {row['Club_Strategy']}"
+    }
+
+def _render_expansion_text(row, club=0):
+    """
+    Text fields of the expansion action of one Working-sheet row given as a
+    dict of ActionTable params
+    """
+    activity, area, clubs, top3 = row['Activity'], row['Area'], row['Clubs'], row['Top3']
+    current_people, target_people = row['Current_People'], row['Target_People']
+    current_days, target_days = row['Current_Days'], row['Target_Days']
+    current_meetups, target_meetups = row['Current_Meetups'], row['Target_Meetups']
+
+    if clubs == 1:
+        club_to_expand = f"{activity} Club - {area}"
+        club_identifier = f"Only club in {area}"
+    else:
+        club_to_expand = f"{activity} Main Club - {area}"
+        club_identifier = f"Primary club (1 of {int(clubs)} clubs)"
+
+    changes = []
+    dependencies = []
+    if row['Meetup_Increase']:
+        changes.append(f"Expand from {current_meetups} to {target_meetups} days/week")
+        changes.append(f"Current: {current_days}")
+        changes.append(f"Target: {target_days}")
+        dependencies.append(f"Secure venue access for {target_meetups} days/week")
+        dependencies.append(f"Confirm {target_days} availability")
+    if row['Capacity_Increase']:
+        changes.append(f"Increase capacity from {int(current_people)} to {int(target_people)} people/meetup")
+        dependencies.append(f"Venue capacity for {int(target_people)} people")
+    dependencies.append("Community Manager capacity planning")
+
+    action_prefix = "🔥 MAX SCALING" if top3 else "STANDARD SCALING"
+
+    return {
+        'Type': f'{activity} Expansion',
+        'Club_To_Expand': club_to_expand,
+        'Current_Schedule': current_days,
+        'Target_Schedule': target_days,
+        'Current_Capacity': int(current_people) if pd.notna(current_people) else 0,
+        'Target_Capacity': int(target_people) if pd.notna(target_people) else 0,
+        'Specific_Action': f"{action_prefix}: Expand {club_to_expand} - {' | '.join(changes)}",
+        'Success_Criteria': f"Club operational with target schedule and capacity for {2 if top3 else 3}+ consecutive weeks",
+        'Duration': 2 if top3 else 3,
+        'Dependencies': " | ".join(dependencies),
+        'Strategy_Notes': f"CLUB: {club_identifier} | CURRENT: {current_days} ({int(current_people)} people) | TARGET: {target_days} ({int(target_people)} people) | STRATEGY: {row['Club_Strategy']}"
+    }
+
+# Per action kind: ID prefix, revenue field name, owner template and text renderer
+ACTION_KINDS = {
+    'Launch': ('LAUNCH', 'Revenue_Target', '{} Launch Team', _render_launch_text),
+    'Expansion': ('EXP', 'Revenue_Impact', '{} Expansion Team', _render_expansion_text),
+}
+
+class ActionTable:
+    """
+    Launch or expansion actions stored as typed columns (struct of arrays)
+
+    columns has one row per action: int ID, Row (position of the action's
+    Working-sheet row in params), Club (0-based club of that row) and
+    Target_Week, categorical Priority/City/Area/Activity/Owner and float
+    Revenue. params holds the per-Working-sheet-row template values as plain
+    lists, and the long text fields (Specific_Action, Dependencies,
+    Strategy_Notes, ...) are rendered from them only while records() is
+    iterated, unless render() filled them in beforehand.
+    """
+
+    def __init__(self, kind, start_date, params=None, row_index=(), club=(), priority=(), target_week=(), revenue=()):
+        self.kind = kind
+        self.start_date = start_date
+        self.params = params or {'Activity': [], 'City': [], 'Area': []}
+        self.rendered = None
+
+        row_index = np.asarray(row_index, dtype=np.int32)
+        activity = _factorized_category(self.params['Activity'], row_index)
+        owner_template = ACTION_KINDS[kind][2]
+        self.columns = pd.DataFrame({
+            'ID': np.arange(1, len(row_index) + 1, dtype=np.int32),
+            'Row': row_index,
+            'Club': np.asarray(club, dtype=np.int32),
+            'Priority': _factorized_category(np.asarray(priority, dtype=object), np.arange(len(row_index))),
+            'City': _factorized_category(self.params['City'], row_index),
+            'Area': _factorized_category(self.params['Area'], row_index),
+            'Activity': activity,
+            'Owner': _derived_category(activity, lambda value: owner_template.format(value.title())),
+            'Target_Week': np.asarray(target_week, dtype=np.int32),
+            'Revenue': np.asarray(revenue, dtype=np.float64),
+        })
+
+    def __len__(self):
+        return len(self.columns)
+
+    def _params_row(self, row):
+        return {name: values[row] for name, values in self.params.items()}
+
+    def _render_row(self, row, clubs):
+        render_text = ACTION_KINDS[self.kind][3]
+        params_row = self._params_row(row)
+        return [render_text(params_row, club) for club in range(clubs)]
+
+    def render(self, fragment_cache, row_keys):
+        """
+        Render the text fields of every action up front, one fragment per
+        params row through a plan_state.FragmentCache keyed by row_keys
+        """
+        clubs = np.bincount(self.columns['Row'].to_numpy(), minlength=len(row_keys)).tolist()
+        self.rendered = [
+            fragment_cache.get_or_render(row_key, lambda row=row: self._render_row(row, clubs[row]))
+            for row, row_key in enumerate(row_keys)
+        ]
+
+    def count_activities(self, activities):
+        """
+        Number of actions whose Activity is one of activities
+        """
+        return int(self.columns['Activity'].isin(activities).sum())
+
+    def sort_for_plan(self, top3_activities):
+        """
+        TOP 3 actions first, then by target week; ties keep their order
+        """
+        is_top3 = self.columns['Activity'].isin(top3_activities).to_numpy()
+        order = np.lexsort((self.columns['Target_Week'].to_numpy(), ~is_top3))
+        self.columns = self.columns.take(order).reset_index(drop=True)
+
+    def records(self):
+        """
+        Yield every action in table order as a dict of its sheet fields
+        """
+        id_prefix, revenue_field, _, render_text = ACTION_KINDS[self.kind]
+        columns = self.columns
+        week_dates = {}
+
+        for action_id, row, club, priority, city, area, activity, owner, week, revenue in zip(
+                columns['ID'].tolist(), columns['Row'].tolist(), columns['Club'].tolist(),
+                columns['Priority'].tolist(), columns['City'].tolist(), columns['Area'].tolist(),
+                columns['Activity'].tolist(), columns['Owner'].tolist(),
+                columns['Target_Week'].tolist(), columns['Revenue'].tolist()):
+            if week not in week_dates:
+                week_dates[week] = week_to_target_date([week], self.start_date)[0]
+            if self.rendered is not None:
+                text = self.rendered[row][club]
+            else:
+                text = render_text(self._params_row(row), club)
+
+            yield {
+                'ID': f'{id_prefix}_{action_id:03d}',
+                'Priority': priority,
+                'City': city,
+                'Area': area,
+                'Activity': activity,
+                'Owner': owner,
+                'Target_Week': week,
+                'Target_Date': week_dates[week],
+                revenue_field: revenue,
+                **text
+            }
+
+def _target_day_texts(rows, enhanced_target_days):
+    """
+    Target day list of every row: the enhanced override for its
+    (Activity, Area, City) first, then the sheet value
+    """
+    overrides = [enhanced_target_days.get(key) for key in zip(rows['Activity'].tolist(), rows['Area'].tolist(), rows['City'].tolist())]
+    sheet_days = rows['Target days by December in a week'].astype(object)
+    return pd.Series(overrides, index=rows.index, dtype=object).fillna(sheet_days)
+
+def generate_launch_actions(working_sheet, top3_activities, enhanced_target_days, start_date,
+                            fragment_cache=None, row_keys=None, revenue_threshold=LAUNCH_REVENUE_THRESHOLD):
+    """
+    Generate one launch action per new club as an ActionTable, computed over
+    whole columns
+
+    Rows are ordered by revenue impact (Revenue by March - Current revenue) and
+    every row needing new clubs is repeated once per club; IDs and target
+    weeks number the clubs across the whole plan.
+
+    With a fragment_cache (see plan_state.FragmentCache) and row_keys (row
+    fingerprints aligned with working_sheet), the text of every action is
+    rendered up front and rows whose fingerprint was rendered before reuse it.
+    Non-TOP 3 rows above revenue_threshold revenue per new club are MEDIUM.
+    """
+    working_sheet_sorted = working_sheet.copy()
+    working_sheet_sorted['Revenue_Impact'] = working_sheet_sorted['Revenue by March'] - working_sheet_sorted['Current revenue']
+    working_sheet_sorted = working_sheet_sorted.sort_values('Revenue_Impact', ascending=False)
+
+    current_clubs = working_sheet_sorted['Current_Clubs_Count'].fillna(0)
+    clubs_needed_feb = working_sheet_sorted['Clubs_Needed_Feb'].fillna(current_clubs)
+    new_clubs_needed = (clubs_needed_feb - current_clubs).where(clubs_needed_feb > current_clubs, 0)
+
+    needs_launch = (new_clubs_needed > 0).to_numpy()
+    rows = working_sheet_sorted[needs_launch]
+    new_clubs_needed = new_clubs_needed[needs_launch]
+
+    if rows.empty:
+        return ActionTable('Launch', start_date)
+
+    activities = rows['Activity'].tolist()
+    cities = rows['City'].tolist()
+    areas = rows['Area'].tolist()
+
+    revenue_increase = rows['Revenue by March'] - rows['Current revenue']
+    revenue_per_club = revenue_increase / new_clubs_needed
+
+    is_top3 = rows['Activity'].isin(top3_activities).to_numpy()
+    base_week = np.where(is_top3, 2, np.where(revenue_per_club > revenue_threshold, 5, 8))
+    priority_label = np.where(is_top3, 'HIGH', np.where(revenue_per_club > revenue_threshold, 'MEDIUM', 'LOW'))
+
+    # Target days: enhanced override table first, then the sheet value, then the default
+    target_days = [str(days) for days in _target_day_texts(rows, enhanced_target_days).fillna(DEFAULT_TARGET_DAYS).tolist()]
+    target_schedule = WeekSchedule.parse(target_days)
+
+    params = {
+        'Activity': activities,
+        'City': cities,
+        'Area': areas,
+        'Attendance': rows['Total people in a meetup'].tolist(),
+        'Club_Strategy': rows['Club_Strategy'].tolist(),
+        'New_Clubs': new_clubs_needed.tolist(),
+        'Revenue_Per_Club': revenue_per_club.tolist(),
+        'Top3': is_top3.tolist(),
+        'Days': target_days,
+        'Meetups': target_schedule.counts().tolist(),
+    }
+
+    # One action per new club; the week offset cycles over the whole plan
+    clubs = new_clubs_needed.to_numpy().astype(int)
+    row_index = np.repeat(np.arange(len(rows)), clubs)
+    position = np.arange(len(row_index))
+    club = position - np.repeat(np.cumsum(clubs) - clubs, clubs)
+    target_week = base_week[row_index] + position % 3
+
+    club_launch_actions = ActionTable(
+        'Launch', start_date, params, row_index, club, priority_label[row_index],
+        target_week, revenue_per_club.to_numpy()[row_index]
+    )
+    if fragment_cache is not None:
+        club_launch_actions.render(fragment_cache, row_keys[rows.index].tolist())
+
+    return club_launch_actions
+
+def generate_expansion_actions(working_sheet, top3_activities, enhanced_target_days, start_date, activity_stats=None,
+                               fragment_cache=None, row_keys=None, revenue_threshold=EXPANSION_REVENUE_THRESHOLD):
+    """
+    Generate one expansion action per existing-club row that needs more days,
+    more capacity or more than ₹1,000 additional revenue, as an ActionTable
+
+    Pass a prebuilt ActivityStats to reuse its per-activity revenue index.
+    fragment_cache and row_keys work as in generate_launch_actions. Priority
+    depends on the activity-wide revenue gap, which makes non-TOP 3
+    activities MEDIUM above revenue_threshold.
+    """
+    if activity_stats is None:
+        activity_stats = ActivityStats(working_sheet)
+
+    current_clubs = activity_stats.current_clubs
+    has_clubs = (current_clubs > 0).to_numpy()
+    rows = working_sheet[has_clubs]
+    current_clubs = current_clubs[has_clubs]
+
+    if rows.empty:
+        return ActionTable('Expansion', start_date)
+
+    activities = rows['Activity'].tolist()
+    cities = rows['City'].tolist()
+    areas = rows['Area'].tolist()
+
+    current_schedule = WeekSchedule.parse(rows['Current Days with Meetups'])
+    target_schedule = WeekSchedule.parse(_target_day_texts(rows, enhanced_target_days))
+
+    # No current day list: the sheet's meetup count stands in; no target: keep the current count
+    sheet_meetups = rows['Number of Meetups per Week currenty'].tolist()
+    current_meetups = [count if known else meetups for count, known, meetups in
+                       zip(current_schedule.counts().tolist(), current_schedule.known.tolist(), sheet_meetups)]
+    current_days = [text if text is not None else f"{int(meetups)} days/week" for text, meetups in
+                    zip(current_schedule.texts(), sheet_meetups)]
+    target_meetups = [count if known else current for count, known, current in
+                      zip(target_schedule.counts().tolist(), target_schedule.known.tolist(), current_meetups)]
+    target_days = target_schedule.texts(unknown='nan')
+
+    has_meetup_increase = np.array(target_meetups, dtype=float) > np.array(current_meetups, dtype=float)
+
+    current_attendance = rows['Average Attendance per Meetup']
+    target_attendance = rows['Total people in a meetup']
+    people_increase = (target_attendance - current_attendance).where(target_attendance.notna() & current_attendance.notna(), 0)
+    revenue_increase = rows['Revenue by March'] - rows['Current revenue']
+
+    needs_expansion = has_meetup_increase | (people_increase > 0).to_numpy() | (revenue_increase > 1000).to_numpy()
+    if not needs_expansion.any():
+        return ActionTable('Expansion', start_date)
+
+    # Priority: TOP 3 first, then by the activity-wide revenue gap
+    is_top3 = rows['Activity'].isin(top3_activities).to_numpy()
+    activity_revenue = activity_stats.revenue_gap(rows['Activity']).to_numpy()
+    base_week = np.where(is_top3, 1, np.where(activity_revenue > revenue_threshold, 6, 10))
+    priority_label = np.where(is_top3, 'HIGH', np.where(activity_revenue > revenue_threshold, 'MEDIUM', 'LOW'))
+
+    positions = np.flatnonzero(needs_expansion)
+    expansion_counter = np.arange(1, len(positions) + 1)
+    target_week = base_week[positions] + expansion_counter % 2
+
+    def take(values):
+        return [values[pos] for pos in positions.tolist()]
+
+    params = {
+        'Activity': take(activities),
+        'City': take(cities),
+        'Area': take(areas),
+        'Clubs': take(current_clubs.tolist()),
+        'Current_People': take(current_attendance.tolist()),
+        'Target_People': take(target_attendance.tolist()),
+        'Meetup_Increase': take(has_meetup_increase.tolist()),
+        'Capacity_Increase': take((people_increase > 0).tolist()),
+        'Current_Days': take(current_days),
+        'Target_Days': take(target_days),
+        'Current_Meetups': take(current_meetups),
+        'Target_Meetups': take(target_meetups),
+        'Club_Strategy': take(rows['Club_Strategy'].tolist()),
+        'Top3': take(is_top3.tolist()),
+    }
+
+    club_expansion_actions = ActionTable(
+        'Expansion', start_date, params, np.arange(len(positions)), np.zeros(len(positions)),
+        priority_label[positions], target_week, revenue_increase.to_numpy()[positions]
+    )
+    if fragment_cache is not None:
+        club_expansion_actions.render(fragment_cache, row_keys[rows.index[positions]].tolist())
+
+    return club_expansion_actions
+
+def _new_action_group():
+    return dict(EMPTY_ACTION_GROUP)
+
+def _group_totals(codes, revenue):
+    """
+    (code, count, revenue sum) per distinct code, summing in table order
+    """
+    keys, inverse = np.unique(codes, return_inverse=True)
+    counts = np.bincount(inverse, minlength=len(keys))
+    totals = np.bincount(inverse, weights=revenue, minlength=len(keys))
+    return zip(keys.tolist(), counts.tolist(), totals.tolist())
+
+class ActionIndex:
+    """
+    Launch/expansion action counts and revenue sums grouped in one pass
+
+    by_activity_city is keyed by (Activity, City) and by_week by Target_Week.
+    Each group holds Launch_Actions, Expansion_Actions, Launch_Revenue
+    (sum of Revenue_Target) and Expansion_Revenue (sum of Revenue_Impact),
+    accumulated in ActionTable order.
+    """
+
+    def __init__(self, club_launch_actions, club_expansion_actions):
+        self.by_activity_city = defaultdict(_new_action_group)
+        self.by_week = defaultdict(_new_action_group)
+
+        for table, kind in ((club_launch_actions, 'Launch'), (club_expansion_actions, 'Expansion')):
+            columns = table.columns
+            revenue = columns['Revenue'].to_numpy()
+
+            for week, count, total in _group_totals(columns['Target_Week'].to_numpy(), revenue):
+                week_group = self.by_week[week]
+                week_group[f'{kind}_Actions'] += count
+                week_group[f'{kind}_Revenue'] += total
+
+            # Blank Activity/City never match a Working-sheet row
+            activity = columns['Activity'].cat
+            city = columns['City'].cat
+            known = ((activity.codes >= 0) & (city.codes >= 0)).to_numpy()
+            pair_codes = activity.codes.to_numpy()[known].astype(np.int64) * len(city.categories) + city.codes.to_numpy()[known]
+            for pair, count, total in _group_totals(pair_codes, revenue[known]):
+                key = (activity.categories[pair // len(city.categories)], city.categories[pair % len(city.categories)])
+                group = self.by_activity_city[key]
+                group[f'{kind}_Actions'] += count
+                group[f'{kind}_Revenue'] += total
+
+    def for_activity_city(self, activity, city):
+        """
+        Group for one (Activity, City) pair; a fresh group of zeros when it
+        has no actions
+        """
+        return self.by_activity_city.get((activity, city)) or _new_action_group()
+
+    def for_week(self, week):
+        """
+        Group for one Target_Week; a fresh group of zeros when it has no
+        actions
+        """
+        return self.by_week.get(week) or _new_action_group()
\ No newline at end of file
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+
+import os
+import sys
+import json
+from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
+import pandas as pd
+from workbook_source import WorkbookSource
+from plan_actions import LAUNCH_REVENUE_THRESHOLD, EXPANSION_REVENUE_THRESHOLD
+from EXACT_PLAN_STRUCTURE import (build_plan, plan_sheet_jobs, write_plan_workbook,
+                                  TOP_3_MAXIMUM_SCALING, ENHANCED_TARGET_DAYS, PLAN_START_DATE)
+
+PLAN_INPUT = 'OND-JFM Plan with actionbales V5.xlsx'
+COMPARISON_OUTPUT = 'OND-JFM PLAN SCENARIO COMPARISON.xlsx'
+
+# Plan parameters a scenario can vary, with the values EXACT_PLAN_STRUCTURE uses
+SCENARIO_DEFAULTS = {
+    'top3_activities': TOP_3_MAXIMUM_SCALING,
+    'enhanced_target_days': ENHANCED_TARGET_DAYS,
+    'start_date': PLAN_START_DATE,
+    'launch_revenue_threshold': LAUNCH_REVENUE_THRESHOLD,
+    'expansion_revenue_threshold': EXPANSION_REVENUE_THRESHOLD,
+}
+
+# Scenario keys that are not plan parameters
+SCENARIO_OPTIONS = {'name', 'output_file'}
+
+PRIORITIES = ['HIGH', 'MEDIUM', 'LOW']
+
+# Run when no scenario file is given: today's plan and one change at a time
+DEFAULT_SCENARIOS = [
+    {'name': 'Baseline'},
+    {'name': 'No enhanced days', 'enhanced_target_days': {}},
+    {'name': 'TOP 3 + RUNNING', 'top3_activities': TOP_3_MAXIMUM_SCALING + ['RUNNING']},
+    {'name': 'Lower thresholds', 'launch_revenue_threshold': 25000, 'expansion_revenue_threshold': 150000},
+    {'name': 'Start Nov 11', 'start_date': datetime(2024, 11, 11)},
+]
+
+# Parsed input sheets, handed to each worker process once by _init_worker
+_shared_sheets = {}
+
+def _init_worker(working_sheet, events_sheet):
+    _shared_sheets['working'] = working_sheet
+    _shared_sheets['events'] = events_sheet
+
+def scenario_settings(scenario):
+    """
+    build_plan keyword arguments of a scenario: its own values over SCENARIO_DEFAULTS
+    """
+    unknown = set(scenario) - set(SCENARIO_DEFAULTS) - SCENARIO_OPTIONS
+    if unknown:
+        raise ValueError(f"Unknown scenario parameters: {', '.join(sorted(unknown))}")
+    return {key: scenario.get(key, default) for key, default in SCENARIO_DEFAULTS.items()}
+
+def summarize_plan(name, plan):
+    """
+    One comparison row: action counts, priority mix and the weekly revenue curve
+    """
+    launches = plan['club_launch_actions']
+    expansions = plan['club_expansion_actions']
+    priorities = pd.concat([launches.columns['Priority'].astype(object),
+                            expansions.columns['Priority'].astype(object)]).value_counts()
+
+    row = {
+        'Scenario': name,
+        'Launches': len(launches),
+        'Expansions': len(expansions),
+        'Total_Actions': len(launches) + len(expansions),
+    }
+    for priority in PRIORITIES:
+        row[f'{priority}_Actions'] = int(priorities.get(priority, 0))
+    for week in plan['weekly_plan']:
+        row[f"{week['Week']}_Revenue"] = week['Revenue_Target']
+    row['Total_Revenue'] = sum(week['Revenue_Target'] for week in plan['weekly_plan'])
+    return row
+
+def _evaluate_scenario(job):
+    """
+    Worker: build one scenario's plan from the shared sheets and summarize it
+    """
+    index, scenario, write_workbooks = job
+    name = scenario.get('name', f'Scenario {index}')
+    settings = scenario_settings(scenario)
+    working_sheet = _shared_sheets['working']
+
+    plan = build_plan(working_sheet, **settings)
+    row = summarize_plan(name, plan)
+
+    if write_workbooks:
+        output_file = scenario.get('output_file') or f'OND-JFM PLAN SCENARIO {index:02d}.xlsx'
+        sheet_jobs = plan_sheet_jobs(plan, working_sheet, _shared_sheets['events'], settings['top3_activities'])
+        write_plan_workbook(output_file, sheet_jobs)
+        row['Workbook'] = output_file
+
+    return row
+
+def run_scenarios(scenarios, file_path=PLAN_INPUT, write_workbooks=False, processes=None):
+    """
+    Evaluate a list of plan scenarios against one parse of the input workbook
+
+    Each scenario is a dict of SCENARIO_DEFAULTS keys to override, plus an
+    optional 'name' and, with write_workbooks, an optional 'output_file' for
+    its full plan workbook. The Working and Events sheets are parsed once and
+    passed to every worker process once; scenarios then run in parallel.
+    Returns a DataFrame with one row per scenario, in the order given.
+    """
+    for scenario in scenarios:
+        scenario_settings(scenario)
+
+    source = WorkbookSource(file_path)
+    working_sheet = source.sheet('Working sheet')
+    try:
+        events_sheet = source.sheet('Events')
+    except ValueError:
+        events_sheet = None
+
+    jobs = [(index, scenario, write_workbooks) for index, scenario in enumerate(scenarios, start=1)]
+    if not jobs:
+        return pd.DataFrame()
+    processes = processes or min(len(jobs), os.cpu_count() or 1)
+
+    with ProcessPoolExecutor(max_workers=processes, initializer=_init_worker,
+                             initargs=(working_sheet, events_sheet)) as pool:
+        rows = list(pool.map(_evaluate_scenario, jobs))
+
+    return pd.DataFrame(rows)
+
+def load_scenarios(path):
+    """
+    Read scenarios from a JSON list; start_date is 'YYYY-MM-DD' and
+    enhanced_target_days a list of [activity, area, city, days] entries
+    """
+    with open(path, encoding='utf-8') as f:
+        scenarios = json.load(f)
+
+    for scenario in scenarios:
+        if 'start_date' in scenario:
+            scenario['start_date'] = datetime.strptime(scenario['start_date'], '%Y-%m-%d')
+        if 'enhanced_target_days' in scenario:
+            scenario['enhanced_target_days'] = {
+                (activity, area, city): days for activity, area, city, days in scenario['enhanced_target_days']
+            }
+    return scenarios
+
+def main():
+    args = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    scenarios = load_scenarios(args[0]) if args else DEFAULT_SCENARIOS
+
+    print(f'🧪 RUNNING {len(scenarios)} PLAN SCENARIOS')
+    print('=' * 60)
+
+    comparison = run_scenarios(scenarios, write_workbooks='--workbooks' in sys.argv)
+    comparison.to_excel(COMPARISON_OUTPUT, index=False)
+
+    columns = ['Scenario', 'Launches', 'Expansions'] + [f'{p}_Actions' for p in PRIORITIES] + ['Total_Revenue']
+    print(comparison[columns].to_string(index=False))
+    print(f"\n✅ Comparison saved: {COMPARISON_OUTPUT}")
+    if 'Workbook' in comparison.columns:
+        for name, workbook in zip(comparison['Scenario'], comparison['Workbook']):
+            print(f"📁 {name}: {workbook}")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+
+import os
+import json
+import hashlib
+import numpy as np
+import pandas as pd
+
+STATE_SUFFIX = '.state.json'
+
+# Bump when the rendered action text fields, City_Progress rows or sheet
+# layouts change so old state files are ignored
+STATE_VERSION = 3
+
+# Above this share of changed rows a sheet is rendered in full rather than patched
+PATCH_MAX_SHARE = 0.5
+
+def row_fingerprints(df):
+    """
+    64-bit content hash of every row (index ignored), aligned with df.index
+    """
+    return pd.util.hash_pandas_object(df, index=False)
+
+def frame_fingerprint(df, row_keys=None):
+    """
+    Hash of a whole sheet including its column names, or None for no sheet;
+    pass row_keys when the row fingerprints are already computed
+    """
+    if df is None:
+        return None
+    if row_keys is None:
+        row_keys = row_fingerprints(df)
+    digest = hashlib.sha256(repr(list(df.columns)).encode('utf-8'))
+    digest.update(row_keys.to_numpy().tobytes())
+    return digest.hexdigest()
+
+def _value_fingerprint(value):
+    return int.from_bytes(hashlib.blake2b(repr(value).encode('utf-8'), digest_size=8).digest(), 'little')
+
+class RecordRows:
+    """
+    Stand-in for an ActionTable holding only some of its records
+    """
+
+    def __init__(self, records):
+        self._records = records
+
+    def __len__(self):
+        return len(self._records)
+
+    def records(self):
+        return iter(self._records)
+
+def sheet_rows(data):
+    """
+    The data rows a sheet writer gets, as a list: DataFrame rows, ActionTable
+    records or the dicts of a rows list; no rows for a missing sheet
+    """
+    if data is None:
+        return []
+    if isinstance(data, pd.DataFrame):
+        return data
+    if hasattr(data, 'records'):
+        return list(data.records())
+    return list(data)
+
+def sheet_fingerprint(sheet_name, write_sheet, args, rows=None):
+    """
+    (sheet key, row keys) of one sheet job; pass rows when sheet_rows(args[0])
+    is already computed. Equal keys render to equal worksheet rows
+    """
+    data = args[0]
+    if rows is None:
+        rows = sheet_rows(data)
+    if isinstance(rows, pd.DataFrame):
+        columns = list(rows.columns)
+        row_keys = row_fingerprints(rows).tolist()
+    else:
+        columns = None
+        row_keys = [_value_fingerprint(tuple(record.values())) for record in rows]
+    sheet_key = hashlib.sha256(repr((
+        STATE_VERSION, sheet_name, write_sheet.__qualname__,
+        data is None, columns, args[1:]
+    )).encode('utf-8')).hexdigest()
+    return sheet_key, row_keys
+
+def sheet_subset(rows, positions):
+    """
+    The data rows at positions (0-based) in the form the sheet writer takes
+    """
+    if isinstance(rows, pd.DataFrame):
+        return rows.iloc[positions]
+    return [rows[position] for position in positions]
+
+class FragmentCache:
+    """
+    Rendered per-row action fragments keyed by row fingerprint
+
+    Fragments from the previous run are reused for rows whose fingerprint
+    is unchanged; only the fragments used in this run are kept for the next.
+    """
+
+    def __init__(self, previous=None):
+        self.previous = previous or {}
+        self.current = {}
+        self.reused = 0
+        self.rendered = 0
+
+    def get_or_render(self, row_key, render):
+        if row_key in self.current:
+            return self.current[row_key]
+        if row_key in self.previous:
+            self.reused += 1
+            fragment = self.previous[row_key]
+        else:
+            self.rendered += 1
+            fragment = render()
+        self.current[row_key] = fragment
+        return fragment
+
+def _json_value(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f'{type(value).__name__} is not JSON serializable')
+
+def _cache_items(entries):
+    """
+    Cache dict as [key, value] pairs, since JSON object keys can only be strings
+    """
+    return [[key, value] for key, value in entries.items()]
+
+def _cache_dict(items):
+    return {tuple(key) if isinstance(key, list) else key: value for key, value in items or ()}
+
+class PlanState:
+    """
+    State file kept next to a generated plan workbook for incremental runs
+
+    It is plain JSON recording a fingerprint of the plan inputs
+    (Working-sheet rows, Events sheet and generation settings), the
+    size/mtime of the workbook written from them, the launch/expansion
+    fragments and City_Progress rows rendered per Working-sheet row, and the
+    key and row keys of every sheet written. A run with identical inputs and
+    an untouched workbook can skip the rebuild; a run after a few row edits
+    only renders the edited rows, and copies or patches the worksheet parts
+    of the previous workbook for sheets whose rows did not all change.
+    """
+
+    def __init__(self, output_file, settings):
+        self.output_file = output_file
+        self.path = output_file + STATE_SUFFIX
+        self.settings_key = hashlib.sha256(repr((STATE_VERSION, settings)).encode('utf-8')).hexdigest()
+
+        previous = self._load()
+        self.previous_inputs = previous.get('inputs')
+        self.previous_output = previous.get('output')
+        self.previous_sheets = previous.get('sheets') or []
+        self.sheets = []
+        self.launch_cache = FragmentCache(_cache_dict(previous.get('launch_fragments')))
+        self.expansion_cache = FragmentCache(_cache_dict(previous.get('expansion_fragments')))
+        self.city_cache = FragmentCache(_cache_dict(previous.get('city_rows')))
+
+    def _load(self):
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(state, dict) or state.get('settings') != self.settings_key:
+            return {}
+        return state
+
+    def _output_signature(self):
+        try:
+            stat = os.stat(self.output_file)
+        except OSError:
+            return None
+        return [stat.st_mtime_ns, stat.st_size]
+
+    def inputs_key(self, working_sheet, events_sheet, row_keys=None):
+        return [frame_fingerprint(working_sheet, row_keys), frame_fingerprint(events_sheet)]
+
+    def is_current(self, inputs_key):
+        """
+        True when the workbook on disk was written from exactly these inputs
+        """
+        output = self._output_signature()
+        return output is not None and self.previous_inputs == inputs_key and self.previous_output == output
+
+    def sheet_changes(self, sheet_jobs):
+        """
+        What to do with every sheet of sheet_jobs against the workbook on disk
+
+        One entry per sheet: None to render it in full, or (positions,
+        args) to keep the previous worksheet part with only the data rows at
+        positions (0-based, maybe none) rendered again from args. Parts are
+        only reused when the workbook is the one this state was saved with.
+        """
+        intact = self.previous_output is not None and self.previous_output == self._output_signature()
+        previous_sheets = self.previous_sheets if intact else []
+        if [sheet[0] for sheet in previous_sheets] != [sheet_name for sheet_name, _, _ in sheet_jobs]:
+            previous_sheets = [None] * len(sheet_jobs)
+
+        self.sheets = []
+        changes = []
+        for (sheet_name, write_sheet, args), previous in zip(sheet_jobs, previous_sheets):
+            rows = sheet_rows(args[0])
+            sheet_key, row_keys = sheet_fingerprint(sheet_name, write_sheet, args, rows)
+            self.sheets.append([sheet_name, sheet_key, row_keys])
+
+            if previous is None or previous[1] != sheet_key or len(previous[2]) != len(row_keys):
+                changes.append(None)
+                continue
+            positions = [position for position, (old, new) in enumerate(zip(previous[2], row_keys)) if old != new]
+            if len(positions) > PATCH_MAX_SHARE * len(row_keys):
+                changes.append(None)
+                continue
+            data = sheet_subset(rows, positions)
+            if hasattr(args[0], 'records'):
+                data = RecordRows(data)
+            changes.append((positions, (data,) + tuple(args[1:])))
+        return changes
+
+    def save(self, inputs_key):
+        """
+        Record the inputs, fragments and sheets of the workbook just written
+        """
+        state = {
+            'settings': self.settings_key,
+            'inputs': inputs_key,
+            'output': self._output_signature(),
+            'sheets': self.sheets,
+            'launch_fragments': _cache_items(self.launch_cache.current),
+            'expansion_fragments': _cache_items(self.expansion_cache.current),
+            'city_rows': _cache_items(self.city_cache.current),
+        }
+        tmp_path = self.path + '.tmp'
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                # dumps uses the C encoder, dump does not
+                f.write(json.dumps(state, default=_json_value))
+            os.replace(tmp_path, self.path)
+            return True
+        except (OSError, TypeError, ValueError) as e:
+            print(f'⚠️ Could not write plan state {self.path}: {e}')
+            return False
\ No newline at end of file
@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+
+import os
+import json
+import time
+import functools
+import tracemalloc
+from contextlib import contextmanager
+
+# Output file of a traced run; .json gives a Chrome trace, anything else JSON lines
+TRACE_ENV = 'PLAN_TRACE'
+
+# Active Tracer, or None while tracing is off
+_tracer = None
+
+class _DisabledSpan:
+    """
+    Shared span handed out while tracing is off: entering, leaving and
+    setting rows on it does nothing
+    """
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def __setattr__(self, name, value):
+        pass
+
+_DISABLED_SPAN = _DisabledSpan()
+
+class Span:
+    """
+    One timed stage; set rows_out (and rows_in when not known up front)
+    inside the with block
+    """
+
+    def __init__(self, tracer, name, rows_in=None, attrs=None):
+        self.tracer = tracer
+        self.name = name
+        self.rows_in = rows_in
+        self.rows_out = None
+        self.attrs = attrs or {}
+        self.parent = None
+        self._peak = 0
+
+    def __enter__(self):
+        tracer = self.tracer
+        self.parent = tracer.stack[-1] if tracer.stack else None
+        if tracer.memory:
+            # Fold the running peak into the parent before this span resets it
+            current, peak = tracemalloc.get_traced_memory()
+            if self.parent:
+                self.parent._peak = max(self.parent._peak, peak)
+            tracemalloc.reset_peak()
+            self._memory_start = current
+        tracer.stack.append(self)
+        self._cpu_start = time.process_time()
+        self._wall_start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        wall_end = time.perf_counter()
+        cpu_end = time.process_time()
+        tracer = self.tracer
+        tracer.stack.pop()
+
+        peak_mb = None
+        if tracer.memory:
+            self._peak = max(self._peak, tracemalloc.get_traced_memory()[1])
+            if self.parent:
+                self.parent._peak = max(self.parent._peak, self._peak)
+            peak_mb = round((self._peak - self._memory_start) / 2**20, 3)
+
+        tracer.records.append({
+            'name': self.name,
+            'parent': self.parent.name if self.parent else None,
+            'depth': len(tracer.stack),
+            'start_s': round(self._wall_start - tracer.origin, 6),
+            'wall_s': round(wall_end - self._wall_start, 6),
+            'cpu_s': round(cpu_end - self._cpu_start, 6),
+            'rows_in': self.rows_in,
+            'rows_out': self.rows_out,
+            'peak_mb': peak_mb,
+            'ok': exc_type is None,
+            **self.attrs,
+        })
+        return False
+
+class Tracer:
+    """
+    Collects finished spans of one process; memory=True also records the
+    tracemalloc peak above each span's starting allocation
+    """
+
+    def __init__(self, memory=True):
+        self.memory = memory
+        self.records = []
+        self.stack = []
+        self.origin = time.perf_counter()
+        # Wall-clock time of origin, to line up the spans of other processes
+        self.epoch = time.time()
+        self.pid = os.getpid()
+
+    def merge(self, records, epoch, pid):
+        """
+        Add the spans another process recorded with a Tracer started at
+        epoch, nested under the span open here and shifted onto this
+        tracer's clock
+        """
+        parent = self.stack[-1].name if self.stack else None
+        offset = epoch - self.epoch
+        for record in records:
+            self.records.append({
+                **record,
+                'parent': record['parent'] if record['parent'] is not None else parent,
+                'depth': record['depth'] + len(self.stack),
+                'start_s': round(record['start_s'] + offset, 6),
+                'pid': pid,
+            })
+
+    def export_jsonl(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            for record in self.records:
+                f.write(json.dumps(record, default=str) + '\n')
+        return path
+
+    def export_chrome_trace(self, path):
+        """
+        Chrome trace event file (chrome://tracing, Perfetto) with one
+        complete event per span
+        """
+        events = []
+        for record in self.records:
+            args = {key: value for key, value in record.items()
+                    if key not in ('name', 'parent', 'depth', 'start_s', 'wall_s', 'pid') and value is not None}
+            events.append({
+                'name': record['name'],
+                'cat': 'plan',
+                'ph': 'X',
+                'ts': round(record['start_s'] * 1e6, 1),
+                'dur': round(record['wall_s'] * 1e6, 1),
+                'pid': record.get('pid', self.pid),
+                'tid': 0,
+                'args': args,
+            })
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f, default=str)
+        return path
+
+    def export(self, path):
+        if path.endswith('.json'):
+            return self.export_chrome_trace(path)
+        return self.export_jsonl(path)
+
+def start_tracing(memory=True):
+    """
+    Turn tracing on for this process and return the new Tracer
+    """
+    global _tracer
+    _tracer = Tracer(memory)
+    if memory and not tracemalloc.is_tracing():
+        tracemalloc.start()
+    return _tracer
+
+def stop_tracing():
+    """
+    Turn tracing off and return the Tracer that was active
+    """
+    global _tracer
+    tracer, _tracer = _tracer, None
+    if tracer and tracer.memory and tracemalloc.is_tracing():
+        tracemalloc.stop()
+    return tracer
+
+def tracing_enabled():
+    return _tracer is not None
+
+def current_tracer():
+    """
+    Active Tracer, or None while tracing is off
+    """
+    return _tracer
+
+def span(name, rows_in=None, **attrs):
+    """
+    Context manager timing one stage:
+
+        with span('generate_launches', rows_in=len(working_sheet)) as s:
+            ...
+            s.rows_out = len(actions)
+
+    Costs one global lookup while tracing is off.
+    """
+    if _tracer is None:
+        return _DISABLED_SPAN
+    return Span(_tracer, name, rows_in, attrs)
+
+def traced(name=None, rows_out=None):
+    """
+    Decorator running a function inside a span named after it; rows_out is
+    an optional function of the result giving the output row count
+    """
+    def decorate(func):
+        span_name = name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _tracer is None:
+                return func(*args, **kwargs)
+            with Span(_tracer, span_name) as current:
+                result = func(*args, **kwargs)
+                if rows_out is not None and result is not None:
+                    current.rows_out = rows_out(result)
+                return result
+        return wrapper
+    return decorate
+
+@contextmanager
+def trace_run(path=None, memory=True):
+    """
+    Trace the enclosed run and export it to path, which defaults to the
+    PLAN_TRACE environment variable; does nothing when neither is set
+    """
+    path = path or os.environ.get(TRACE_ENV)
+    if not path:
+        yield None
+        return
+
+    tracer = start_tracing(memory)
+    try:
+        yield tracer
+    finally:
+        stop_tracing()
+        tracer.export(path)
+        print(f'🧭 Trace saved: {path} ({len(tracer.records)} spans)')
\ No newline at end of file
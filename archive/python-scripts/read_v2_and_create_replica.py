@@ -1,12 +1,13 @@
 #!/usr/bin/env python3
 
 import pandas as pd
-import numpy as np
-from openpyxl import Workbook
-from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
-from openpyxl.utils.dataframe import dataframe_to_rows
-import re
+import sys
+from workbook_source import WorkbookSource
+from replica_writer import create_replica_writer, copy_dataframe_to_sheet
+from club_names import club_name_extractor, club_name_index, join_club_names
+from plan_trace import span, traced, trace_run
 
+@traced('read_inputs', rows_out=lambda result: sum(len(df) for df in (result[0] or {}).values()))
 def read_v2_and_create_replica():
     """
     Read OND-JFM Plan with actionables final V2.xlsx and create replica with all sheets
@@ -19,12 +20,12 @@ def read_v2_and_create_replica():
 
     try:
         # Read all sheets from V2 file
-        xl_file = pd.ExcelFile(v2_file)
-        sheet_names = xl_file.sheet_names
+        source = WorkbookSource(v2_file)
+        sheet_names = source.sheet_names
         print(f'📊 Found {len(sheet_names)} sheets: {sheet_names}')
 
         # Read working sheet first
-        working_sheet = pd.read_excel(v2_file, sheet_name='Working sheet')
+        working_sheet = source.sheet('Working sheet')
         print(f'✅ Working sheet loaded: {working_sheet.shape[0]} rows, {working_sheet.shape[1]} columns')
 
         # Display column names
@@ -34,7 +35,7 @@ def read_v2_and_create_replica():
         all_sheets = {}
         for sheet_name in sheet_names:
             try:
-                all_sheets[sheet_name] = pd.read_excel(v2_file, sheet_name=sheet_name)
+                all_sheets[sheet_name] = source.sheet(sheet_name)
                 print(f'✅ Read {sheet_name}: {all_sheets[sheet_name].shape}')
             except Exception as e:
                 print(f'❌ Error reading {sheet_name}: {e}')
@@ -48,6 +49,7 @@ def read_v2_and_create_replica():
         print(f'❌ Error reading file: {e}')
         return None, None
 
+@traced('parse_club_strategy', rows_out=lambda result: len(result[0]) + len(result[1]))
 def parse_club_strategy_for_expansion(working_sheet):
     """
     Parse club strategy column to extract club names for expansion
@@ -57,7 +59,13 @@ def parse_club_strategy_for_expansion(working_sheet):
     expansion_data = []
     maintenance_data = []
 
-    for idx, row in working_sheet.iterrows():
+    # Extract club names once per distinct strategy text
+    if 'Club_Strategy' in working_sheet.columns:
+        club_names_by_row = club_name_extractor.extract_many(working_sheet['Club_Strategy'])
+    else:
+        club_names_by_row = [club_name_extractor.extract('')] * len(working_sheet)
+
+    for (idx, row), club_names in zip(working_sheet.iterrows(), club_names_by_row):
         activity = row.get('Activity', '')
         city = row.get('City', '')
         area = row.get('Area', '')
@@ -65,9 +73,6 @@ def parse_club_strategy_for_expansion(working_sheet):
         current_clubs = row.get('Current_Clubs_Count', 0) if pd.notna(row.get('Current_Clubs_Count')) else 0
         clubs_needed = row.get('Clubs_Needed_Feb', 0) if pd.notna(row.get('Clubs_Needed_Feb')) else 0
 
-        # Extract club names from strategy text
-        club_names = extract_club_names_from_strategy(club_strategy)
-
         new_clubs_needed = max(0, clubs_needed - current_clubs)
 
         if new_clubs_needed > 0 and club_names:
@@ -106,29 +111,7 @@ def extract_club_names_from_strategy(strategy_text):
     """
     Extract club names from strategy text
     """
-    club_names = []
-
-    # Common patterns to look for club names
-    patterns = [
-        r'([A-Z][a-zA-Z\s]+?)\s+(?:club|Club)',  # "GameMasters club"
-        r'Launch\s+([A-Z][a-zA-Z\s]+?)\s+',       # "Launch Ballers "
-        r'Expand\s+([A-Z][a-zA-Z\s]+?)\s+',       # "Expand Ballers "
-        r'Scale\s+([A-Z][a-zA-Z\s]+?)\s+',        # "Scale GameMasters "
-        r'([A-Z][a-zA-Z]+(?:\s+[A-Z][a-zA-Z]+)*)',  # General capitalized words
-    ]
-
-    for pattern in patterns:
-        matches = re.findall(pattern, strategy_text)
-        for match in matches:
-            clean_name = match.strip()
-            if len(clean_name) > 2 and clean_name not in ['Launch', 'Expand', 'Scale', 'Club', 'Area', 'Month']:
-                club_names.append(clean_name)
-
-    # If no specific names found, create generic ones based on activity
-    if not club_names and any(keyword in strategy_text.lower() for keyword in ['launch', 'expand', 'scale']):
-        club_names = ['Primary Club']
-
-    return list(set(club_names))  # Remove duplicates
+    return club_name_extractor.extract(strategy_text)
 
 def generate_specific_action_from_strategy(original_action, club_name, activity, area):
     """
@@ -155,42 +138,45 @@ def generate_specific_action_from_strategy(original_action, club_name, activity,
 
     return action
 
-def create_replica_with_maintenance(all_sheets, working_sheet, expansion_data, maintenance_data):
+def create_replica_with_maintenance(all_sheets, working_sheet, expansion_data, maintenance_data, streaming=False):
     """
     Create replica of all sheets with club maintenance sheet
+
+    streaming=True writes through the constant-memory xlsxwriter backend
+    instead of building the whole workbook in memory.
     """
     print('\n📝 Creating replica with all sheets...')
 
-    wb = Workbook()
-
-    # Remove default sheet
-    wb.remove(wb.active)
+    output_file = 'OND-JFM Plan REPLICA with Club Maintenance.xlsx'
+    writer = create_replica_writer(output_file, streaming)
 
     # Create all original sheets first
     for sheet_name, df in all_sheets.items():
-        if sheet_name == 'Club_Expansions' and expansion_data:
-            # Enhanced club expansion with club names
-            create_enhanced_club_expansion_sheet(wb, expansion_data, df)
-        else:
-            # Copy original sheet
-            ws = wb.create_sheet(title=sheet_name)
-            copy_dataframe_to_sheet(ws, df)
+        with span(f'render {sheet_name}', rows_in=len(df)):
+            if sheet_name == 'Club_Expansions' and expansion_data:
+                # Enhanced club expansion with club names
+                create_enhanced_club_expansion_sheet(writer, expansion_data, df)
+            else:
+                # Copy original sheet
+                ws = writer.add_sheet(sheet_name)
+                copy_dataframe_to_sheet(ws, df)
 
     # Create new Club Maintenance sheet
-    create_club_maintenance_sheet(wb, maintenance_data)
+    with span('render Club_Maintenance', rows_in=len(maintenance_data)):
+        create_club_maintenance_sheet(writer, maintenance_data)
 
     # Save the file
-    output_file = 'OND-JFM Plan REPLICA with Club Maintenance.xlsx'
-    wb.save(output_file)
+    with span('save'):
+        writer.save()
     print(f'✅ Saved replica to: {output_file}')
 
     return output_file
 
-def create_enhanced_club_expansion_sheet(wb, expansion_data, original_club_expansions):
+def create_enhanced_club_expansion_sheet(writer, expansion_data, original_club_expansions):
     """
     Create enhanced club expansion sheet with club names and specific actions
     """
-    ws = wb.create_sheet(title='Club_Expansions')
+    ws = writer.add_sheet('Club_Expansions', max_column_width=50)
 
     # Use original headers from V2 file
     headers = ['Action ID', 'Week Group', 'Type', 'Priority', 'City', 'Area', 'Activity',
@@ -199,118 +185,78 @@ def create_enhanced_club_expansion_sheet(wb, expansion_data, original_club_expan
               'Owner.1', 'Club Name']
 
     # Add headers
-    for col, header in enumerate(headers, 1):
-        cell = ws.cell(row=1, column=col, value=header)
-        cell.font = Font(bold=True)
-        cell.fill = PatternFill(start_color='366092', end_color='366092', fill_type='solid')
-        cell.font = Font(color='FFFFFF', bold=True)
-
-    # First copy all original data
-    for row_idx, (_, original_row) in enumerate(original_club_expansions.iterrows(), 2):
-        for col_idx, col_name in enumerate(original_club_expansions.columns, 1):
-            if col_idx <= 17:  # Original columns
-                ws.cell(row=row_idx, column=col_idx, value=original_row[col_name])
+    ws.append(headers, style='expansion_header')
 
-        # Add club name in column 18 based on strategy
-        area = original_row.get('Area', '')
-        activity = original_row.get('Activity', '')
+    # Match every row to its first (Area, Activity) expansion in one pass
+    club_names = join_club_names(
+        original_club_expansions.get('Area', pd.Series('', index=original_club_expansions.index)),
+        original_club_expansions.get('Activity', pd.Series('', index=original_club_expansions.index)),
+        club_name_index(expansion_data)
+    )
 
-        # Find matching club name from expansion data
-        club_name = 'TBD'
-        for exp_data in expansion_data:
-            if (exp_data['Area'] == area and exp_data['Activity'] == activity):
-                club_name = exp_data['Club_Name']
-                break
+    for (_, original_row), club_name in zip(original_club_expansions.iterrows(), club_names):
+        # First copy all original columns
+        values = [original_row[col_name] for col_name in original_club_expansions.columns[:17]]
+        values += [None] * (17 - len(values))
 
-        ws.cell(row=row_idx, column=18, value=club_name)
+        area = original_row.get('Area', '')
+        activity = original_row.get('Activity', '')
 
         # Update Specific Action (Column H) with detailed strategy
-        specific_action = generate_specific_action_from_strategy(
+        values[7] = generate_specific_action_from_strategy(
             original_row.get('Specific Action', ''),
             club_name,
             activity,
             area
         )
-        ws.cell(row=row_idx, column=8, value=specific_action)
+
+        # Add club name in column 18 based on strategy
+        values.append(club_name)
+        ws.append(values)
 
     # Auto-adjust column widths
-    for column in ws.columns:
-        max_length = 0
-        column_letter = column[0].column_letter
-        for cell in column:
-            try:
-                if len(str(cell.value)) > max_length:
-                    max_length = len(str(cell.value))
-            except:
-                pass
-        adjusted_width = min(max_length + 2, 50)
-        ws.column_dimensions[column_letter].width = adjusted_width
-
-def create_club_maintenance_sheet(wb, maintenance_data):
+    ws.fit_columns()
+
+def create_club_maintenance_sheet(writer, maintenance_data):
     """
     Create club maintenance sheet
     """
-    ws = wb.create_sheet(title='Club to be Maintained')
+    ws = writer.add_sheet('Club to be Maintained', max_column_width=50)
 
     # Headers
     headers = ['Activity', 'City', 'Area', 'Club Names', 'Current Clubs',
                'Maintenance Strategy', 'Focus Area', 'Expected Outcome']
 
     # Add headers
-    for col, header in enumerate(headers, 1):
-        cell = ws.cell(row=1, column=col, value=header)
-        cell.font = Font(bold=True)
-        cell.fill = PatternFill(start_color='2F5233', end_color='2F5233', fill_type='solid')
-        cell.font = Font(color='FFFFFF', bold=True)
+    ws.append(headers, style='maintenance_header')
 
     # Add data
-    for row_idx, data in enumerate(maintenance_data, 2):
-        ws.cell(row=row_idx, column=1, value=data['Activity'])
-        ws.cell(row=row_idx, column=2, value=data['City'])
-        ws.cell(row=row_idx, column=3, value=data['Area'])
-        ws.cell(row=row_idx, column=4, value=data['Club_Names'])
-        ws.cell(row=row_idx, column=5, value=data['Current_Clubs'])
-
+    for data in maintenance_data:
         # Generate maintenance strategy
         if data['Activity'] in ['MUSIC', 'BOARDGAMING', 'SOCIAL_DEDUCTIONS']:
             strategy = 'Maximize engagement and frequency'
         else:
             strategy = 'Maintain quality and consistency'
-        ws.cell(row=row_idx, column=6, value=strategy)
 
         # Focus area
         focus = 'Member retention and activity scaling'
-        ws.cell(row=row_idx, column=7, value=focus)
 
         # Expected outcome
         outcome = f'Sustain {data["Current_Clubs"]} active clubs'
-        ws.cell(row=row_idx, column=8, value=outcome)
 
-    # Auto-adjust column widths
-    for column in ws.columns:
-        max_length = 0
-        column_letter = column[0].column_letter
-        for cell in column:
-            try:
-                if len(str(cell.value)) > max_length:
-                    max_length = len(str(cell.value))
-            except:
-                pass
-        adjusted_width = min(max_length + 2, 50)
-        ws.column_dimensions[column_letter].width = adjusted_width
-
-def copy_dataframe_to_sheet(ws, df):
-    """
-    Copy dataframe to worksheet
-    """
-    for r in dataframe_to_rows(df, index=False, header=True):
-        ws.append(r)
+        ws.append([
+            data['Activity'],
+            data['City'],
+            data['Area'],
+            data['Club_Names'],
+            data['Current_Clubs'],
+            strategy,
+            focus,
+            outcome
+        ])
 
-    # Format headers
-    if ws.max_row > 0:
-        for cell in ws[1]:
-            cell.font = Font(bold=True)
-            cell.fill = PatternFill(start_color='D9E1F2', end_color='D9E1F2', fill_type='solid')
+    # Auto-adjust column widths
+    ws.fit_columns()
 
 def main():
     print('🚀 CREATING REPLICA WITH CLUB MAINTENANCE SHEET')
@@ -327,7 +273,7 @@ def main():
     expansion_data, maintenance_data = parse_club_strategy_for_expansion(working_sheet)
 
     # Create replica
-    output_file = create_replica_with_maintenance(all_sheets, working_sheet, expansion_data, maintenance_data)
+    output_file = create_replica_with_maintenance(all_sheets, working_sheet, expansion_data, maintenance_data, streaming='--streaming' in sys.argv)
 
     print(f'\n✅ REPLICA CREATED SUCCESSFULLY: {output_file}')
     print(f'📊 Club Expansion entries: {len(expansion_data)}')
@@ -345,4 +291,5 @@ def main():
             print(f'{i}. {data["Activity"]} - {data["Club_Names"]} in {data["Area"]}, {data["City"]}')
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    with trace_run():
+        main()
\ No newline at end of file
@@ -0,0 +1,338 @@
+#!/usr/bin/env python3
+
+import re
+import numpy as np
+import pandas as pd
+import xlsxwriter
+from openpyxl import Workbook
+from openpyxl.styles import Font, PatternFill
+from openpyxl.formula.translate import Translator
+from openpyxl.utils import get_column_letter, range_boundaries
+from openpyxl.utils.dataframe import dataframe_to_rows
+from openpyxl.worksheet.table import Table
+from sheet_surgery import SharedFormula, WorkbookPatch
+
+# Named cell styles shared by the replica sheet builders
+REPLICA_STYLES = {
+    'expansion_header': {'bold': True, 'font_color': 'FFFFFF', 'fill': '366092'},
+    'weekly_header': {'bold': True, 'font_color': 'FFFFFF', 'fill': '4F81BD'},
+    'milestone_header': {'bold': True, 'font_color': 'FFFFFF', 'fill': '9BBB59'},
+    'maintenance_header': {'bold': True, 'font_color': 'FFFFFF', 'fill': '2F5233'},
+    'copy_header': {'bold': True, 'fill': 'D9E1F2'},
+    'percent': {'num_format': '0.0%'},
+}
+
+def create_replica_writer(output_file, streaming=False):
+    """
+    Workbook writer for the replica scripts: the in-memory openpyxl backend,
+    or the constant-memory xlsxwriter backend when streaming=True
+    """
+    if streaming:
+        return StreamingReplicaWriter(output_file)
+    return OpenpyxlReplicaWriter(output_file)
+
+def column_formula(column, formula, first_row, last_row):
+    """
+    The first row's formula filled down rows first_row..last_row of a column
+    (1-based), to be written in the first row's cell with the cells below
+    left empty; its relative references should all be to first_row, like
+    =IF(D2=0,0,E2/D2)
+
+    Neither openpyxl nor xlsxwriter writes shared formulas, so each backend
+    renders the value its own way: OpenpyxlReplicaSheet writes every row's
+    own formula and OpenpyxlReplicaWriter.save rewrites the ref as one
+    shared formula through WorkbookPatch, StreamingReplicaSheet writes one
+    dynamic array formula spilling down from the first cell (spill_formula).
+    """
+    letter = get_column_letter(column)
+    return SharedFormula(f'{letter}{first_row}:{letter}{last_row}', formula)
+
+def spill_formula(value):
+    """
+    Dynamic array text of a column_formula value: every reference to its
+    first row becomes a range over its rows, so =IF(D2=0,0,E2/D2) over
+    F2:F19 turns into =IF(D2:D19=0,0,E2:E19/D2:D19)
+    """
+    _, first_row, _, last_row = range_boundaries(value.ref)
+    return re.sub(rf'\b([A-Z]{{1,3}}){first_row}\b', rf'\g<1>{first_row}:\g<1>{last_row}', value.text)
+
+def _row_formula(value, row):
+    """
+    Formula a column_formula value has in row, shifted like Excel fills a
+    formula down
+    """
+    column, first_row, _, _ = range_boundaries(value.ref)
+    letter = get_column_letter(column)
+    return Translator(value.text, f'{letter}{first_row}').translate_formula(f'{letter}{row}')
+
+def copy_dataframe_to_sheet(ws, df):
+    """
+    Copy dataframe to worksheet
+    """
+    rows = dataframe_to_rows(df, index=False, header=True)
+
+    # Format headers
+    header = next(rows, None)
+    if header is not None:
+        ws.append(header, style='copy_header')
+
+    for r in rows:
+        ws.append(r)
+
+def _openpyxl_style(props):
+    style = {}
+    if 'bold' in props or 'font_color' in props:
+        style['font'] = Font(color=props.get('font_color'), bold=props.get('bold', False))
+    if 'fill' in props:
+        style['fill'] = PatternFill(start_color=props['fill'], end_color=props['fill'], fill_type='solid')
+    if 'num_format' in props:
+        style['number_format'] = props['num_format']
+    return style
+
+def _xlsxwriter_format(props):
+    fmt = {}
+    if props.get('bold'):
+        fmt['bold'] = True
+    if 'font_color' in props:
+        fmt['font_color'] = '#' + props['font_color']
+    if 'fill' in props:
+        fmt['bg_color'] = '#' + props['fill']
+        fmt['pattern'] = 1
+    if 'num_format' in props:
+        fmt['num_format'] = props['num_format']
+    return fmt
+
+class ColumnWidthTracker:
+    """
+    Track the widest rendered value per column while rows are written and
+    size the columns once at the end
+
+    Widths match the old full-sheet scan: len(str(value)) + 2 capped at
+    max_width, where empty cells inside the used range count as 'None'.
+    Strings and formulas are measured with len() directly, numbers with a
+    single str(), and a column is no longer measured once it reaches the cap.
+    """
+
+    def __init__(self, max_width):
+        self.max_width = max_width
+        self.length_cap = max_width - 2
+        self.max_lengths = []
+        self.filled_cells = []
+        self.rows = 0
+
+    def record(self, values):
+        self.rows += 1
+        missing = len(values) - len(self.max_lengths)
+        if missing > 0:
+            self.max_lengths.extend([0] * missing)
+            self.filled_cells.extend([0] * missing)
+
+        max_lengths = self.max_lengths
+        for col, value in enumerate(values):
+            if value is None:
+                continue
+            self.filled_cells[col] += 1
+            if max_lengths[col] >= self.length_cap:
+                continue
+
+            value_type = type(value)
+            if value_type is str:
+                length = len(value)
+            elif value_type is int or value_type is float:
+                length = len(str(value))
+            elif value_type is SharedFormula:
+                # As wide as its last row's formula, the longest once filled down
+                length = len(_row_formula(value, range_boundaries(value.ref)[3]))
+            else:
+                try:
+                    length = len(str(value))
+                except Exception:
+                    continue
+            if length > max_lengths[col]:
+                max_lengths[col] = length
+
+    def widths(self):
+        """
+        Yield (0-based column, width) for every column in the used range
+        """
+        for col, max_length in enumerate(self.max_lengths):
+            if self.filled_cells[col] < self.rows:
+                max_length = max(max_length, len('None'))
+            yield col, min(max_length + 2, self.max_width)
+
+class OpenpyxlReplicaWriter:
+    """
+    In-memory openpyxl Workbook backend
+    """
+
+    def __init__(self, output_file):
+        self.output_file = output_file
+        self.workbook = Workbook()
+        self.workbook.remove(self.workbook.active)
+        self.styles = {name: _openpyxl_style(props) for name, props in REPLICA_STYLES.items()}
+        # (sheet title, row, column, column_formula value) of every column formula written
+        self.shared_formulas = []
+
+    def add_sheet(self, title, max_column_width=None):
+        return OpenpyxlReplicaSheet(self.workbook.create_sheet(title=title), self.styles, max_column_width,
+                                    self.shared_formulas)
+
+    def save(self):
+        self.workbook.save(self.output_file)
+        if self.shared_formulas:
+            self._share_formulas()
+
+    def _share_formulas(self):
+        """
+        Rewrite the filled-down column_formula cells of the saved file as
+        shared formulas, which openpyxl cannot write
+        """
+        wb = WorkbookPatch(self.output_file)
+        try:
+            for title, row, column, value in self.shared_formulas:
+                wb[title].cell(row, column, SharedFormula(value.ref, value.text))
+            wb.save(self.output_file)
+        finally:
+            wb.close()
+
+class OpenpyxlReplicaSheet:
+    def __init__(self, ws, styles, max_column_width=None, shared_formulas=None):
+        self.ws = ws
+        self.styles = styles
+        self.shared_formulas = shared_formulas if shared_formulas is not None else []
+        self.row = 0
+        self.width_tracker = ColumnWidthTracker(max_column_width) if max_column_width else None
+
+    def append(self, values, style=None, column_styles=None, results=None):
+        """
+        Write the next row; style applies to every cell, column_styles maps
+        1-based column numbers to a style name. Blank cells are only created
+        when they carry a style. results (cached formula values) are ignored
+        since openpyxl cannot store them. A column_formula value writes its
+        whole ref from this cell; the other cells of the ref must stay empty.
+        """
+        self.row += 1
+        if self.width_tracker:
+            self.width_tracker.record(values)
+        for col, value in enumerate(values, 1):
+            style_name = column_styles.get(col, style) if column_styles else style
+            if value is None and style_name is None:
+                continue
+            if isinstance(value, SharedFormula):
+                value = self._fill_down(value)
+            cell = self.ws.cell(row=self.row, column=col, value=value)
+            if style_name is not None:
+                for attribute, style_value in self.styles[style_name].items():
+                    setattr(cell, attribute, style_value)
+
+    def _fill_down(self, value):
+        """
+        Write the rows of a column_formula value below this one as their own
+        formulas, to be shared when the workbook is saved; returns this row's
+        """
+        column, first_row, _, last_row = range_boundaries(value.ref)
+        self.shared_formulas.append((self.ws.title, first_row, column, value))
+        for row in range(first_row + 1, last_row + 1):
+            self.ws.cell(row=row, column=column, value=_row_formula(value, row))
+        return value.text
+
+    def fit_columns(self):
+        """
+        Apply the widths tracked since the sheet was added
+        """
+        for col, width in self.width_tracker.widths():
+            self.ws.column_dimensions[get_column_letter(col + 1)].width = width
+
+    def add_table(self, name, headers):
+        """
+        Define an Excel table over the rows written so far, the first being
+        the header row; returns False when the backend cannot add tables
+        """
+        ref = f'A1:{get_column_letter(len(headers))}{max(self.row, 2)}'
+        self.ws.add_table(Table(displayName=name, ref=ref))
+        return True
+
+    def hide(self):
+        self.ws.sheet_state = 'hidden'
+
+def _plain_value(value):
+    """
+    Convert numpy scalars to Python values and missing values to None
+    """
+    if isinstance(value, np.generic):
+        value = value.item()
+    if value is pd.NaT or (isinstance(value, float) and value != value):
+        return None
+    return value
+
+class StreamingReplicaWriter:
+    """
+    Constant-memory backend: xlsxwriter with constant_memory=True flushes each
+    row to disk as soon as the next one starts, every named style is a single
+    shared Format
+    """
+
+    def __init__(self, output_file):
+        self.output_file = output_file
+        self.workbook = xlsxwriter.Workbook(output_file, {
+            'constant_memory': True,
+            'strings_to_urls': False,
+            'default_date_format': 'yyyy-mm-dd h:mm:ss'
+        })
+        self.styles = {name: self.workbook.add_format(_xlsxwriter_format(props)) for name, props in REPLICA_STYLES.items()}
+
+    def add_sheet(self, title, max_column_width=None):
+        return StreamingReplicaSheet(self.workbook.add_worksheet(title), self.styles, max_column_width)
+
+    def save(self):
+        self.workbook.close()
+
+class StreamingReplicaSheet:
+    def __init__(self, ws, styles, max_column_width=None):
+        self.ws = ws
+        self.styles = styles
+        self.row = -1
+        self.width_tracker = ColumnWidthTracker(max_column_width) if max_column_width else None
+
+    def append(self, values, style=None, column_styles=None, results=None):
+        """
+        Write the next row; same arguments as OpenpyxlReplicaSheet.append,
+        except that results are stored as the cached values of formulas
+        """
+        self.row += 1
+        if self.width_tracker:
+            self.width_tracker.record(values)
+
+        for col, value in enumerate(values):
+            style_name = column_styles.get(col + 1, style) if column_styles else style
+            cell_format = self.styles[style_name] if style_name is not None else None
+
+            value = _plain_value(value)
+            if value is None:
+                if cell_format is not None:
+                    self.ws.write_blank(self.row, col, None, cell_format)
+                continue
+            if isinstance(value, SharedFormula):
+                self.ws.write_dynamic_array_formula(self.row, col, self.row, col, spill_formula(value), cell_format)
+                continue
+            if results and results[col] is not None and isinstance(value, str) and value.startswith('='):
+                self.ws.write_formula(self.row, col, value, cell_format, _plain_value(results[col]))
+                continue
+            self.ws.write(self.row, col, value, cell_format)
+
+    def fit_columns(self):
+        """
+        Apply the widths tracked since the sheet was added
+        """
+        for col, width in self.width_tracker.widths():
+            self.ws.set_column(col, col, width)
+
+    def add_table(self, name, headers):
+        """
+        xlsxwriter cannot add tables in constant_memory mode, so this always
+        returns False and the sheet keeps plain ranges
+        """
+        return False
+
+    def hide(self):
+        self.ws.hide()
\ No newline at end of file
@@ -0,0 +1,454 @@
+#!/usr/bin/env python3
+
+import re
+import json
+import argparse
+from datetime import datetime, timezone
+from concurrent.futures import ThreadPoolExecutor
+import pandas as pd
+import numpy as np
+from firebase_export import read_firebase_export, tables_from_records
+from firebase_rest import RTDBClient, DEFAULT_DATABASE_URL
+
+SUMMARY_NODE = 'revenueSummary'
+
+# Aggregated cells and watermark the incremental update continues from; kept
+# beside the summary so the node the dashboard reads stays small
+STATE_NODE = 'revenueSummaryState'
+
+# Commission types charged as a share of revenue; any other type is a fixed
+# fee per club and carnival
+PERCENTAGE_COMMISSION_TYPES = {'percentage', 'revenue share'}
+
+# Difference between a club's stored total and the aggregated entries above
+# which its entries are re-aggregated from scratch (edited or deleted entries)
+TOTAL_TOLERANCE = 0.01
+
+UNKNOWN_DAY = 'unknown'
+
+# carnival_id and club_id are the text keys of the revenue node
+CELL_COLUMNS = ['carnival_id', 'club_id', 'day', 'revenue', 'entries']
+
+# Watermark of a carnival/club nothing was aggregated for: entry count,
+# revenue, content fingerprint and fingerprint of the last entry
+EMPTY_MARK = (0, 0.0, 0, None)
+
+FINGERPRINT_MOD = 1 << 64
+
+def database_key(text):
+    """
+    Text usable as a database key ('.', '$', '#', '[', ']' and '/' are not)
+    """
+    return re.sub(r'[.$#\[\]/]', '_', str(text)) or '_'
+
+def _money(value):
+    return round(float(value), 2)
+
+def entry_fingerprints(entries):
+    """
+    Hash (uint64) of the index, amount, date and timestamp of every entry of
+    a revenue_entries table; the content fingerprint of a club is the sum of
+    those of its entries modulo 2**64
+    """
+    content = pd.DataFrame({
+        'entry_index': entries['entry_index'].astype('int64'),
+        'amount': entries['amount'].astype('float64'),
+        'date': entries['date'],
+        'timestamp': entries['timestamp'],
+    })
+    return pd.util.hash_pandas_object(content, index=False).to_numpy()
+
+def _fingerprint_text(fingerprint):
+    # Hex text: database numbers are doubles and would round 64-bit hashes
+    return None if fingerprint is None else f'{fingerprint:016x}'
+
+def _fingerprint_value(text):
+    return None if text is None else int(text, 16)
+
+def entry_cells(entries):
+    """
+    Revenue and entry count per carnival, club and day of a revenue_entries
+    table; entries without a date fall back to the day they were added
+    """
+    if not len(entries):
+        return pd.DataFrame({column: pd.Series(dtype='float64' if column == 'revenue' else 'int64' if column == 'entries' else object)
+                             for column in CELL_COLUMNS})
+    day = entries['date'].fillna(entries['timestamp'].dt.tz_localize(None).dt.normalize())
+    cells = pd.DataFrame({
+        'carnival_id': entries['carnival_id'].astype(object),
+        'club_id': entries['club_id'].astype(object),
+        'day': day.dt.strftime('%Y-%m-%d').fillna(UNKNOWN_DAY).astype(object),
+        'revenue': entries['amount'].fillna(0).astype('float64'),
+        'entries': np.ones(len(entries), dtype=np.int64),
+    })
+    return cells.groupby(['carnival_id', 'club_id', 'day'], as_index=False, sort=False)[['revenue', 'entries']].sum()
+
+class RevenueState:
+    """
+    Revenue per carnival, club and day aggregated so far, with the
+    watermark of every carnival/club: how many of its entries and how much
+    revenue went into the cells, the content fingerprint of those entries
+    and the fingerprint of the last one
+    """
+
+    def __init__(self, cells=None, watermark=None, updated_at=None):
+        self.cells = cells if cells is not None else entry_cells(pd.DataFrame())
+        self.watermark = watermark or {}
+        self.updated_at = updated_at
+
+    @classmethod
+    def from_node(cls, node):
+        """
+        State saved by to_node(), or an empty state for None
+        """
+        if not node:
+            return cls()
+        rows = []
+        for carnival_id, clubs in (node.get('cells') or {}).items():
+            for club_id, days in clubs.items():
+                for day, (revenue, count) in days.items():
+                    rows.append((carnival_id, club_id, day, float(revenue), int(count)))
+        cells = pd.DataFrame(rows, columns=CELL_COLUMNS) if rows else None
+        watermark = {
+            (carnival_id, club_id): (int(mark['entries']), float(mark['revenue']),
+                                     _fingerprint_value(mark.get('content')),
+                                     _fingerprint_value(mark.get('last')))
+            for carnival_id, clubs in (node.get('watermark') or {}).items()
+            for club_id, mark in clubs.items()
+        }
+        return cls(cells, watermark, node.get('updatedAt'))
+
+    def to_node(self):
+        cells = {}
+        for carnival_id, club_id, day, revenue, count in self.cells.itertuples(index=False):
+            cells.setdefault(str(carnival_id), {}).setdefault(str(club_id), {})[day] = [_money(revenue), int(count)]
+        watermark = {}
+        for (carnival_id, club_id), (count, revenue, content, last) in self.watermark.items():
+            watermark.setdefault(str(carnival_id), {})[str(club_id)] = {
+                'entries': count, 'revenue': _money(revenue),
+                'content': _fingerprint_text(content), 'last': _fingerprint_text(last)}
+        return {'cells': cells, 'watermark': watermark, 'updatedAt': self.updated_at}
+
+    def cursor(self, carnival_id, club_id):
+        """
+        Index of the first entry of the club not aggregated yet
+        """
+        return self.watermark.get((carnival_id, club_id), EMPTY_MARK)[0]
+
+    def is_consistent(self, carnival_id, club_id, total, new_revenue, content=None, last=None):
+        """
+        Whether nothing before the club's cursor was edited or deleted: its
+        stored total still equals the aggregated revenue plus its new
+        entries, and the fingerprints given match the watermark; content
+        is that of all entries before the cursor, last that of the entry
+        just before it (the dashboard splices deleted entries out, so the
+        entries after one move down and the last one changes)
+        """
+        _, aggregated, aggregated_content, aggregated_last = self.watermark.get((carnival_id, club_id), EMPTY_MARK)
+        if content is not None and content != aggregated_content:
+            return False
+        if last is not None and last != aggregated_last:
+            return False
+        if total is None:
+            return True
+        return abs(float(total) - aggregated - new_revenue) <= TOTAL_TOLERANCE
+
+    def apply(self, entries, reset=(), present=None):
+        """
+        Fold a revenue_entries table into the cells: clubs in reset are
+        re-aggregated from the given entries, the others get them added on
+        top; carnival/clubs missing from present (when given) are dropped
+        """
+        reset = set(reset)
+        keep = self.cells
+        if reset or present is not None:
+            keys = list(zip(keep['carnival_id'].tolist(), keep['club_id'].tolist()))
+            mask = [key not in reset and (present is None or key in present) for key in keys]
+            keep = keep[np.asarray(mask, dtype=bool)] if len(keys) else keep
+            for key in list(self.watermark):
+                if key in reset or (present is not None and key not in present):
+                    del self.watermark[key]
+
+        new_cells = entry_cells(entries)
+        combined = pd.concat([keep, new_cells], ignore_index=True) if len(keep) else new_cells
+        self.cells = combined.groupby(['carnival_id', 'club_id', 'day'], as_index=False, sort=False)[['revenue', 'entries']].sum()
+
+        if len(entries):
+            per_club = pd.DataFrame({
+                'carnival_id': entries['carnival_id'].astype(object),
+                'club_id': entries['club_id'].astype(object),
+                'amount': entries['amount'].fillna(0).astype('float64'),
+                'entry_index': entries['entry_index'].astype('int64'),
+                'fingerprint': entry_fingerprints(entries),
+            }).sort_values('entry_index', kind='stable').groupby(['carnival_id', 'club_id']).agg(
+                revenue=('amount', 'sum'), last_index=('entry_index', 'last'),
+                content=('fingerprint', 'sum'), last=('fingerprint', 'last'))
+            for (carnival_id, club_id), revenue, last_index, content, last in zip(
+                    per_club.index, per_club['revenue'], per_club['last_index'], per_club['content'], per_club['last']):
+                count, aggregated, aggregated_content, aggregated_last = self.watermark.get((carnival_id, club_id), EMPTY_MARK)
+                if int(last_index) + 1 >= count:
+                    count, aggregated_last = int(last_index) + 1, int(last)
+                self.watermark[(carnival_id, club_id)] = (
+                    count, aggregated + float(revenue), (aggregated_content + int(content)) % FINGERPRINT_MOD, aggregated_last)
+        self.updated_at = datetime.now(timezone.utc).isoformat(timespec='seconds')
+
+def commission_terms(clubs):
+    """
+    Per club_id: commission percentage (0 for fixed fees) and fixed fee
+    (0 for percentages) from commissionType / commissionAmount; club_id
+    must be unique and set
+    """
+    kind = clubs['commission_type'].astype(object).fillna('').astype(str).str.strip().str.lower()
+    amount = clubs['commission_amount'].astype('float64').fillna(0.0)
+    is_percentage = kind.isin(PERCENTAGE_COMMISSION_TYPES)
+    return pd.DataFrame({
+        'percent': np.where(is_percentage, amount, 0.0),
+        'fixed': np.where(~is_percentage & (kind != ''), amount, 0.0),
+    }, index=clubs['club_id'].astype(object).to_numpy())
+
+def _totals(df):
+    return {
+        'revenue': _money(df['revenue'].sum()),
+        'commission': _money(df['commission'].sum()),
+        'entries': int(df['entries'].sum()),
+    }
+
+def build_summary(state, clubs, carnivals):
+    """
+    revenueSummary node of the aggregated cells: totals per carnival (with
+    its clubs), club, activity and day, and overall
+
+    Percentage commissions apply to every entry, fixed fees once per club
+    and carnival with revenue. Day totals carry the percentage commission
+    only, as a fixed fee belongs to no single day.
+    """
+    clubs = clubs[clubs['club_id'].notna()].drop_duplicates('club_id', keep='last')
+    carnivals = carnivals[carnivals['carnival_id'].notna()].drop_duplicates('carnival_id', keep='last')
+    terms = commission_terms(clubs)
+    club_info = clubs.set_index(clubs['club_id'].astype(object).to_numpy())
+    carnival_names = pd.Series(carnivals['name'].to_numpy(), index=carnivals['carnival_id'].astype(object).to_numpy())
+
+    cells = state.cells.copy()
+    cells['commission'] = cells['revenue'] * cells['club_id'].map(terms['percent']).fillna(0.0).to_numpy() / 100
+
+    # One row per carnival and club, fixed fee added where it took revenue
+    pairs = cells.groupby(['carnival_id', 'club_id'], as_index=False)[['revenue', 'commission', 'entries']].sum()
+    pairs['commission'] += np.where(pairs['revenue'] > 0, pairs['club_id'].map(terms['fixed']).fillna(0.0), 0.0)
+    pairs['name'] = pairs['club_id'].map(club_info['name']).astype(object)
+    pairs['activity'] = pairs['club_id'].map(club_info['activity']).astype(object)
+
+    summary = {
+        'updatedAt': state.updated_at,
+        'totals': {**_totals(pairs), 'carnivals': int(pairs['carnival_id'].nunique()), 'clubs': int(pairs['club_id'].nunique())},
+        'carnivals': {},
+        'clubs': {},
+        'activities': {},
+        'days': {},
+    }
+
+    for carnival_id, group in pairs.groupby('carnival_id'):
+        name = carnival_names.get(carnival_id)
+        summary['carnivals'][str(carnival_id)] = {
+            'name': None if pd.isna(name) else name,
+            **_totals(group),
+            'clubs': {
+                str(club_id): {'name': None if pd.isna(club_name) else club_name,
+                               'revenue': _money(revenue), 'commission': _money(commission), 'entries': int(count)}
+                for club_id, club_name, revenue, commission, count in zip(
+                    group['club_id'], group['name'], group['revenue'], group['commission'], group['entries'])
+            },
+        }
+
+    for club_id, group in pairs.groupby('club_id'):
+        name, activity = group['name'].iloc[0], group['activity'].iloc[0]
+        summary['clubs'][str(club_id)] = {
+            'name': None if pd.isna(name) else name,
+            'activity': None if pd.isna(activity) else activity,
+            **_totals(group),
+            'carnivals': int(group['carnival_id'].nunique()),
+        }
+
+    activities = pairs.assign(activity=pairs['activity'].fillna('Unknown'))
+    for activity, group in activities.groupby('activity'):
+        summary['activities'][database_key(activity)] = {
+            'name': activity,
+            **_totals(group),
+            'clubs': int(group['club_id'].nunique()),
+        }
+
+    for day, group in cells.groupby('day'):
+        summary['days'][day] = _totals(group)
+
+    return summary
+
+def _club_keys(entries):
+    return list(zip(entries['carnival_id'].astype(object).tolist(), entries['club_id'].astype(object).tolist()))
+
+def _unaggregated(state, entries, reset=(), full=False):
+    """
+    Entries of a revenue_entries table past their club's cursor, and all
+    entries of the carnival/clubs in reset
+    """
+    entries = entries[entries['carnival_id'].notna() & entries['club_id'].notna()]
+    keys = _club_keys(entries)
+    cursors = np.array([0 if full or key in reset else state.cursor(*key) for key in keys], dtype=np.int64)
+    return entries[entries['entry_index'].astype('int64').to_numpy() >= cursors]
+
+def _club_updates(state, entries, totals, full, complete=True):
+    """
+    Entries the state has not aggregated yet, and the carnival/clubs to
+    re-aggregate from scratch, given the stored totals and the entries of
+    every club: all of them when complete, else only those from the entry
+    just before its cursor on (clubs with nothing aggregated are not
+    checked then)
+    """
+    entries = entries[entries['carnival_id'].notna() & entries['club_id'].notna()]
+    new = _unaggregated(state, entries, full=full)
+    new_revenue = new.groupby([new['carnival_id'].astype(object), new['club_id'].astype(object)])['amount'].sum()
+
+    keys = _club_keys(entries)
+    indices = entries['entry_index'].astype('int64').to_numpy()
+    cursors = np.array([state.cursor(*key) for key in keys], dtype=np.int64)
+    fingerprints = entry_fingerprints(entries)
+    if complete:
+        before = indices < cursors
+        content = pd.Series(fingerprints[before]).groupby(
+            [entries['carnival_id'].astype(object).to_numpy()[before], entries['club_id'].astype(object).to_numpy()[before]]).sum()
+    else:
+        last = {key: int(fingerprint) for key, fingerprint, at_cursor
+                in zip(keys, fingerprints, indices == cursors - 1) if at_cursor}
+
+    reset = set()
+    for key in set(totals) | set(keys):
+        if full:
+            reset.add(key)
+        elif complete:
+            if not state.is_consistent(*key, totals.get(key), float(new_revenue.get(key, 0.0)), content=int(content.get(key, 0))):
+                reset.add(key)
+        elif state.cursor(*key):
+            if key not in last or not state.is_consistent(*key, totals.get(key), float(new_revenue.get(key, 0.0)), last=last[key]):
+                reset.add(key)
+    if reset:
+        new = _unaggregated(state, entries, reset, full)
+    return new, reset
+
+def rollup_export(export_path, state=None, full=False):
+    """
+    Update the state from a database export file; returns (state, summary,
+    entries aggregated)
+    """
+    state = RevenueState() if full or state is None else state
+    tables = read_firebase_export(export_path)
+    entries = tables['revenue_entries']
+    totals = {(carnival_id, club_id): float(total)
+              for carnival_id, club_id, total in zip(tables['revenue_totals']['carnival_id'],
+                                                     tables['revenue_totals']['club_id'],
+                                                     tables['revenue_totals']['total'])
+              if pd.notna(carnival_id) and pd.notna(club_id) and pd.notna(total)}
+
+    new, reset = _club_updates(state, entries, totals, full)
+    present = set(totals) | set(_club_keys(entries[entries['carnival_id'].notna() & entries['club_id'].notna()]))
+    state.apply(new, reset, present)
+    return state, build_summary(state, tables['clubs'], tables['carnivals']), len(new)
+
+def _fetch_club_entries(client, carnival_id, club_id, start):
+    """
+    (stored total, export records of the entries from index start) of one
+    carnival/club revenue node
+    """
+    base = f'revenue/{carnival_id}/{club_id}'
+    total = client.get(f'{base}/total')
+    params = {'orderBy': '$key', 'startAt': str(start)} if start else {}
+    entries = client.get(f'{base}/entries', **params) or {}
+    items = entries.items() if isinstance(entries, dict) else enumerate(entries)
+    records = [(('revenue', carnival_id, club_id, 'entries', int(index)), entry) for index, entry in items]
+    return total, records
+
+def _fetched_entries(fetched):
+    records = [record for _, club_records in fetched.values() for record in club_records]
+    return tables_from_records(records, resolve=False)['revenue_entries']
+
+def rollup_database(client, full=False, workers=None):
+    """
+    Update the state kept in the database from the revenue entries added
+    since its watermark; returns (state, summary, entries aggregated)
+
+    Each carnival/club gets its stored total and its entries from the one
+    just before its cursor fetched; where the total or the fingerprint of
+    that entry no longer matches (an entry was edited or deleted) all of its
+    entries are fetched and re-aggregated.
+    """
+    state = RevenueState() if full else RevenueState.from_node(client.get(STATE_NODE))
+    reference = client.read_tables(['carnivals', 'clubs'], resolve=False)
+
+    carnival_ids = client.shallow_keys('revenue')
+    with ThreadPoolExecutor(workers or client.pool_size) as executor:
+        club_lists = list(executor.map(lambda carnival_id: client.shallow_keys(f'revenue/{carnival_id}'), carnival_ids))
+        keys = [(carnival_id, club_id) for carnival_id, club_ids in zip(carnival_ids, club_lists) for club_id in club_ids]
+
+        def fetch(key, start):
+            return _fetch_club_entries(client, *key, start)
+
+        fetched = dict(zip(keys, executor.map(lambda key: fetch(key, max(state.cursor(*key) - 1, 0)), keys)))
+        totals = {key: total for key, (total, _) in fetched.items() if total is not None}
+        new, reset = _club_updates(state, _fetched_entries(fetched), totals, False, complete=False)
+        if reset:
+            for key, result in zip(sorted(reset), executor.map(lambda key: fetch(key, 0), sorted(reset))):
+                fetched[key] = result
+            new = _unaggregated(state, _fetched_entries(fetched), reset)
+
+    state.apply(new, reset, set(keys))
+    return state, build_summary(state, reference['clubs'], reference['carnivals']), len(new)
+
+def write_database(client, state, summary):
+    """
+    Replace the summary and state nodes in one multi-location update
+    """
+    client.request('PATCH', '', {'print': 'silent'}, {SUMMARY_NODE: summary, STATE_NODE: state.to_node()})
+
+def main():
+    parser = argparse.ArgumentParser(description='Precompute the revenueSummary node for the revenue dashboard')
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('--export', help='database export JSON to aggregate')
+    source.add_argument('--url', nargs='?', const=DEFAULT_DATABASE_URL, help='database to read and update')
+    parser.add_argument('--auth', help='database secret or ID token')
+    parser.add_argument('--state', help='state file carried between --export runs')
+    parser.add_argument('--out', help='also save the summary node to this JSON file')
+    parser.add_argument('--full', action='store_true', help='ignore the watermark and aggregate every entry')
+    parser.add_argument('--dry-run', action='store_true', help='compute the summary without writing it to the database')
+    args = parser.parse_args()
+
+    print('💰 REVENUE ROLLUP')
+    print('=' * 60)
+
+    if args.export:
+        state = None
+        if args.state and not args.full:
+            try:
+                with open(args.state, encoding='utf-8') as f:
+                    state = RevenueState.from_node(json.load(f))
+            except FileNotFoundError:
+                pass
+        state, summary, aggregated = rollup_export(args.export, state, args.full)
+        if args.state:
+            with open(args.state, 'w', encoding='utf-8') as f:
+                json.dump(state.to_node(), f)
+    else:
+        with RTDBClient(args.url, args.auth) as client:
+            state, summary, aggregated = rollup_database(client, args.full)
+            if not args.dry_run:
+                write_database(client, state, summary)
+                print(f'📤 Wrote {SUMMARY_NODE} and {STATE_NODE}')
+
+    totals = summary['totals']
+    print(f"📥 Aggregated {aggregated:,} new entries")
+    print(f"📊 {totals['carnivals']} carnivals, {totals['clubs']} clubs, {len(summary['days'])} days")
+    print(f"💵 Revenue ₹{totals['revenue']:,.2f}, commission ₹{totals['commission']:,.2f}")
+
+    if args.out:
+        with open(args.out, 'w', encoding='utf-8') as f:
+            json.dump(summary, f, indent=2)
+        print(f'📁 Summary saved: {args.out}')
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
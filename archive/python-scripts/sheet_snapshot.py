@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+
+import os
+import json
+import hashlib
+from datetime import date, datetime, time, timedelta
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc as ipc
+    import pyarrow.feather as feather
+except ImportError:
+    pa = ipc = feather = None
+
+SNAPSHOT_SUFFIX = '.snapshot'
+# Uncompressed, so the snapshot memory-maps without a decompression copy
+SNAPSHOT_COMPRESSION = 'uncompressed'
+
+# Field metadata marking a mixed-type object column stored as tagged text
+ENCODING_KEY = b'snapshot_encoding'
+TAGGED_ENCODING = b'tagged'
+
+# infer_dtype kinds of object columns Arrow stores and reads back exactly;
+# it coerces the others (ints in a datetime column become microseconds,
+# False in a float column becomes 0.0), so those are stored as tagged text
+ARROW_EXACT_KINDS = {'string', 'empty'}
+
+# Tag -> parser of the tagged text of one cell
+CELL_DECODERS = {
+    'N': lambda text: pd.NaT,
+    'b': lambda text: text == '1',
+    'i': int,
+    'f': float,
+    'T': pd.Timestamp,
+    'D': datetime.fromisoformat,
+    'd': date.fromisoformat,
+    't': time.fromisoformat,
+    'r': lambda text: timedelta(seconds=float(text)),
+    's': str,
+}
+
+def snapshot_dir(workbook_path):
+    """
+    Sidecar directory holding the columnar snapshot of a workbook
+    """
+    return workbook_path + SNAPSHOT_SUFFIX
+
+def workbook_hash(workbook_path):
+    """
+    SHA-256 of the workbook bytes, used to tell whether a snapshot is current
+    """
+    digest = hashlib.sha256()
+    with open(workbook_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def _read_columns(path, columns):
+    """
+    Table of the listed columns of a Feather file that it actually has
+    """
+    names = set(ipc.open_file(path).schema.names)
+    return feather.read_table(path, columns=[c for c in columns if c in names], memory_map=True)
+
+def _encode_cell(value):
+    """
+    Tagged text of one cell of a mixed-type column, e.g. 'i:3' or 's:TBD';
+    types without a tag are kept as their text
+    """
+    if value is None:
+        return None
+    if value is pd.NaT:
+        return 'N:'
+    if isinstance(value, (bool, np.bool_)):
+        return f'b:{int(value)}'
+    if isinstance(value, (int, np.integer)):
+        return f'i:{int(value)}'
+    if isinstance(value, (float, np.floating)):
+        return f'f:{float(value)!r}'
+    if isinstance(value, pd.Timestamp):
+        return f'T:{value.isoformat()}'
+    if isinstance(value, datetime):
+        return f'D:{value.isoformat()}'
+    if isinstance(value, date):
+        return f'd:{value.isoformat()}'
+    if isinstance(value, time):
+        return f't:{value.isoformat()}'
+    if isinstance(value, timedelta):
+        return f'r:{value.total_seconds()!r}'
+    return f's:{value}'
+
+def _decode_cell(text):
+    # Empty cells come back from Arrow as nulls
+    if not isinstance(text, str):
+        return None
+    return CELL_DECODERS[text[0]](text[2:])
+
+def _sheet_table(df):
+    """
+    Arrow table of a sheet; object columns holding anything but text (e.g.
+    ints mixed with text or dates) are stored as tagged text and marked in
+    their field metadata, so their cells come back with their own types
+    """
+    df = df.copy(deep=False)
+    df.columns = [str(label) for label in df.columns]
+    encoded = []
+    for position in range(df.shape[1]):
+        column = df.iloc[:, position]
+        if column.dtype == object and pd.api.types.infer_dtype(column, skipna=True) not in ARROW_EXACT_KINDS:
+            df.isetitem(position, column.map(_encode_cell))
+            encoded.append(position)
+
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    pandas_metadata = table.schema.metadata
+    for position in encoded:
+        field = table.schema.field(position).with_metadata({ENCODING_KEY: TAGGED_ENCODING})
+        table = table.set_column(position, field, table.column(position))
+    # set_column drops the pandas metadata that restores column names and dtypes
+    return table.replace_schema_metadata(pandas_metadata)
+
+def _sheet_frame(table, sheet):
+    """
+    DataFrame of a snapshot table, decoding its tagged columns and giving
+    back the column labels the manifest entry of the sheet recorded
+    """
+    df = table.to_pandas()
+    for position, field in enumerate(table.schema):
+        if field.metadata and field.metadata.get(ENCODING_KEY) == TAGGED_ENCODING:
+            values = [_decode_cell(text) for text in df.iloc[:, position]]
+            df.isetitem(position, pd.Series(values, index=df.index, dtype=object))
+    labels = _column_labels(sheet)
+    df.columns = [labels.get(name, name) for name in df.columns]
+    return df
+
+def _column_labels(sheet):
+    """
+    {stored column name: original label} of a manifest sheet entry; Arrow
+    names are text, labels can be numbers or dates (a header cell 5)
+    """
+    return {str(label): label for label in map(_decode_cell, sheet.get('columns', []))}
+
+def load_snapshot(workbook_path, content_hash=None, columns=None):
+    """
+    Load {sheet name: DataFrame} from the sidecar snapshot, or None when there
+    is no snapshot, it was taken from different workbook contents, or pyarrow
+    is not installed
+
+    columns ({sheet name: column names}) reads only those sheets, and only
+    the listed columns of them the snapshot has.
+    """
+    if feather is None:
+        return None
+
+    manifest_path = os.path.join(snapshot_dir(workbook_path), 'manifest.json')
+    try:
+        with open(manifest_path, encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    if manifest.get('sha256') != (content_hash or workbook_hash(workbook_path)):
+        return None
+
+    try:
+        if columns is not None:
+            return {
+                sheet['name']: _sheet_frame(_read_columns(
+                    os.path.join(snapshot_dir(workbook_path), sheet['file']),
+                    [str(column) for column in columns[sheet['name']]]
+                ), sheet)
+                for sheet in manifest['sheets'] if sheet['name'] in columns
+            }
+        return {
+            sheet['name']: _sheet_frame(feather.read_table(
+                os.path.join(snapshot_dir(workbook_path), sheet['file']), memory_map=True
+            ), sheet)
+            for sheet in manifest['sheets']
+        }
+    except Exception as e:
+        print(f'⚠️ Ignoring unreadable snapshot for {workbook_path}: {e}')
+        return None
+
+def write_snapshot(workbook_path, all_sheets, content_hash=None):
+    """
+    Write every sheet to an uncompressed Feather (Arrow IPC) file next to the
+    workbook; returns False when the snapshot could not be written
+    """
+    if feather is None:
+        return False
+
+    directory = snapshot_dir(workbook_path)
+    sheets = []
+    manifest_path = os.path.join(directory, 'manifest.json')
+    try:
+        os.makedirs(directory, exist_ok=True)
+        if os.path.exists(manifest_path):
+            os.remove(manifest_path)
+
+        for index, (sheet_name, df) in enumerate(all_sheets.items()):
+            file_name = f'sheet_{index:03d}.feather'
+            feather.write_feather(_sheet_table(df), os.path.join(directory, file_name),
+                                  compression=SNAPSHOT_COMPRESSION)
+            sheets.append({'name': sheet_name, 'file': file_name,
+                           'columns': [_encode_cell(label) for label in df.columns]})
+
+        # Manifest last, so a half-written snapshot is never picked up
+        manifest = {'sha256': content_hash or workbook_hash(workbook_path), 'sheets': sheets}
+        with open(manifest_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+        return True
+
+    except Exception as e:
+        print(f'⚠️ Could not write snapshot for {workbook_path}: {e}')
+        return False
\ No newline at end of file
@@ -0,0 +1,541 @@
+#!/usr/bin/env python3
+
+import os
+import re
+import math
+import zipfile
+import posixpath
+from datetime import date, datetime
+from html import unescape
+from xml.sax.saxutils import escape, quoteattr
+from openpyxl.styles.numbers import BUILTIN_FORMATS_REVERSE
+from openpyxl.utils import get_column_letter, column_index_from_string, range_boundaries
+from openpyxl.utils.datetime import to_excel
+from openpyxl.xml.functions import tostring
+
+WORKBOOK_PART = 'xl/workbook.xml'
+WORKBOOK_RELS_PART = 'xl/_rels/workbook.xml.rels'
+CONTENT_TYPES_PART = '[Content_Types].xml'
+STYLES_PART = 'xl/styles.xml'
+CALC_CHAIN_PART = 'xl/calcChain.xml'
+
+WORKSHEET_CONTENT_TYPE = 'application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml'
+WORKSHEET_REL_TYPE = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet'
+RELATIONSHIPS_NS = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships'
+
+# Number format openpyxl gives datetime cells without one
+DATETIME_FORMAT = 'yyyy-mm-dd h:mm:ss'
+
+COPY_CHUNK_BYTES = 1 << 20
+
+ATTRIBUTE = re.compile(r'([\w:]+)="([^"]*)"')
+SHEET_ENTRY = re.compile(r'<sheet\b[^>]*?/>')
+RELATIONSHIP_ENTRY = re.compile(r'<Relationship\b[^>]*?/>')
+OVERRIDE_ENTRY = re.compile(r'<Override\b[^>]*?/>')
+WORKSHEET_PART = re.compile(r'^xl/worksheets/sheet(\d+)\.xml$')
+SHEET_DATA = re.compile(r'<sheetData\s*/>|<sheetData>(.*?)</sheetData>', re.S)
+DIMENSION = re.compile(r'<dimension ref="([^"]*)"\s*/>')
+ROW = re.compile(r'<row\b([^>]*?)(?:/>|>(.*?)</row>)', re.S)
+CELL = re.compile(r'<c\b([^>]*?)(?:/>|>(.*?)</c>)', re.S)
+CELL_REF = re.compile(r'([A-Z]+)(\d+)')
+SHARED_INDEX = re.compile(r'\bsi="(\d+)"')
+
+NEW_SHEET_XML = (
+    '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+    '<sheetPr><outlinePr summaryBelow="1" summaryRight="1"/><pageSetUpPr/></sheetPr>'
+    '<dimension ref="{dimension}"/>'
+    '<sheetViews><sheetView workbookViewId="0"><selection activeCell="A1" sqref="A1"/></sheetView></sheetViews>'
+    '<sheetFormatPr baseColWidth="8" defaultRowHeight="15"/>'
+    '{sheet_data}'
+    '<pageMargins left="0.75" right="0.75" top="1" bottom="1" header="0.5" footer="0.5"/>'
+    '</worksheet>'
+)
+
+def _attributes(tag):
+    return {name: unescape(value) for name, value in ATTRIBUTE.findall(tag)}
+
+def _set_attribute(tag, name, value):
+    """
+    Tag text with one attribute replaced, or added before the closing bracket
+    """
+    pattern = re.compile(rf'\b{re.escape(name)}="[^"]*"')
+    if pattern.search(tag):
+        return pattern.sub(f'{name}={quoteattr(str(value))}', tag, count=1)
+    end = len(tag) - (2 if tag.endswith('/>') else 1)
+    return f'{tag[:end].rstrip()} {name}={quoteattr(str(value))}{tag[end:]}'
+
+def _normalized(xml):
+    return re.sub(r'\s*/>', '/>', re.sub(r'>\s+<', '><', xml.strip()))
+
+def _part_name(target, base='xl'):
+    if target.startswith('/'):
+        return target[1:]
+    return posixpath.normpath(posixpath.join(base, target))
+
+def _rels_part(part):
+    directory, name = posixpath.split(part)
+    return f'{directory}/_rels/{name}.rels'
+
+def _copy_part(source, target, info):
+    """
+    Copy one member into target through the public zipfile API, keeping its
+    name, timestamp, compression method and attributes; the data is streamed
+    rather than loaded whole
+    """
+    if info.flag_bits & 0x1:
+        raise ValueError(f'{info.filename}: encrypted parts cannot be copied')
+
+    copied = zipfile.ZipInfo(info.filename, date_time=info.date_time)
+    copied.compress_type = info.compress_type
+    copied.external_attr = info.external_attr
+    copied.create_system = info.create_system
+    copied.comment = info.comment
+    # A known size lets zipfile pick zip64 headers for large members
+    copied.file_size = info.file_size
+
+    with source.open(info) as src, target.open(copied, 'w') as dst:
+        for chunk in iter(lambda: src.read(COPY_CHUNK_BYTES), b''):
+            dst.write(chunk)
+
+class CellStyles:
+    """
+    styles.xml of a workbook, with fonts, fills, number formats and cell
+    formats appended on demand
+
+    Entries are matched on their normalized XML, so asking for a style the
+    workbook already has returns its existing index.
+    """
+    SECTIONS = [('numFmts', 'numFmt'), ('fonts', 'font'), ('fills', 'fill'), ('cellXfs', 'xf')]
+
+    def __init__(self, xml):
+        if not re.search(r'<numFmts\b', xml):
+            xml = re.sub(r'(<styleSheet\b[^>]*>)', r'\1<numFmts count="0"/>', xml, count=1)
+        self.xml = xml
+        self.modified = False
+        self.entries = {}
+        for section, tag in self.SECTIONS:
+            block = re.search(rf'<{section}\b[^>]*?(?:/>|>(.*?)</{section}>)', xml, re.S)
+            body = block.group(1) or '' if block else ''
+            self.entries[section] = re.findall(rf'<{tag}\b[^>]*?(?:/>|>.*?</{tag}>)', body, re.S)
+
+    def _index(self, section, entry):
+        normalized = _normalized(entry)
+        for index, existing in enumerate(self.entries[section]):
+            if _normalized(existing) == normalized:
+                return index
+        self.entries[section].append(entry)
+        self.modified = True
+        return len(self.entries[section]) - 1
+
+    def font_id(self, font):
+        return self._index('fonts', tostring(font.to_tree()).decode('utf-8'))
+
+    def fill_id(self, fill):
+        return self._index('fills', tostring(fill.to_tree()).decode('utf-8'))
+
+    def number_format_id(self, format_code):
+        if format_code in BUILTIN_FORMATS_REVERSE:
+            return BUILTIN_FORMATS_REVERSE[format_code]
+        custom = [_attributes(entry) for entry in self.entries['numFmts']]
+        for attributes in custom:
+            if attributes.get('formatCode') == format_code:
+                return int(attributes['numFmtId'])
+        format_id = max([163] + [int(a['numFmtId']) for a in custom]) + 1
+        self.entries['numFmts'].append(f'<numFmt numFmtId="{format_id}" formatCode={quoteattr(format_code)}/>')
+        self.modified = True
+        return format_id
+
+    def xf_index(self, base=0, font=None, fill=None, number_format=None):
+        """
+        Index of the cell format equal to format base with the given
+        openpyxl Font, PatternFill and number format code swapped in
+        """
+        xf = self.entries['cellXfs'][base] if base < len(self.entries['cellXfs']) else self.entries['cellXfs'][0]
+        if font is not None:
+            xf = _set_attribute(xf, 'fontId', self.font_id(font))
+        if fill is not None:
+            xf = _set_attribute(xf, 'fillId', self.fill_id(fill))
+        if number_format is not None:
+            xf = _set_attribute(xf, 'numFmtId', self.number_format_id(number_format))
+        return self._index('cellXfs', xf)
+
+    def to_xml(self):
+        xml = self.xml
+        for section, _ in self.SECTIONS:
+            entries = self.entries[section]
+            block = f'<{section} count="{len(entries)}">{"".join(entries)}</{section}>' if entries else ''
+            xml = re.sub(rf'<{section}\b[^>]*?(?:/>|>.*?</{section}>)', lambda _: block, xml, count=1, flags=re.S)
+        return xml
+
+class SharedFormula:
+    """
+    Cell value writing text once, in the first cell of ref, as a formula
+    shared by every cell of ref with relative references shifted per cell
+    (what Excel stores for a filled-down column); same arguments as
+    openpyxl's ArrayFormula
+    """
+
+    def __init__(self, ref, text):
+        self.ref = ref
+        self.text = text
+        self.index = None
+
+class _SharedFormulaCell:
+    """
+    Value of the other cells of a SharedFormula ref
+    """
+
+    def __init__(self, index):
+        self.index = index
+
+class PatchedCell:
+    """
+    Write-only cell: the value, font, fill and number format set here
+    replace the existing ones when the sheet is saved
+    """
+    KEEP = object()
+
+    def __init__(self, row, column):
+        self.row = row
+        self.column = column
+        self.value = PatchedCell.KEEP
+        self.font = None
+        self.fill = None
+        self.number_format = None
+
+    @property
+    def coordinate(self):
+        return f'{get_column_letter(self.column)}{self.row}'
+
+    def has_style(self):
+        return self.font is not None or self.fill is not None or self.number_format is not None
+
+    def to_xml(self, styles, old_xml=None):
+        """
+        <c> element text, keeping what the old element had unless replaced;
+        None when nothing is left to write
+        """
+        old_attributes = _attributes(old_xml[:old_xml.index('>')]) if old_xml else {}
+        style = int(old_attributes.get('s', 0))
+
+        value = self.value
+        number_format = self.number_format
+        if isinstance(value, (datetime, date)):
+            value = to_excel(value)
+            number_format = number_format or DATETIME_FORMAT
+        if self.has_style() or number_format:
+            style = styles.xf_index(style, self.font, self.fill, number_format)
+        style_attribute = f' s="{style}"' if style else ''
+        ref = self.coordinate
+
+        if value is PatchedCell.KEEP:
+            if old_xml is None:
+                return f'<c r="{ref}"{style_attribute}/>' if style else None
+            return _set_attribute(old_xml[:old_xml.index('>') + 1], 's', style) + old_xml[old_xml.index('>') + 1:] \
+                if style else old_xml
+        if value is None or (isinstance(value, float) and not math.isfinite(value)):
+            return f'<c r="{ref}"{style_attribute}/>' if style else None
+        if isinstance(value, SharedFormula):
+            text = value.text[1:] if value.text.startswith('=') else value.text
+            return (f'<c r="{ref}"{style_attribute}><f t="shared" ref="{value.ref}" si="{value.index}">'
+                    f'{escape(text)}</f><v></v></c>')
+        if isinstance(value, _SharedFormulaCell):
+            return f'<c r="{ref}"{style_attribute}><f t="shared" si="{value.index}"/><v></v></c>'
+        if isinstance(value, str):
+            if value.startswith('=') and len(value) > 1:
+                return f'<c r="{ref}"{style_attribute}><f>{escape(value[1:])}</f><v></v></c>'
+            space = ' xml:space="preserve"' if value != value.strip() else ''
+            return f'<c r="{ref}"{style_attribute} t="inlineStr"><is><t{space}>{escape(value)}</t></is></c>'
+        if isinstance(value, bool) or type(value).__name__ == 'bool_':
+            return f'<c r="{ref}"{style_attribute} t="b"><v>{int(value)}</v></c>'
+        if hasattr(value, 'item'):
+            value = value.item()
+        if isinstance(value, float) and not math.isfinite(value):
+            return f'<c r="{ref}"{style_attribute}/>' if style else None
+        return f'<c r="{ref}"{style_attribute} t="n"><v>{value!r}</v></c>'
+
+class PatchedSheet:
+    """
+    Worksheet of a WorkbookPatch; cells set through cell() are merged into
+    the existing sheet XML (or a new empty sheet) when the workbook is saved
+    """
+
+    def __init__(self, title, xml=None):
+        self.title = title
+        self.xml = xml
+        self.cells = {}
+
+    @property
+    def modified(self):
+        return self.xml is None or bool(self.cells)
+
+    def cell(self, row, column, value=None):
+        cell = self.cells.get((row, column))
+        if cell is None:
+            cell = self.cells[(row, column)] = PatchedCell(row, column)
+        if value is not None:
+            cell.value = value
+        return cell
+
+    def _share_formulas(self):
+        """
+        Number the SharedFormula masters after the sheet's existing shared
+        formulas and point the rest of each ref at its master
+        """
+        masters = [cell for cell in self.cells.values() if isinstance(cell.value, SharedFormula)]
+        next_index = max(map(int, SHARED_INDEX.findall(self.xml or '')), default=-1) + 1
+        for master in masters:
+            master.value.index = next_index
+            min_column, min_row, max_column, max_row = range_boundaries(master.value.ref)
+            for row in range(min_row, max_row + 1):
+                for column in range(min_column, max_column + 1):
+                    if (row, column) != (master.row, master.column):
+                        self.cell(row, column).value = _SharedFormulaCell(next_index)
+            next_index += 1
+
+    def _rows_xml(self, rows, styles):
+        """
+        Rows of cell edits, {row: {column: PatchedCell}}, as <row> elements
+        """
+        parts = []
+        for row in sorted(rows):
+            cells = [rows[row][column].to_xml(styles) for column in sorted(rows[row])]
+            cells = [cell for cell in cells if cell]
+            if cells:
+                parts.append(f'<row r="{row}">{"".join(cells)}</row>')
+        return ''.join(parts)
+
+    def _patched_row(self, attributes, body, edits, styles):
+        old_cells = {}
+        order = []
+        for match in CELL.finditer(body or ''):
+            column = column_index_from_string(CELL_REF.match(_attributes(match.group(1))['r']).group(1))
+            old_cells[column] = match.group(0)
+            order.append(column)
+
+        cells = []
+        for column in sorted(set(order) | set(edits)):
+            if column in edits:
+                cell_xml = edits[column].to_xml(styles, old_cells.get(column))
+            else:
+                cell_xml = old_cells[column]
+            if cell_xml:
+                cells.append(cell_xml)
+        # Drop spans, which may no longer cover the row's cells
+        attributes = re.sub(r'\s+spans="[^"]*"', '', attributes)
+        return f'<row{attributes}>{"".join(cells)}</row>'
+
+    def to_xml(self, styles):
+        self._share_formulas()
+        rows = {}
+        for (row, column), cell in self.cells.items():
+            rows.setdefault(row, {})[column] = cell
+
+        if self.xml is None:
+            if self.cells:
+                max_row = max(row for row, _ in self.cells)
+                max_column = max(column for _, column in self.cells)
+                dimension = f'A1:{get_column_letter(max_column)}{max_row}'
+            else:
+                dimension = 'A1'
+            return NEW_SHEET_XML.format(dimension=dimension,
+                                        sheet_data=f'<sheetData>{self._rows_xml(rows, styles)}</sheetData>')
+
+        sheet_data = SHEET_DATA.search(self.xml)
+        if sheet_data is None:
+            raise ValueError(f"Sheet '{self.title}' has no sheetData")
+        body = sheet_data.group(1) or ''
+
+        parts = []
+        position = 0
+        pending = sorted(rows)
+        for match in ROW.finditer(body):
+            row = int(_attributes(match.group(1))['r'])
+            while pending and pending[0] < row:
+                parts.append(self._rows_xml({pending[0]: rows[pending[0]]}, styles))
+                pending.pop(0)
+            parts.append(body[position:match.start()])
+            if pending and pending[0] == row:
+                parts.append(self._patched_row(match.group(1), match.group(2), rows[row], styles))
+                pending.pop(0)
+            else:
+                parts.append(match.group(0))
+            position = match.end()
+        parts.append(body[position:])
+        parts.append(self._rows_xml({row: rows[row] for row in pending}, styles))
+
+        xml = self.xml[:sheet_data.start()] + f'<sheetData>{"".join(parts)}</sheetData>' + self.xml[sheet_data.end():]
+
+        # Grow the dimension to cover the edits
+        dimension = DIMENSION.search(xml)
+        if dimension and self.cells:
+            refs = [CELL_REF.match(ref) for ref in dimension.group(1).split(':')]
+            max_row = max([int(ref.group(2)) for ref in refs if ref] + [row for row, _ in self.cells])
+            max_column = max([column_index_from_string(ref.group(1)) for ref in refs if ref] +
+                             [column for _, column in self.cells])
+            first = dimension.group(1).split(':')[0] if refs[0] else 'A1'
+            xml = xml[:dimension.start()] + f'<dimension ref="{first}:{get_column_letter(max_column)}{max_row}"/>' \
+                + xml[dimension.end():]
+        return xml
+
+class WorkbookPatch:
+    """
+    Edit a few sheets of an xlsx file without loading the rest
+
+    Mirrors the parts of openpyxl's Workbook the fix-up scripts use
+    (sheetnames, wb[name], del wb[name], create_sheet, save). Only the
+    sheets that are touched are parsed and rewritten, along with
+    workbook.xml, its rels, [Content_Types].xml and styles.xml when they
+    change; every other part is streamed into the output unchanged, with
+    its compression method and timestamp. New cell strings are written
+    inline, so the shared string table is left alone.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.zip = zipfile.ZipFile(path)
+        self.names = set(self.zip.namelist())
+        self.workbook_xml = self.zip.read(WORKBOOK_PART).decode('utf-8')
+        self.rels_xml = self.zip.read(WORKBOOK_RELS_PART).decode('utf-8')
+        self.rels_changed = False
+        self.sheets_changed = False
+        self._styles = None
+
+        targets = {}
+        for entry in RELATIONSHIP_ENTRY.findall(self.rels_xml):
+            attributes = _attributes(entry)
+            targets[attributes['Id']] = _part_name(attributes['Target'])
+
+        prefix = re.search(rf'xmlns:(\w+)="{re.escape(RELATIONSHIPS_NS)}"', self.workbook_xml)
+        self.rel_prefix = prefix.group(1) if prefix else 'r'
+
+        # One dict per sheet in tab order
+        self.sheets = []
+        for entry in SHEET_ENTRY.findall(self.workbook_xml):
+            attributes = _attributes(entry)
+            rel_id = attributes[f'{self.rel_prefix}:id']
+            self.sheets.append({'name': attributes['name'], 'entry': entry, 'rel_id': rel_id,
+                                'part': targets[rel_id], 'sheet': None})
+        self.deleted = []
+
+    @property
+    def sheetnames(self):
+        return [sheet['name'] for sheet in self.sheets]
+
+    def _find(self, name):
+        for sheet in self.sheets:
+            if sheet['name'] == name:
+                return sheet
+        raise KeyError(f'Worksheet {name} does not exist.')
+
+    def __getitem__(self, name):
+        sheet = self._find(name)
+        if sheet['sheet'] is None:
+            sheet['sheet'] = PatchedSheet(name, self.zip.read(sheet['part']).decode('utf-8'))
+        return sheet['sheet']
+
+    def __delitem__(self, name):
+        sheet = self._find(name)
+        if 'localSheetId' in self.workbook_xml:
+            raise ValueError('Workbooks with sheet-scoped defined names cannot have sheets removed')
+        if sheet['entry'] and _rels_part(sheet['part']) in self.names:
+            raise ValueError(f"Sheet '{name}' has tables, comments or links and cannot be removed")
+        self.sheets.remove(sheet)
+        if sheet['entry']:
+            self.deleted.append(sheet)
+        self.sheets_changed = True
+
+    def create_sheet(self, title):
+        sheet = PatchedSheet(title)
+        self.sheets.append({'name': title, 'entry': None, 'rel_id': None, 'part': None, 'sheet': sheet})
+        self.sheets_changed = True
+        return sheet
+
+    @property
+    def styles(self):
+        if self._styles is None:
+            self._styles = CellStyles(self.zip.read(STYLES_PART).decode('utf-8'))
+        return self._styles
+
+    def _assign_new_parts(self):
+        """
+        Part names, relationship ids and sheet ids for the created sheets
+        """
+        part_numbers = [int(m.group(1)) for m in map(WORKSHEET_PART.match, self.names) if m]
+        rel_numbers = [int(rel_id[3:]) for rel_id in re.findall(r'Id="(rId\d+)"', self.rels_xml)]
+        sheet_ids = [int(_attributes(entry)['sheetId']) for entry in SHEET_ENTRY.findall(self.workbook_xml)]
+        next_part, next_rel, next_sheet_id = max(part_numbers, default=0), max(rel_numbers, default=0), max(sheet_ids, default=0)
+
+        new_parts = []
+        for sheet in self.sheets:
+            if sheet['entry'] is None:
+                next_part, next_rel, next_sheet_id = next_part + 1, next_rel + 1, next_sheet_id + 1
+                sheet['part'] = f'xl/worksheets/sheet{next_part}.xml'
+                sheet['rel_id'] = f'rId{next_rel}'
+                sheet['entry'] = (f'<sheet name={quoteattr(sheet["name"])} sheetId="{next_sheet_id}" '
+                                  f'state="visible" {self.rel_prefix}:id="{sheet["rel_id"]}"/>')
+                new_parts.append(sheet)
+        return new_parts
+
+    def save(self, output_file):
+        """
+        Write the patched workbook to output_file (which may be the source)
+        """
+        new_parts = self._assign_new_parts()
+        deleted_parts = {sheet['part'] for sheet in self.deleted}
+        deleted_rel_ids = {sheet['rel_id'] for sheet in self.deleted}
+
+        replaced = {}
+        for sheet in self.sheets:
+            if sheet['sheet'] is not None and sheet['sheet'].modified:
+                replaced[sheet['part']] = sheet['sheet'].to_xml(self.styles).encode('utf-8')
+
+        # Cached calculation order goes stale once formulas are rewritten
+        drop_calc_chain = bool(replaced) and CALC_CHAIN_PART in self.names
+        if drop_calc_chain:
+            deleted_parts.add(CALC_CHAIN_PART)
+
+        rels_xml = self.rels_xml
+        for entry in RELATIONSHIP_ENTRY.findall(rels_xml):
+            attributes = _attributes(entry)
+            if attributes['Id'] in deleted_rel_ids or _part_name(attributes['Target']) in deleted_parts:
+                rels_xml = rels_xml.replace(entry, '', 1)
+        new_rels = ''.join(f'<Relationship Type="{WORKSHEET_REL_TYPE}" Target="/{sheet["part"]}" Id="{sheet["rel_id"]}"/>'
+                           for sheet in new_parts)
+        rels_xml = rels_xml.replace('</Relationships>', new_rels + '</Relationships>')
+        if rels_xml != self.rels_xml:
+            replaced[WORKBOOK_RELS_PART] = rels_xml.encode('utf-8')
+
+        if self.sheets_changed:
+            entries = ''.join(sheet['entry'] for sheet in self.sheets)
+            workbook_xml = re.sub(r'<sheets>.*?</sheets>', lambda _: f'<sheets>{entries}</sheets>',
+                                  self.workbook_xml, count=1, flags=re.S)
+            replaced[WORKBOOK_PART] = workbook_xml.encode('utf-8')
+
+        if deleted_parts or new_parts:
+            content_types = self.zip.read(CONTENT_TYPES_PART).decode('utf-8')
+            for entry in OVERRIDE_ENTRY.findall(content_types):
+                if _part_name(_attributes(entry)['PartName']) in deleted_parts:
+                    content_types = content_types.replace(entry, '', 1)
+            overrides = ''.join(f'<Override PartName="/{sheet["part"]}" ContentType="{WORKSHEET_CONTENT_TYPE}"/>'
+                                for sheet in new_parts)
+            replaced[CONTENT_TYPES_PART] = content_types.replace('</Types>', overrides + '</Types>').encode('utf-8')
+
+        if self._styles is not None and self._styles.modified:
+            replaced[STYLES_PART] = self._styles.to_xml().encode('utf-8')
+
+        temp_file = f'{output_file}.tmp'
+        with zipfile.ZipFile(temp_file, 'w', zipfile.ZIP_DEFLATED) as out:
+            for info in self.zip.infolist():
+                if info.filename in deleted_parts:
+                    continue
+                if info.filename in replaced:
+                    out.writestr(info.filename, replaced.pop(info.filename))
+                else:
+                    _copy_part(self.zip, out, info)
+            for sheet in new_parts:
+                out.writestr(sheet['part'], replaced.pop(sheet['part']))
+        os.replace(temp_file, output_file)
+
+    def close(self):
+        self.zip.close()
\ No newline at end of file
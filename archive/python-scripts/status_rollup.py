@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+
+import pandas as pd
+from openpyxl.utils import get_column_letter
+
+ROLLUP_SHEET = 'Status_Rollup'
+
+ROLLUP_HEADERS = ['Group By', 'Key', 'Status', 'Expansion Count', 'Launch Count',
+                  'Expansion Revenue', 'Launch Revenue']
+
+# Action sheets rolled up, by the label used in the measure names
+ROLLUP_SOURCES = {'Expansion': 'Club_Expansions', 'Launch': 'Club_Launches'}
+
+# Each key gets an ALL row (every status) followed by a COMPLETED row
+ROLLUP_STATUSES = ['ALL', 'COMPLETED']
+
+STATUS_COLUMN = 'Status'
+REVENUE_COLUMN = 'Revenue Impact (₹)'
+
+class StatusRollup:
+    """
+    Counts and completed revenue of Club_Expansions / Club_Launches actions
+    per week group (or week) and status, written once as a hidden helper
+    range so Weekly_Execution and Milestones cells are plain cell references
+
+    The helper cells hold the only COUNTIFS/SUMIFS in the workbook, one per
+    key and status instead of several per Weekly/Milestones row, and each
+    gets its value computed here with a single groupby per source sheet.
+    """
+
+    def __init__(self):
+        self.sources = {}
+        self.keys = []
+        self._rows = {}
+        self._pivots = {}
+
+    def add_source(self, label, frame):
+        """
+        Register the rows written to an action sheet; frame columns must be the
+        sheet headers in order, with the first data row on sheet row 2
+        """
+        self.sources[label] = frame
+        self._pivots = {key: pivot for key, pivot in self._pivots.items() if key[0] != label}
+
+    def row(self, group_by, key, status='ALL'):
+        """
+        Helper sheet row (1-based) holding one key and status
+        """
+        if (group_by, key) not in self._rows:
+            self._rows[(group_by, key)] = 2 + len(self.keys) * len(ROLLUP_STATUSES)
+            self.keys.append((group_by, key))
+        return self._rows[(group_by, key)] + ROLLUP_STATUSES.index(status)
+
+    def cell(self, group_by, key, status, measure):
+        """
+        Cell reference like Status_Rollup!D5 for one measure
+        """
+        column = get_column_letter(ROLLUP_HEADERS.index(measure) + 1)
+        return f'{ROLLUP_SHEET}!{column}{self.row(group_by, key, status)}'
+
+    def _pivot(self, label, group_by):
+        if (label, group_by) in self._pivots:
+            return self._pivots[(label, group_by)]
+
+        pivot = {}
+        frame = self.sources.get(label)
+        if frame is not None and group_by in frame.columns:
+            if REVENUE_COLUMN in frame.columns:
+                revenue = pd.to_numeric(frame[REVENUE_COLUMN], errors='coerce').fillna(0)
+            else:
+                revenue = pd.Series(0, index=frame.index)
+            data = pd.DataFrame({'key': frame[group_by], 'revenue': revenue})
+
+            for key, (count, total) in data.groupby('key')['revenue'].agg(['size', 'sum']).iterrows():
+                pivot[(key, 'ALL')] = (count, total)
+
+            if STATUS_COLUMN in frame.columns:
+                data['status'] = frame[STATUS_COLUMN]
+                for (key, status), (count, total) in data.groupby(['key', 'status'])['revenue'].agg(['size', 'sum']).iterrows():
+                    pivot[(key, status)] = (count, total)
+
+        self._pivots[(label, group_by)] = pivot
+        return pivot
+
+    def value(self, group_by, key, status, measure):
+        """
+        Python-side value of one measure, matching what the helper formula computes
+        """
+        label, kind = measure.split(' ')
+        count, total = self._pivot(label, group_by).get((key, status), (0, 0))
+        return count if kind == 'Count' else total
+
+    def _formula(self, label, group_by, status, kind, row):
+        frame = self.sources.get(label)
+        if frame is None or group_by not in frame.columns or len(frame) == 0:
+            return 0
+        if status != 'ALL' and STATUS_COLUMN not in frame.columns:
+            return 0
+        if kind == 'Revenue' and REVENUE_COLUMN not in frame.columns:
+            return 0
+
+        def column_range(column_name):
+            column = get_column_letter(list(frame.columns).index(column_name) + 1)
+            return f'{ROLLUP_SOURCES[label]}!${column}$2:${column}${len(frame) + 1}'
+
+        criteria = f'{column_range(group_by)},$B{row}'
+        if status != 'ALL':
+            criteria += f',{column_range(STATUS_COLUMN)},$C{row}'
+
+        if kind == 'Count':
+            return f'=COUNTIFS({criteria})'
+        return f'=SUMIFS({column_range(REVENUE_COLUMN)},{criteria})'
+
+    def write_sheet(self, writer):
+        """
+        Add the hidden Status_Rollup sheet; formulas carry the Python values as
+        cached results where the writer backend supports it
+        """
+        ws = writer.add_sheet(ROLLUP_SHEET)
+        ws.append(ROLLUP_HEADERS)
+
+        for group_by, key in self.keys:
+            for status in ROLLUP_STATUSES:
+                row = self.row(group_by, key, status)
+                values = [group_by, key, status]
+                results = [None, None, None]
+                for measure in ROLLUP_HEADERS[3:]:
+                    label, kind = measure.split(' ')
+                    values.append(self._formula(label, group_by, status, kind, row))
+                    results.append(self.value(group_by, key, status, measure))
+                ws.append(values, results=results)
+
+        ws.hide()
+        return ws
\ No newline at end of file
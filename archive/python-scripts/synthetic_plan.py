@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+
+import os
+import sys
+import numpy as np
+import pandas as pd
+import xlsxwriter
+from week_schedule import format_days
+
+PLAN_INPUT = 'OND-JFM Plan with actionbales V5.xlsx'
+V2_INPUT = 'OND-JFM Plan with actionbales final V2.xlsx'
+
+# Row counts of the standard benchmark sizes
+SYNTHETIC_SIZES = {'1k': 1_000, '10k': 10_000, '100k': 100_000, '1m': 1_000_000}
+
+# Activity mix of the real Working sheet (rows per activity)
+ACTIVITY_WEIGHTS = {
+    'MUSIC': 66, 'RUNNING': 55, 'SOCIAL_DEDUCTIONS': 53, 'PICKLEBALL': 50,
+    'FOOTBALL': 50, 'BOARDGAMING': 46, 'BOOKCLUB': 44, 'ART': 36,
+}
+
+CITY_AREAS = {
+    'Gurgaon': ['GCR Extn.', 'Golf Course Road', 'MG Road', 'South City', 'Sector 29'],
+    'Delhi': ['Hauz Khas', 'Connaught Place', 'Saket', 'Rajouri Garden'],
+    'Noida': ['Sector 18', 'Sector 62'],
+    'Bangalore': ['Indiranagar', 'HSR Layout', 'Koramangala', 'Whitefield'],
+}
+
+CLUB_NAMES = ['GameMasters', 'Ballers', 'Dice', 'Mehfil', 'Fork', 'Current',
+              'Strummers', 'Pace Setters', 'Page Turners', 'Sketch Squad']
+
+# Club_Strategy shapes seen in the real sheet; {0}-{2} are club names
+STRATEGY_TEMPLATES = [
+    'Expand {0} club and Launch {1} in {area}. Scale {2} Club',
+    'Launch {0} in {area} and grow it to weekly meetups',
+    'Scale {0} Club to more days',
+    'Maintain {0} club quality in {area}',
+    'Expand {0} club in {area}',
+]
+
+SPECIFIC_ACTIONS = ['Expand to 4 meetups per week', 'Increase capacity to 30 people',
+                    'Maintain quality and retention', 'Launch satellite meetup', 'Optimize venue slots']
+
+STATUSES = ['NOT_STARTED', 'IN_PROGRESS', 'COMPLETED']
+
+PLAN_MONTHS = ['Nov'] * 4 + ['Dec'] * 4 + ['Jan'] * 5 + ['Feb'] * 4 + ['Mar']
+
+def _week_groups():
+    """
+    Week Group label of every plan week 1-18
+    """
+    groups = {}
+    for week, month in enumerate(PLAN_MONTHS, start=1):
+        weeks = [w for w, m in enumerate(PLAN_MONTHS, start=1) if m == month]
+        year = 2024 if month in ('Nov', 'Dec') else 2025
+        groups[week] = f'{month} {year} (Weeks {weeks[0]}-{weeks[-1]})'
+    return groups
+
+def _blank_some(values, rng, share):
+    """
+    Copy of values as objects with about share of the entries blank (NaN)
+    """
+    values = pd.Series(values, dtype=object)
+    return values.mask(rng.random(len(values)) < share)
+
+def synthetic_strategies(count, rng):
+    """
+    count distinct Club_Strategy texts built from the real sheet's templates
+    """
+    areas = [area for city_areas in CITY_AREAS.values() for area in city_areas]
+    templates = rng.integers(len(STRATEGY_TEMPLATES), size=count)
+    names = rng.integers(len(CLUB_NAMES), size=(count, 3))
+    area_codes = rng.integers(len(areas), size=count)
+
+    strategies = []
+    for template, (a, b, c), area in zip(templates.tolist(), names.tolist(), area_codes.tolist()):
+        strategies.append(STRATEGY_TEMPLATES[template].format(CLUB_NAMES[a], CLUB_NAMES[b], CLUB_NAMES[c], area=areas[area]))
+    return strategies
+
+def _random_schedules(rng, current_days, target_days):
+    """
+    (current, target) day masks with the given days per week, drawn from one
+    random day ranking per row so the target schedule contains the current one
+    """
+    ranks = rng.random((len(current_days), 7)).argsort(axis=1).argsort(axis=1)
+    day_bits = 1 << np.arange(7)
+    current = ((ranks < current_days[:, None]) * day_bits).sum(axis=1)
+    target = ((ranks < target_days[:, None]) * day_bits).sum(axis=1)
+    return current, target
+
+def synthetic_working_sheet(rows, seed=0):
+    """
+    Working sheet with the columns and value mix of the real one, generated
+    column-wise so 1M rows take seconds; the same seed gives the same sheet
+    """
+    rng = np.random.default_rng(seed)
+
+    activities = list(ACTIVITY_WEIGHTS)
+    weights = np.array(list(ACTIVITY_WEIGHTS.values()), dtype=float)
+    activity = np.array(activities, dtype=object)[rng.choice(len(activities), rows, p=weights / weights.sum())]
+
+    cities = list(CITY_AREAS)
+    city_code = rng.integers(len(cities), size=rows)
+    area_counts = np.array([len(CITY_AREAS[city]) for city in cities])
+    area_offsets = np.concatenate([[0], np.cumsum(area_counts)[:-1]])
+    all_areas = np.array([area for city in cities for area in CITY_AREAS[city]], dtype=object)
+    area = all_areas[area_offsets[city_code] + (rng.random(rows) * area_counts[city_code]).astype(int)]
+
+    current_clubs = rng.choice([0, 1, 2, 3], rows, p=[0.3, 0.4, 0.2, 0.1]).astype(float)
+    target_clubs = np.maximum(current_clubs + rng.integers(-1, 4, size=rows), 0).astype(float)
+
+    current_days = rng.integers(1, 5, size=rows)
+    target_days = np.minimum(current_days + rng.integers(0, 4, size=rows), 7)
+    day_texts = np.array([format_days(mask) for mask in range(128)], dtype=object)
+    current_mask, target_mask = _random_schedules(rng, current_days, target_days)
+
+    attendance = rng.integers(5, 30, size=rows)
+    people = attendance + rng.integers(0, 20, size=rows)
+    price = rng.integers(2, 17, size=rows) * 50
+
+    current_revenue = current_clubs * current_days * attendance * price * 4
+    march_revenue = np.maximum(target_clubs, current_clubs) * target_days * people * price * 4
+    january_revenue = current_revenue + (march_revenue - current_revenue) * rng.uniform(0.3, 0.7, size=rows)
+
+    strategy_pool = synthetic_strategies(max(len(STRATEGY_TEMPLATES), rows // 20), rng)
+    strategy = np.array(strategy_pool, dtype=object)[rng.integers(len(strategy_pool), size=rows)]
+
+    return pd.DataFrame({
+        'City': np.array(cities, dtype=object)[city_code],
+        'Area': area,
+        'Activity': activity,
+        'Current_Clubs_Count': pd.Series(current_clubs).mask(rng.random(rows) < 0.05),
+        'Clubs_Needed_Feb': pd.Series(target_clubs).mask(rng.random(rows) < 0.05),
+        'Number of Meetups per Week currenty': current_days,
+        'Current Days with Meetups': _blank_some(day_texts[current_mask], rng, 0.1),
+        'Average Attendance per Meetup': attendance,
+        'Total people in a meetup': people,
+        'Average Price per Person (₹)': price,
+        'Target days by December in a week': _blank_some(day_texts[target_mask], rng, 0.2),
+        'Current revenue': current_revenue,
+        'Monthly Revenue by January': january_revenue.round(),
+        'Revenue by March': march_revenue,
+        'Club_Strategy': _blank_some(strategy, rng, 0.25),
+    })
+
+def synthetic_action_sheet(working_sheet, rows, kind, seed=0):
+    """
+    Club_Expansions (kind='Expansion') or Club_Launches (kind='Launch') in the
+    V2 layout, rows actions drawn from working_sheet rows
+    """
+    rng = np.random.default_rng([seed, 1 if kind == 'Launch' else 2])
+    source = working_sheet.iloc[rng.integers(len(working_sheet), size=rows)].reset_index(drop=True)
+
+    week = rng.integers(1, 18, size=rows)
+    week_groups = _week_groups()
+    start = pd.Timestamp(2024, 10, 28)
+    week_dates = {w: (start + pd.Timedelta(weeks=w - 1)).strftime('%b %d, %Y') for w in week_groups}
+    success = np.where(rng.random(rows) < 0.15, '+20% attendance', '3+ weeks operational at target')
+    prefix = 'LAUNCH' if kind == 'Launch' else 'EXP'
+
+    return pd.DataFrame({
+        'Action ID': [f'{prefix}_{i:03d}' for i in range(1, rows + 1)],
+        'Week Group': [week_groups[w] for w in week.tolist()],
+        'Type': kind,
+        'Priority': np.array(['HIGH', 'MEDIUM', 'LOW'], dtype=object)[rng.integers(3, size=rows)],
+        'City': source['City'],
+        'Area': source['Area'],
+        'Activity': source['Activity'],
+        'Specific Action': np.array(SPECIFIC_ACTIONS, dtype=object)[rng.integers(len(SPECIFIC_ACTIONS), size=rows)],
+        'Success Criteria': success.astype(object),
+        'Revenue Impact (₹)': rng.integers(0, 90, size=rows) * 1000.0,
+        'Status': np.array(STATUSES, dtype=object)[rng.integers(len(STATUSES), size=rows)],
+        'Target Date': [week_dates[w] for w in week.tolist()],
+        'Duration (weeks)': rng.integers(2, 4, size=rows),
+        'Owner': source['Activity'].str.title() + f' {kind} Team',
+        'Dependencies': 'Venue | Community Manager',
+        'Strategy Notes': source['Club_Strategy'],
+        'Owner.1': np.array(['Joy', 'Sam', 'Rhea', 'Kabir'], dtype=object)[rng.integers(4, size=rows)],
+    })
+
+def synthetic_events(rows, seed=0):
+    """
+    Events sheet with rows carnival events
+    """
+    rng = np.random.default_rng([seed, 3])
+    activities = np.array(list(ACTIVITY_WEIGHTS), dtype=object)
+    return pd.DataFrame({
+        'Event': [f'Carnival {i}' for i in range(1, rows + 1)],
+        'City': np.array(list(CITY_AREAS), dtype=object)[rng.integers(len(CITY_AREAS), size=rows)],
+        'Activity': activities[rng.integers(len(activities), size=rows)],
+        'Date': _blank_some([f'Dec {d:02d}, 2024' for d in rng.integers(1, 29, size=rows).tolist()], rng, 0.2),
+    })
+
+def synthetic_v2_sheets(rows, seed=0, action_rows=None):
+    """
+    All sheets of a synthetic 'final V2' workbook: Working sheet, Club_Expansions,
+    Club_Launches (action_rows rows each, default rows), Weekly_Execution,
+    Milestones and Events
+    """
+    action_rows = rows if action_rows is None else action_rows
+    working_sheet = synthetic_working_sheet(rows, seed)
+    week_groups = _week_groups()
+
+    weekly = pd.DataFrame({
+        'Week': list(week_groups),
+        'Dates': [f'Week of {week_groups[w]}' for w in week_groups],
+        'Month': PLAN_MONTHS,
+    })
+    milestones = pd.DataFrame({
+        'Monthly Milestone': [f'M{i:03d}' for i in range(1, 9)],
+        'Target Date': [f'Week {w}' for w in range(1, 9)],
+        'Week': list(range(1, 9)),
+    })
+    for column in ['Description', 'Revenue Target (₹)', 'Status', 'Key Cities', 'Actions Focus',
+                   'Club Target', 'Attendance Target', 'Quality Metric', 'Team Focus']:
+        milestones[column] = [f'{column} {i}' for i in range(1, 9)]
+
+    return {
+        'Working sheet': working_sheet,
+        'Club_Expansions': synthetic_action_sheet(working_sheet, action_rows, 'Expansion', seed),
+        'Club_Launches': synthetic_action_sheet(working_sheet, action_rows, 'Launch', seed),
+        'Weekly_Execution': weekly,
+        'Milestones': milestones,
+        'Events': synthetic_events(max(2, rows // 100), seed),
+    }
+
+def write_sheets(path, sheets):
+    """
+    Write {sheet name: DataFrame} to an xlsx file row by row in constant
+    memory; blank (NaN) cells are left empty
+    """
+    workbook = xlsxwriter.Workbook(path, {'constant_memory': True})
+    for sheet_name, df in sheets.items():
+        ws = workbook.add_worksheet(sheet_name)
+        ws.write_row(0, 0, list(df.columns))
+        columns = [df[column].astype(object).where(df[column].notna(), None).tolist() for column in df.columns]
+        for row_idx, values in enumerate(zip(*columns), start=1):
+            ws.write_row(row_idx, 0, values)
+    workbook.close()
+    return path
+
+def write_synthetic_inputs(directory, rows, seed=0, action_rows=None):
+    """
+    Write synthetic stand-ins for the V5 plan input and the final V2 workbook
+    into directory, under the file names the scripts read
+    """
+    os.makedirs(directory, exist_ok=True)
+    sheets = synthetic_v2_sheets(rows, seed, action_rows)
+    plan_path = write_sheets(os.path.join(directory, PLAN_INPUT),
+                             {'Working sheet': sheets['Working sheet'], 'Events': sheets['Events']})
+    v2_path = write_sheets(os.path.join(directory, V2_INPUT), sheets)
+    return plan_path, v2_path
+
+def main():
+    args = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    size = args[0] if args else '1k'
+    rows = SYNTHETIC_SIZES[size] if size in SYNTHETIC_SIZES else int(size)
+    directory = args[1] if len(args) > 1 else f'synthetic_{size}'
+    seed = int(args[2]) if len(args) > 2 else 0
+
+    print(f'🧪 GENERATING SYNTHETIC PLAN INPUTS: {rows:,} rows (seed {seed})')
+    for path in write_synthetic_inputs(directory, rows, seed):
+        print(f'📁 {path}')
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,21 @@
+import os
+import sys
+import contextlib
+import pytest
+
+# The scripts import each other by module name from archive/python-scripts
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+@pytest.fixture
+def database():
+    """
+    Starts a local database holding the given tree and returns it with a
+    client connected to it; both are closed when the test ends
+    """
+    from firebase_rest import RTDBClient
+    from local_rtdb import LocalRTDB
+    with contextlib.ExitStack() as stack:
+        def start(tree):
+            db = stack.enter_context(LocalRTDB(tree))
+            return db, stack.enter_context(RTDBClient(db.url))
+        yield start
\ No newline at end of file
@@ -0,0 +1,59 @@
+import re
+import numpy as np
+import pandas as pd
+from club_names import ClubNameExtractor, first_match_index, join_club_names
+from synthetic_plan import synthetic_strategies
+
+def legacy_extract(strategy_text):
+    """
+    extract_club_names_from_strategy as the replica scripts had it before
+    ClubNameExtractor
+    """
+    club_names = []
+    patterns = [
+        r'([A-Z][a-zA-Z\s]+?)\s+(?:club|Club)',
+        r'Launch\s+([A-Z][a-zA-Z\s]+?)\s+',
+        r'Expand\s+([A-Z][a-zA-Z\s]+?)\s+',
+        r'Scale\s+([A-Z][a-zA-Z\s]+?)\s+',
+        r'([A-Z][a-zA-Z]+(?:\s+[A-Z][a-zA-Z]+)*)',
+    ]
+    for pattern in patterns:
+        for match in re.findall(pattern, strategy_text):
+            clean_name = match.strip()
+            if len(clean_name) > 2 and clean_name not in ['Launch', 'Expand', 'Scale', 'Club', 'Area', 'Month']:
+                club_names.append(clean_name)
+    if not club_names and any(keyword in strategy_text.lower() for keyword in ['launch', 'expand', 'scale']):
+        club_names = ['Primary Club']
+    return list(set(club_names))
+
+EDGE_CASES = [
+    '',
+    'launch two more',
+    'expand later',
+    'Launch Expand Foo and more',
+    'Launch Launch Foo bar',
+    'Scale A club in Area X',
+    'Expand GameMasters club and Launch Ballers in Sector 29. Scale Dice Club',
+    'Maintain Fork and Mehfil Club this Month',
+    'no capitals here',
+]
+
+def test_matches_legacy_extractor():
+    extractor = ClubNameExtractor()
+    for text in EDGE_CASES + synthetic_strategies(200, np.random.default_rng(0)):
+        assert extractor.extract(text) == sorted(legacy_extract(text)), text
+
+def test_extract_many_parses_each_value_once():
+    extractor = ClubNameExtractor()
+    strategies = pd.Series(['Launch Ballers in HSR', None, 'Launch Ballers in HSR', 'expand'], index=[5, 6, 7, 8])
+    names = extractor.extract_many(strategies)
+
+    assert list(names.index) == [5, 6, 7, 8]
+    assert names.tolist() == [['Ballers', 'HSR', 'Launch Ballers'], [], ['Ballers', 'HSR', 'Launch Ballers'],
+                              ['Primary Club']]
+    assert len(extractor._cache) == 3
+
+def test_first_match_index_keeps_first_and_skips_missing_keys():
+    index = first_match_index([('HSR', 'RUNNING'), ('HSR', 'RUNNING'), (np.nan, 'ART')], ['Ballers', 'Dice', 'Fork'])
+    assert index == {('HSR', 'RUNNING'): 'Ballers'}
+    assert join_club_names(['HSR', 'MG Road'], ['RUNNING', 'ART'], index) == ['Ballers', 'TBD']
\ No newline at end of file
@@ -0,0 +1,61 @@
+import io
+import json
+import pandas as pd
+import pytest
+from firebase_export import iter_export_records, read_firebase_export
+
+def _export():
+    return {
+        'carnivals': {
+            '1': {'id': 1, 'name': 'Sports Fever', 'startDate': '2025-10-01'},
+            'just-dink-it-test': {'name': 'Just Dink It', 'endDate': '2025-12-31'},
+        },
+        'clubs': {
+            '1': {'id': 1, 'name': 'Club 1', 'activity': 'Yoga', 'commissionAmount': '10', 'carnivals': [1]},
+            'pickle-crew': {'name': 'Pickle Crew', 'activity': 'Pickleball', 'carnivals': ['just-dink-it-test', 9]},
+        },
+        'tasks': {
+            'just-dink-it-test': {'clubs': {'pickle-crew': {'t1': {'id': 't1', 'status': 'done'}}}},
+            '9': {'carnivalTasks': [{'id': 0, 'status': 'pending'}]},
+        },
+        'revenue': {
+            '1': {'1': {'total': 10, 'entries': [{'amount': 10, 'date': '2025-10-02'}]}},
+            'just-dink-it-test': {'pickle-crew': {'total': 25, 'entries': [{'amount': 25, 'date': '2025-11-02'}]},
+                                  'ghost-club': {'total': 5}},
+        },
+    }
+
+@pytest.fixture
+def tables():
+    return read_firebase_export(io.StringIO(json.dumps(_export())))
+
+def test_ids_keep_their_keys(tables):
+    assert tables['carnivals']['carnival_id'].tolist() == ['1', 'just-dink-it-test']
+    assert tables['clubs']['club_id'].tolist() == ['1', 'pickle-crew']
+    assert tables['club_carnivals'][['club_id', 'carnival_id']].values.tolist() == [['1', '1'], ['pickle-crew', 'just-dink-it-test'], ['pickle-crew', '9']]
+    assert tables['clubs']['commission_amount'].tolist() == [10.0, pd.NA]
+
+def test_string_ids_get_their_names(tables):
+    totals = tables['revenue_totals'].set_index('club_id')
+    assert totals.loc['pickle-crew', ['carnival_name', 'club_name', 'activity', 'total']].tolist() == [
+        'Just Dink It', 'Pickle Crew', 'Pickleball', 25.0]
+    assert totals.loc['1', ['carnival_name', 'club_name']].tolist() == ['Sports Fever', 'Club 1']
+
+    entries = tables['revenue_entries']
+    assert entries[['carnival_name', 'club_name', 'amount']].values.tolist() == [
+        ['Sports Fever', 'Club 1', 10.0], ['Just Dink It', 'Pickle Crew', 25.0]]
+    club_task = tables['tasks'].set_index('task_key').loc['t1']
+    assert (club_task['carnival_name'], club_task['club_name'], club_task['scope']) == ('Just Dink It', 'Pickle Crew', 'club')
+
+def test_unknown_ids_are_counted_as_orphans(tables):
+    assert tables['orphans'] == {
+        'tasks': {'carnival_id': 1},
+        'club_carnivals': {'carnival_id': 1},
+        'revenue_totals': {'club_id': 1},
+    }
+    ghost = tables['revenue_totals'].set_index('club_id').loc['ghost-club']
+    assert pd.isna(ghost['club_name']) and ghost['carnival_name'] == 'Just Dink It'
+
+def test_records_stream_from_a_root():
+    records = list(iter_export_records(io.StringIO(json.dumps(_export()['clubs'])), root='clubs'))
+    assert [path for path, _ in records] == [('clubs', '1'), ('clubs', 'pickle-crew')]
\ No newline at end of file
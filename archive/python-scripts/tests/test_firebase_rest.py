@@ -0,0 +1,122 @@
+import json
+import threading
+import http.client
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pandas as pd
+import pytest
+from firebase_export import iter_export_records, read_firebase_export
+from firebase_rest import RTDBClient, key_order
+
+CLUB_KEYS = ['c1', '10', '2', '-3', '007', '2147483648', 'B', '1', '2147483647', 'a']
+
+def _database():
+    clubs = {
+        key: {'id': index + 1, 'name': f'Club {key}', 'activity': ['Yoga', 'Chess', 'Running'][index % 3],
+              'commissionType': 'percentage', 'commissionAmount': str(5 + index), 'carnivals': [1 + index % 2]}
+        for index, key in enumerate(CLUB_KEYS)
+    }
+    return {
+        'carnivals': [None, {'id': 1, 'name': 'Sports Fever', 'startDate': '2025-10-01'},
+                      {'id': 2, 'name': 'Winter Fest', 'endDate': '2025-12-31'}],
+        'clubs': clubs,
+        'tasks': {'1': {
+            'carnivalTasks': [{'id': 0, 'description': 'Venue "A"', 'status': 'pending', 'progress': 10}],
+            'clubs': {'3': {'club_3_task_0': {'id': 'club_3_task_0', 'description': 'é', 'status': 'done'}}},
+        }},
+        'mandatoryTasks': [{'id': 1, 'description': 'Insurance', 'createdAt': '2025-01-01'}],
+        'revenue': {'1': {'1': {'total': 30, 'entries': [
+            {'amount': 10, 'date': '2025-05-01', 'timestamp': '2025-05-01T10:00:00.000Z'},
+            {'amount': 20, 'date': '2025-05-02', 'timestamp': '2025-05-02T10:00:00.000Z'},
+        ]}}},
+    }
+
+def _sorted(df):
+    df = df.astype({column: 'string' for column in df.columns if df[column].dtype == 'category'})
+    return df.sort_values(list(df.columns), ignore_index=True)
+
+@pytest.mark.parametrize('page_size', [1, 3, 500])
+def test_paged_tables_match_the_export(tmp_path, database, page_size):
+    _, client = database(_database())
+    path = tmp_path / 'export.json'
+    path.write_text(json.dumps(_database()), encoding='utf-8')
+    expected = read_firebase_export(str(path))
+
+    tables = client.read_tables(page_size=page_size, workers=3)
+    assert tables['orphans'] == expected['orphans']
+    for name, df in expected.items():
+        if name != 'orphans':
+            pd.testing.assert_frame_equal(_sorted(tables[name]), _sorted(df), check_categorical=False)
+
+def test_key_order_puts_32_bit_integers_first():
+    keys = ['10', '9', '-1', 'a', '007', '2147483648', '2147483647', '-2147483648', '-2147483649', '0', 'B']
+    assert sorted(keys, key=key_order) == [
+        '-2147483648', '-1', '0', '9', '10', '2147483647', '-2147483649', '007', '2147483648', 'B', 'a']
+
+@pytest.mark.parametrize('page_size', [1, 3, 5, 10, 11])
+def test_pages_split_the_children_in_key_order(database, page_size):
+    db, client = database(_database())
+    expected = sorted(CLUB_KEYS, key=key_order)
+    assert client.shallow_keys('clubs') == expected
+
+    pages = list(client.iter_pages('clubs', page_size))
+    assert [list(page) for page in pages] == [expected[start:start + page_size] for start in range(0, len(expected), page_size)]
+    assert list(client.fetch_pages('clubs', page_size, workers=4)) == pages
+    assert {key: value for page in pages for key, value in page.items()} == _database()['clubs']
+
+    later = [key for page in client.iter_pages('clubs', page_size, start_after=expected[3]) for key in page]
+    assert later == expected[4:]
+
+def test_concurrent_records_match_the_export_order(tmp_path, database):
+    _, client = database(_database())
+    path = tmp_path / 'clubs.json'
+    path.write_text(json.dumps({key: _database()['clubs'][key] for key in sorted(CLUB_KEYS, key=key_order)}),
+                    encoding='utf-8')
+    with open(path, encoding='utf-8') as f:
+        expected = list(iter_export_records(f, root='clubs'))
+    assert list(client.iter_records('clubs', page_size=2, workers=3)) == expected
+
+class _ClosingHandler(BaseHTTPRequestHandler):
+    """
+    Answers one request per connection as if keeping it alive, then closes
+    it, like a server dropping an idle keep-alive connection
+    """
+    protocol_version = 'HTTP/1.1'
+    connections = 0
+
+    def log_message(self, format, *args):
+        pass
+
+    def setup(self):
+        super().setup()
+        type(self).connections += 1
+
+    def _answer(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        self.rfile.read(length)
+        payload = json.dumps({'path': self.path.split('?')[0]}).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+        self.close_connection = True
+
+    do_GET = do_POST = _answer
+
+@pytest.fixture
+def closing_server():
+    _ClosingHandler.connections = 0
+    server = ThreadingHTTPServer(('127.0.0.1', 0), _ClosingHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f'http://127.0.0.1:{server.server_address[1]}/'
+    server.shutdown()
+    server.server_close()
+
+def test_stale_keep_alive_connection_is_retried(closing_server):
+    with RTDBClient(closing_server, pool_size=1) as client:
+        assert client.get('a') == {'path': '/a.json'}
+        assert client.get('b') == {'path': '/b.json'}
+        assert _ClosingHandler.connections == 2
+
+        with pytest.raises((http.client.HTTPException, ConnectionError)):
+            client.request('POST', 'c', data={})
\ No newline at end of file
@@ -0,0 +1,94 @@
+import copy
+import json
+import pytest
+from firebase_sync import apply_changes, apply_to_file, diff_trees, update_body
+from local_rtdb import LocalRTDB, prune
+
+def _club(club_id, **fields):
+    return {'id': club_id, 'name': f'Club {club_id}', 'activity': 'Yoga', 'carnivals': [1], **fields}
+
+def _tree():
+    return {
+        'carnivals': [None, {'id': 1, 'name': 'Sports Fever'}, {'id': 2, 'name': 'Winter Fest'}],
+        'clubs': [_club(1), _club(2), _club(3), _club(4)],
+        'tasks': {'1': {
+            'carnivalTasks': [{'id': 0, 'description': 'Venue', 'status': 'pending'}],
+            'clubs': {'2': {'t1': {'id': 't1', 'status': 'pending'}, 't2': {'id': 't2', 'status': 'pending'}}},
+        }},
+    }
+
+def _applied(current, changes):
+    database = LocalRTDB(copy.deepcopy(current))
+    for _, path, _, new in changes:
+        database.set([str(part) for part in path], new)
+    return database.data
+
+def test_one_field_change_is_one_write():
+    desired = _tree()
+    desired['clubs'][2]['name'] = 'Renamed'
+    assert diff_trees(_tree(), desired) == [('patch', ('clubs', '2', 'name'), 'Club 3', 'Renamed')]
+    assert diff_trees(_tree(), _tree()) == []
+
+def test_records_are_matched_by_id():
+    desired = _tree()
+    desired['clubs'] = list(reversed(desired['clubs'])) + [_club(5)]
+    assert diff_trees(_tree(), desired) == [('set', ('clubs', '4'), None, _club(5))]
+
+def test_removed_record_closes_up_the_array():
+    current = _tree()
+    desired = _tree()
+    del desired['clubs'][1]
+
+    changes = diff_trees(current, desired)
+    assert ('delete', ('clubs', '3'), _club(4), None) in changes
+    assert {change[1][:2] for change in changes} == {('clubs', '1'), ('clubs', '2'), ('clubs', '3')}
+    assert _applied(current, changes)['clubs'] == [_club(1), _club(3), _club(4)]
+
+def test_node_with_no_key_kept_is_written_whole():
+    desired = _tree()
+    desired['tasks']['1']['clubs']['2'] = {'t3': {'id': 't3', 'status': 'done'}, 't4': {'id': 't4', 'status': 'pending'}}
+    changes = diff_trees(_tree(), desired)
+    assert changes == [('patch', ('tasks', '1', 'clubs', '2'), _tree()['tasks']['1']['clubs']['2'],
+                        desired['tasks']['1']['clubs']['2'])]
+
+def test_empty_values_count_as_missing_and_other_nodes_are_left_alone():
+    current = {**_tree(), 'revenue': {'1': {'1': {'total': 5}}}}
+    desired = _tree()
+    desired['clubs'][0]['notes'] = {}
+    desired['clubs'][1]['carnivals'] = []
+    changes = diff_trees(current, desired)
+    assert changes == [('delete', ('clubs', '1', 'carnivals'), [1], None)]
+    assert diff_trees(current, {'clubs': _tree()['clubs']}) == []
+
+def _desired():
+    desired = _tree()
+    del desired['clubs'][0]
+    desired['clubs'].append(_club(6, activity='Chess'))
+    desired['carnivals'][2]['name'] = 'Winter Fest 2025'
+    desired['tasks']['1']['clubs']['2']['t2']['status'] = 'done'
+    desired['tasks']['1']['clubs']['3'] = {'t9': {'id': 't9', 'status': 'pending'}}
+    return desired
+
+@pytest.mark.parametrize('max_paths', [1, 2, 5000])
+def test_apply_changes_splits_the_update(database, max_paths):
+    db, client = database(_tree())
+    changes = diff_trees(_tree(), _desired())
+    db.requests.clear()
+
+    assert apply_changes(client, changes, max_paths) == -(-len(changes) // max_paths)
+    patches = [request for request in db.requests if request[0] == 'PATCH']
+    assert len(patches) == -(-len(changes) // max_paths)
+    assert all(path == '/' for _, path, _ in patches)
+    assert {node: db.data[node] for node in _desired()} == prune(_desired())
+    assert diff_trees({node: client.get(node) for node in _desired()}, _desired()) == []
+
+def test_apply_to_file_matches_the_database(tmp_path, database):
+    _, client = database(_tree())
+    changes = diff_trees(_tree(), _desired())
+    apply_changes(client, changes)
+
+    path = tmp_path / 'tree.json'
+    path.write_text(json.dumps(_tree()), encoding='utf-8')
+    apply_to_file(str(path), changes)
+    assert json.loads(path.read_text(encoding='utf-8')) == {node: client.get(node) for node in _desired()}
+    assert len(update_body(changes)) == len(changes)
\ No newline at end of file
@@ -0,0 +1,83 @@
+import datetime
+import pytest
+from firebase_rest import RTDBError
+from firebase_task_export import action_tasks, plan_tasks, task_key, tasks_path, upload_tasks
+from plan_actions import ActivityStats, generate_expansion_actions, generate_launch_actions
+from synthetic_plan import synthetic_working_sheet
+
+START_DATE = datetime.datetime(2024, 11, 1)
+TOP3 = ['BOARDGAMING', 'SOCIAL_DEDUCTIONS', 'MUSIC']
+CREATED_AT = '2024-10-20'
+
+def _action_tables(working_sheet):
+    launches = generate_launch_actions(working_sheet, TOP3, {}, START_DATE)
+    expansions = generate_expansion_actions(working_sheet, TOP3, {}, START_DATE, ActivityStats(working_sheet))
+    launches.sort_for_plan(TOP3)
+    expansions.sort_for_plan(TOP3)
+    return launches, expansions
+
+@pytest.fixture(scope='module')
+def tasks():
+    return plan_tasks(_action_tables(synthetic_working_sheet(60, seed=5)), CREATED_AT)
+
+def _patches(db):
+    return [request for request in db.requests if request[0] == 'PATCH']
+
+def test_keys_follow_the_action_not_its_number(tasks):
+    record = {'City': 'Pune', 'Area': 'Baner', 'Activity': 'MUSIC', 'Club_Name': 'Jam', 'ID': 'LAUNCH_001'}
+    assert task_key('Launch', record) == task_key('Launch', {**record, 'ID': 'LAUNCH_042'})
+    assert task_key('Launch', record) != task_key('Expansion', record)
+    assert task_key('Launch', record) != task_key('Launch', {**record, 'Area': 'Aundh'})
+
+    working_sheet = synthetic_working_sheet(60, seed=5)
+    reordered = working_sheet.iloc[::-1].reset_index(drop=True)
+    assert set(plan_tasks(_action_tables(reordered), CREATED_AT)) == set(tasks)
+    assert all(key == task['id'] and key.startswith('plan_') for key, task in tasks.items())
+
+def test_duplicate_actions_get_numbered_keys():
+    launches = _action_tables(synthetic_working_sheet(60, seed=5))[0]
+    keys = [key for key, _ in action_tasks(launches, CREATED_AT)]
+    assert len(keys) == len(set(keys)) == len(launches)
+    duplicated = [key for key in keys if key.endswith('_2')]
+    assert duplicated and all(key[:-len('_2')] in keys for key in duplicated)
+
+def test_upload_writes_tasks_in_chunks(database, tasks):
+    db, client = database({})
+    assert upload_tasks(client, tasks, 3, club_id='7', chunk_size=7, workers=2) == (len(tasks), 0)
+
+    assert len(_patches(db)) == -(-len(tasks) // 7)
+    stored = db.data['tasks']['3']['clubs']['7']
+    assert set(stored) == set(tasks)
+    key = next(iter(tasks))
+    assert stored[key] == {**tasks[key], 'carnivalId': 3, 'clubId': 7}
+
+def test_upload_again_skips_existing_tasks(database, tasks):
+    db, client = database({})
+    upload_tasks(client, tasks, 1, chunk_size=50)
+    key = next(iter(tasks))
+    client.request('PATCH', f'{tasks_path(1)}/{key}', data={'status': 'done', 'progress': 100})
+
+    db.requests.clear()
+    assert upload_tasks(client, tasks, 1, chunk_size=50) == (0, len(tasks))
+    assert _patches(db) == []
+    assert db.data['tasks']['1']['carnivalTasks'][key]['status'] == 'done'
+
+    assert upload_tasks(client, tasks, 1, chunk_size=50, overwrite=True) == (len(tasks), 0)
+    assert db.data['tasks']['1']['carnivalTasks'][key]['status'] == 'pending'
+
+def test_transient_failures_are_retried(database, tasks):
+    db, client = database({})
+    db.fail_next(1, status=503)
+    assert upload_tasks(client, tasks, 1, chunk_size=len(tasks), backoff=0) == (len(tasks), 0)
+    assert [request[0] for request in db.requests] == ['GET', 'GET', 'PATCH']
+
+    db.requests.clear()
+    db.fail_next(2, status=503)
+    assert upload_tasks(client, tasks, 1, chunk_size=len(tasks), overwrite=True, backoff=0) == (len(tasks), 0)
+    assert len(_patches(db)) == 3
+    assert set(db.data['tasks']['1']['carnivalTasks']) == set(tasks)
+
+    db.fail_next(1, status=401)
+    with pytest.raises(RTDBError) as error:
+        upload_tasks(client, tasks, 2, backoff=0)
+    assert error.value.status == 401
\ No newline at end of file
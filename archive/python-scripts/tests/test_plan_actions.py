@@ -0,0 +1,73 @@
+import datetime
+import pandas as pd
+import pytest
+from plan_actions import EMPTY_ACTION_GROUP, ActionIndex, ActivityStats, generate_expansion_actions, generate_launch_actions
+from plan_state import FragmentCache, row_fingerprints
+from synthetic_plan import synthetic_working_sheet
+
+START_DATE = datetime.datetime(2024, 11, 1)
+TOP3 = ['BOARDGAMING', 'SOCIAL_DEDUCTIONS', 'MUSIC']
+
+@pytest.fixture(scope='module')
+def working_sheet():
+    return synthetic_working_sheet(300, seed=7)
+
+@pytest.fixture(scope='module')
+def actions(working_sheet):
+    launches = generate_launch_actions(working_sheet, TOP3, {}, START_DATE)
+    expansions = generate_expansion_actions(working_sheet, TOP3, {}, START_DATE, ActivityStats(working_sheet))
+    launches.sort_for_plan(TOP3)
+    expansions.sort_for_plan(TOP3)
+    return launches, expansions
+
+def test_one_launch_per_new_club(working_sheet, actions):
+    launches = actions[0]
+    current = working_sheet['Current_Clubs_Count'].fillna(0)
+    target = working_sheet['Clubs_Needed_Feb'].fillna(current)
+    assert len(launches) == int((target - current).clip(lower=0).sum())
+
+    records = list(launches.records())
+    assert sorted(record['ID'] for record in records) == [f'LAUNCH_{number:03d}' for number in range(1, len(records) + 1)]
+    assert launches.count_activities(TOP3) == sum(record['Activity'] in TOP3 for record in records)
+
+def test_sort_for_plan_puts_top3_first_then_weeks(actions):
+    for table in actions:
+        order = [(record['Activity'] not in TOP3, record['Target_Week']) for record in table.records()]
+        assert order == sorted(order)
+
+def test_action_index_matches_records(actions):
+    launches, expansions = actions
+    index = ActionIndex(launches, expansions)
+
+    frame = pd.DataFrame(list(launches.records()))
+    expected = frame.groupby('Target_Week')['Revenue_Target'].agg(['size', 'sum'])
+    for week, (count, total) in expected.iterrows():
+        assert index.for_week(week)['Launch_Actions'] == count
+        assert index.for_week(week)['Launch_Revenue'] == pytest.approx(total)
+
+    frame = pd.DataFrame(list(expansions.records()))
+    expected = frame.groupby(['Activity', 'City']).size()
+    for (activity, city), count in expected.items():
+        assert index.for_activity_city(activity, city)['Expansion_Actions'] == count
+
+def test_empty_lookups_are_independent(actions):
+    index = ActionIndex(*actions)
+    empty = index.for_week(99)
+    empty['Launch_Actions'] += 5
+    assert index.for_week(99)['Launch_Actions'] == 0
+    assert index.for_activity_city('NONE', 'Nowhere') == EMPTY_ACTION_GROUP
+
+def test_fragment_cache_reuses_unchanged_rows(working_sheet):
+    plain = list(generate_launch_actions(working_sheet, TOP3, {}, START_DATE).records())
+
+    cache = FragmentCache()
+    row_keys = row_fingerprints(working_sheet)
+    assert list(generate_launch_actions(working_sheet, TOP3, {}, START_DATE, cache, row_keys).records()) == plain
+    assert cache.reused == 0 and cache.rendered > 0
+
+    edited = working_sheet.copy()
+    edited.loc[edited.index[0], 'Club_Strategy'] = 'Edited strategy'
+    next_cache = FragmentCache(cache.current)
+    generate_launch_actions(edited, TOP3, {}, START_DATE, next_cache, row_fingerprints(edited))
+    assert next_cache.rendered <= 1
+    assert next_cache.reused + next_cache.rendered == cache.rendered
\ No newline at end of file
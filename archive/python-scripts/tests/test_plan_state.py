@@ -0,0 +1,97 @@
+import json
+import zipfile
+import numpy as np
+import pandas as pd
+import pytest
+from EXACT_PLAN_STRUCTURE import (define_plan_formats, write_plan_workbook, write_summary_sheet,
+                                  write_working_sheet, write_city_progress_sheet)
+from parallel_workbook import render_workbook_incremental
+from plan_state import PlanState
+
+SETTINGS = ('settings',)
+
+def _summary(rows):
+    return [
+        {'Metric': f'M{row}', 'Current': row, 'Target': row * 2, 'Gap': row, 'Actions': 'a',
+         'Timeline': 't', 'Priority': 'HIGH'}
+        for row in range(rows)
+    ]
+
+def _working_sheet():
+    return pd.DataFrame({
+        'Activity': ['MUSIC', 'CHESS', 'YOGA', 'MUSIC', 'RUN'],
+        'City': ['Pune', 'Delhi', 'Pune', 'Goa', None],
+        'Current revenue': [100.0, np.nan, 30.0, 40.0, 50.0],
+    })
+
+def _jobs(working_sheet, summary):
+    return [
+        ('Working_Sheet', write_working_sheet, (working_sheet,)),
+        ('Summary', write_summary_sheet, (summary,)),
+        ('City_Progress', write_city_progress_sheet, ([], ['MUSIC'])),
+    ]
+
+def _parts(path):
+    with zipfile.ZipFile(path) as workbook:
+        return {name: workbook.read(name) for name in workbook.namelist() if name != 'docProps/core.xml'}
+
+def _write_with_state(output_file, sheet_jobs):
+    plan_state = PlanState(output_file, SETTINGS)
+    counts = write_plan_workbook(output_file, sheet_jobs, plan_state=plan_state)
+    plan_state.save(['inputs'])
+    return counts
+
+def test_edited_rows_are_spliced_into_the_previous_workbook(tmp_path):
+    output_file = str(tmp_path / 'plan.xlsx')
+    working_sheet = _working_sheet()
+    assert _write_with_state(output_file, _jobs(working_sheet, _summary(4))) == (3, 0, 0)
+
+    working_sheet.loc[1, 'Current revenue'] = 75.5
+    working_sheet.loc[3, 'City'] = 'Mumbai & <Thane>'
+    sheet_jobs = _jobs(working_sheet, _summary(4))
+    assert _write_with_state(output_file, sheet_jobs) == (0, 1, 2)
+
+    full_file = str(tmp_path / 'full.xlsx')
+    render_workbook_incremental(full_file, sheet_jobs, define_plan_formats, [None] * len(sheet_jobs),
+                                {'nan_inf_to_errors': True})
+    assert _parts(output_file) == _parts(full_file)
+
+def test_sheets_with_other_row_counts_are_rendered_again(tmp_path):
+    output_file = str(tmp_path / 'plan.xlsx')
+    _write_with_state(output_file, _jobs(_working_sheet(), _summary(4)))
+    assert _write_with_state(output_file, _jobs(_working_sheet(), _summary(5))) == (1, 0, 2)
+
+def test_workbook_changed_outside_is_not_reused(tmp_path):
+    output_file = str(tmp_path / 'plan.xlsx')
+    sheet_jobs = _jobs(_working_sheet(), _summary(4))
+    _write_with_state(output_file, sheet_jobs)
+    with open(output_file, 'ab') as f:
+        f.write(b'\0')
+
+    plan_state = PlanState(output_file, SETTINGS)
+    assert plan_state.sheet_changes(sheet_jobs) == [None, None, None]
+
+def test_state_is_json_and_round_trips_caches(tmp_path):
+    output_file = str(tmp_path / 'plan.xlsx')
+    open(output_file, 'wb').close()
+    plan_state = PlanState(output_file, SETTINGS)
+    plan_state.launch_cache.get_or_render(np.uint64(2**64 - 1), lambda: [{'Duration': np.int64(2), 'Text': 'x'}])
+    plan_state.city_cache.get_or_render((np.uint64(7), 1, 0), lambda: {'Revenue_Gap': np.nan})
+    assert plan_state.save(['inputs'])
+
+    with open(plan_state.path, encoding='utf-8') as f:
+        assert json.load(f)['settings'] == plan_state.settings_key
+
+    reloaded = PlanState(output_file, SETTINGS)
+    assert reloaded.is_current(['inputs'])
+    assert reloaded.launch_cache.previous == {2**64 - 1: [{'Duration': 2, 'Text': 'x'}]}
+    assert list(reloaded.city_cache.previous) == [(7, 1, 0)]
+    assert PlanState(output_file, ('other settings',)).launch_cache.previous == {}
+
+@pytest.mark.parametrize('contents', [b'\x80\x04\x95 not json', b'[1, 2]', b'{"settings": null}'])
+def test_unreadable_state_is_ignored(tmp_path, contents):
+    output_file = str(tmp_path / 'plan.xlsx')
+    (tmp_path / 'plan.xlsx.state.json').write_bytes(contents)
+    plan_state = PlanState(output_file, SETTINGS)
+    assert plan_state.previous_inputs is None
+    assert plan_state.launch_cache.previous == {}
\ No newline at end of file
@@ -0,0 +1,23 @@
+import json
+import pandas as pd
+from EXACT_PLAN_STRUCTURE import define_plan_formats, write_summary_sheet, write_working_sheet
+from parallel_workbook import render_workbook_parallel
+from plan_trace import span, trace_run
+
+def test_parallel_render_records_a_span_per_sheet(tmp_path):
+    summary = [{'Metric': 'M', 'Current': 1, 'Target': 2, 'Gap': 1, 'Actions': 'a', 'Timeline': 't', 'Priority': 'HIGH'}]
+    working_sheet = pd.DataFrame({'Activity': ['MUSIC', 'CHESS'], 'City': ['Pune', 'Goa'], 'Current revenue': [1.0, 2.0]})
+    sheet_jobs = [('Summary', write_summary_sheet, (summary,)), ('Working_Sheet', write_working_sheet, (working_sheet,))]
+
+    trace_path = str(tmp_path / 'trace.jsonl')
+    with trace_run(trace_path, memory=False):
+        with span('render_parallel'):
+            render_workbook_parallel(str(tmp_path / 'plan.xlsx'), sheet_jobs, define_plan_formats, processes=2)
+
+    with open(trace_path, encoding='utf-8') as f:
+        records = {record['name']: record for record in map(json.loads, f)}
+    parent = records['render_parallel']
+    for name, rows in [('render Summary', 1), ('render Working_Sheet', 2)]:
+        record = records[name]
+        assert (record['parent'], record['depth'], record['rows_in']) == ('render_parallel', 1, rows)
+        assert parent['start_s'] - 0.01 <= record['start_s'] <= parent['start_s'] + parent['wall_s']
\ No newline at end of file
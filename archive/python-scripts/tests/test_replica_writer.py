@@ -0,0 +1,33 @@
+import zipfile
+import openpyxl
+import pytest
+from replica_writer import column_formula, create_replica_writer, spill_formula
+
+def test_column_formula_is_a_shared_formula_with_a_spill_form():
+    formula = column_formula(6, '=IF(D2=0,0,E2/D2)', 2, 19)
+    assert formula.ref == 'F2:F19'
+    assert formula.text == '=IF(D2=0,0,E2/D2)'
+    assert spill_formula(formula) == '=IF(D2:D19=0,0,E2:E19/D2:D19)'
+    assert spill_formula(column_formula(3, '=A2+AB12+A20', 2, 5)) == '=A2:A5+AB12+A20'
+
+@pytest.mark.parametrize('streaming', [False, True])
+def test_column_formula_writes_no_array_blocks(tmp_path, streaming):
+    path = tmp_path / 'formulas.xlsx'
+    writer = create_replica_writer(str(path), streaming)
+    ws = writer.add_sheet('Weekly_Execution')
+    ws.append(['D', 'E', 'Ratio'])
+    ws.append([1, 2, column_formula(3, '=IF(A2=0,0,B2/A2)', 2, 4)], column_styles={3: 'percent'})
+    ws.append([3, 4, None], column_styles={3: 'percent'})
+    ws.append([5, 6, None], column_styles={3: 'percent'})
+    writer.save()
+
+    with zipfile.ZipFile(path) as workbook:
+        sheet_xml = workbook.read('xl/worksheets/sheet1.xml').decode()
+    cells = [cell.value for cell in openpyxl.load_workbook(path)['Weekly_Execution']['C'][1:]]
+    if streaming:
+        assert sheet_xml.count('t="array"') == 1 and 'cm="1"' in sheet_xml
+        assert cells[1:] == [None, None]
+    else:
+        assert 't="array"' not in sheet_xml
+        assert sheet_xml.count('t="shared"') == 3 and sheet_xml.count('ref="C2:C4"') == 1
+        assert cells == ['=IF(A2=0,0,B2/A2)', '=IF(A3=0,0,B3/A3)', '=IF(A4=0,0,B4/A4)']
\ No newline at end of file
@@ -0,0 +1,129 @@
+import copy
+import json
+from revenue_rollup import STATE_NODE, RevenueState, rollup_database, rollup_export
+
+def _entry(amount, date):
+    return {'amount': amount, 'date': date, 'description': 'e', 'timestamp': f'{date}T10:00:00.000Z'}
+
+def _database():
+    return {
+        'carnivals': [None, {'id': 1, 'name': 'Sports Fever'}],
+        'clubs': [
+            None,
+            {'id': 1, 'name': 'Club 1', 'activity': 'Yoga', 'commissionType': 'Percentage', 'commissionAmount': '10', 'carnivals': [1]},
+            {'id': 2, 'name': 'Club 2', 'activity': 'Chess', 'commissionType': 'Fixed', 'commissionAmount': '5', 'carnivals': [1]},
+        ],
+        'revenue': {'1': {
+            '1': {'total': 600, 'entries': [_entry(100, '2025-06-01'), _entry(200, '2025-06-02'), _entry(300, '2025-06-03')]},
+            '2': {'total': 50, 'entries': [_entry(50, '2025-06-01')]},
+        }},
+    }
+
+def _delete_and_add_same_amount(data):
+    """
+    Dashboard edits leaving the total as it was: the first entry spliced
+    out and one of the same amount added on another day
+    """
+    entries = data['revenue']['1']['1']['entries']
+    entries.pop(0)
+    entries.append(_entry(100, '2025-06-09'))
+
+def _days(summary):
+    return {day: values['revenue'] for day, values in summary['days'].items()}
+
+def _rollup_file(tmp_path, data, state=None):
+    path = tmp_path / 'export.json'
+    path.write_text(json.dumps(data), encoding='utf-8')
+    state, summary, _ = rollup_export(str(path), state)
+    return RevenueState.from_node(json.loads(json.dumps(state.to_node()))), summary
+
+def test_export_resets_a_club_whose_entries_changed_under_the_same_total(tmp_path):
+    data = _database()
+    state, _ = _rollup_file(tmp_path, data)
+
+    _delete_and_add_same_amount(data)
+    state, summary = _rollup_file(tmp_path, data, state)
+    _, expected = _rollup_file(tmp_path, data)
+    assert _days(summary) == _days(expected)
+    assert _days(summary)['2025-06-01'] == 50 and _days(summary)['2025-06-09'] == 100
+
+    data['revenue']['1']['1']['entries'][0]['date'] = '2025-06-05'
+    state, summary = _rollup_file(tmp_path, data, state)
+    assert _days(summary) == _days(_rollup_file(tmp_path, data)[1])
+
+def test_unchanged_export_aggregates_nothing(tmp_path):
+    data = _database()
+    state, _ = _rollup_file(tmp_path, data)
+    (tmp_path / 'export.json').write_text(json.dumps(data), encoding='utf-8')
+    _, _, aggregated = rollup_export(str(tmp_path / 'export.json'), state)
+    assert aggregated == 0
+
+def test_state_without_fingerprints_is_reaggregated(tmp_path):
+    state, _ = _rollup_file(tmp_path, _database())
+    node = state.to_node()
+    for clubs in node['watermark'].values():
+        for mark in clubs.values():
+            del mark['content'], mark['last']
+
+    (tmp_path / 'export.json').write_text(json.dumps(_database()), encoding='utf-8')
+    _, summary, aggregated = rollup_export(str(tmp_path / 'export.json'), RevenueState.from_node(node))
+    assert aggregated == 4
+    assert summary['totals']['revenue'] == 650
+
+def _rollup_database(client):
+    state, summary, aggregated = rollup_database(client)
+    client.request('PUT', STATE_NODE, data=state.to_node())
+    return summary, aggregated
+
+def test_database_fetches_from_the_entry_before_the_cursor(database):
+    db, client = database(_database())
+    assert _rollup_database(client)[1] == 4
+
+    db.requests.clear()
+    assert _rollup_database(client)[1] == 0
+    starts = {path: params.get('startAt') for _, path, params in db.requests if path.endswith('/entries')}
+    assert starts == {'/revenue/1/1/entries': '"2"', '/revenue/1/2/entries': None}
+
+def test_database_resets_a_club_whose_last_entry_changed(database):
+    db, client = database(_database())
+    _rollup_database(client)
+
+    data = copy.deepcopy(_database())
+    _delete_and_add_same_amount(data)
+    client.request('PUT', 'revenue', data=data['revenue'])
+    summary, aggregated = _rollup_database(client)
+    assert aggregated == 3
+    assert _days(summary) == {'2025-06-01': 50, '2025-06-02': 200, '2025-06-03': 300, '2025-06-09': 100}
+
+def _with_string_ids(data):
+    data['carnivals'] = {'1': data['carnivals'][1], 'just-dink-it-test': {'name': 'Just Dink It'}}
+    data['clubs'] = {'1': data['clubs'][1], '2': data['clubs'][2],
+                     'pickle-crew': {'name': 'Pickle Crew', 'activity': 'Pickleball', 'commissionType': 'Percentage',
+                                     'commissionAmount': '20', 'carnivals': ['just-dink-it-test']}}
+    data['revenue']['just-dink-it-test'] = {'pickle-crew': {'total': 40, 'entries': [_entry(40, '2025-06-01')]}}
+    return data
+
+def _check_string_ids(summary):
+    carnival = summary['carnivals']['just-dink-it-test']
+    assert (carnival['name'], carnival['revenue'], carnival['commission']) == ('Just Dink It', 40, 8)
+    assert summary['clubs']['pickle-crew']['name'] == 'Pickle Crew'
+    assert summary['totals']['revenue'] == 690 and _days(summary)['2025-06-01'] == 190
+
+def test_export_keeps_carnivals_and_clubs_with_string_ids(tmp_path):
+    data = _with_string_ids(_database())
+    state, summary = _rollup_file(tmp_path, data)
+    _check_string_ids(summary)
+
+    data['revenue']['just-dink-it-test']['pickle-crew']['entries'].append(_entry(10, '2025-06-02'))
+    data['revenue']['just-dink-it-test']['pickle-crew']['total'] = 50
+    (tmp_path / 'export.json').write_text(json.dumps(data), encoding='utf-8')
+    _, summary, aggregated = rollup_export(str(tmp_path / 'export.json'), state)
+    assert aggregated == 1 and summary['carnivals']['just-dink-it-test']['revenue'] == 50
+
+def test_database_keeps_carnivals_and_clubs_with_string_ids(database):
+    db, client = database(_with_string_ids(_database()))
+    summary, aggregated = _rollup_database(client)
+    assert aggregated == 5
+    _check_string_ids(summary)
+    assert db.data[STATE_NODE]['watermark']['just-dink-it-test']['pickle-crew']['entries'] == 1
+    assert _rollup_database(client)[1] == 0
\ No newline at end of file
@@ -0,0 +1,65 @@
+import datetime
+import numpy as np
+import pandas as pd
+import pytest
+import sheet_snapshot
+from sheet_snapshot import load_snapshot, write_snapshot
+
+pytestmark = pytest.mark.skipif(sheet_snapshot.feather is None, reason='pyarrow not installed')
+
+@pytest.fixture
+def workbook(tmp_path):
+    path = tmp_path / 'plan.xlsx'
+    path.write_bytes(b'workbook bytes')
+    return str(path)
+
+def test_mixed_object_column_round_trips(workbook):
+    sheet = pd.DataFrame({
+        'Mixed': [1, 'TBD', 2.5, None, datetime.datetime(2025, 1, 2), True, datetime.date(2025, 3, 4)],
+        'Count': [1, 2, 3, 4, 5, 6, 7],
+        'When': [pd.Timestamp('2025-01-01'), 'later', datetime.time(3, 4), np.nan, pd.NaT,
+                 datetime.timedelta(hours=2), 'x'],
+    })
+    assert write_snapshot(workbook, {'Working sheet': sheet, 'Plain': sheet[['Count']]})
+
+    loaded = load_snapshot(workbook)
+    assert list(loaded) == ['Working sheet', 'Plain']
+    pd.testing.assert_frame_equal(loaded['Working sheet'], sheet)
+    assert [type(value) for value in loaded['Working sheet']['Mixed']] == \
+        [int, str, float, type(None), datetime.datetime, bool, datetime.date]
+    pd.testing.assert_frame_equal(loaded['Plain'], sheet[['Count']])
+
+def test_column_selection_decodes_mixed_columns(workbook):
+    sheet = pd.DataFrame({'Mixed': [1, 'x'], 'Text': ['a', 'b']})
+    write_snapshot(workbook, {'S': sheet})
+
+    loaded = load_snapshot(workbook, columns={'S': ['Mixed', 'Missing']})
+    assert list(loaded['S'].columns) == ['Mixed']
+    assert loaded['S']['Mixed'].tolist() == [1, 'x']
+
+def test_snapshot_of_other_contents_is_ignored(workbook):
+    write_snapshot(workbook, {'S': pd.DataFrame({'a': [1]})})
+    with open(workbook, 'ab') as f:
+        f.write(b'edited')
+    assert load_snapshot(workbook) is None
+
+@pytest.mark.parametrize('values', [
+    [datetime.datetime(2024, 1, 2), 45294],
+    [1.5, False],
+    [1, 2.5, None],
+    [datetime.date(2024, 1, 2), None],
+])
+def test_columns_arrow_would_coerce_keep_their_values(workbook, values):
+    sheet = pd.DataFrame({'Column': pd.Series(values, dtype=object)})
+    write_snapshot(workbook, {'S': sheet})
+
+    loaded = load_snapshot(workbook)['S']
+    pd.testing.assert_frame_equal(loaded, sheet)
+    assert [type(value) for value in loaded['Column']] == [type(value) for value in values]
+
+def test_non_text_headers_keep_their_type(workbook):
+    sheet = pd.DataFrame([[1, 2, 3, 4]], columns=['Name', 5, 2.5, datetime.datetime(2024, 11, 1)])
+    write_snapshot(workbook, {'S': sheet})
+
+    pd.testing.assert_frame_equal(load_snapshot(workbook)['S'], sheet)
+    assert list(load_snapshot(workbook, columns={'S': [5, 'Name']})['S'].columns) == ['Name', 5]
\ No newline at end of file
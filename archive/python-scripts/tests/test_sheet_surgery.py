@@ -0,0 +1,58 @@
+import zipfile
+import openpyxl
+import pytest
+from sheet_surgery import SharedFormula, WorkbookPatch
+
+@pytest.fixture
+def workbook(tmp_path):
+    path = tmp_path / 'source.xlsx'
+    wb = openpyxl.Workbook()
+    wb.active.title = 'Keep'
+    wb['Keep'].append(['Name', 'Value'])
+    wb['Keep'].append(['a', 1])
+    patched = wb.create_sheet('Patch')
+    for row in range(1, 6):
+        patched.append([row, row * 2, f'=A{row}+B{row}'])
+    wb.save(path)
+
+    # A stored member next to the deflated ones
+    with zipfile.ZipFile(path, 'a') as zf:
+        zf.writestr(zipfile.ZipInfo('customXml/item1.xml', date_time=(2024, 1, 2, 3, 4, 6)),
+                    b'<root>stored</root>', compress_type=zipfile.ZIP_STORED)
+    return path
+
+def test_untouched_parts_are_copied_unchanged(workbook, tmp_path):
+    output = tmp_path / 'patched.xlsx'
+    patch = WorkbookPatch(str(workbook))
+    patch['Patch'].cell(2, 2, 'edited')
+    patch['Patch'].cell(1, 4, SharedFormula('D1:D5', '=A1*2'))
+    patch.create_sheet('Added').cell(1, 1, 'new')
+    patch.save(str(output))
+    patch.close()
+
+    rewritten = {'xl/worksheets/sheet2.xml', 'xl/worksheets/sheet3.xml', 'xl/workbook.xml',
+                 'xl/_rels/workbook.xml.rels', '[Content_Types].xml', 'xl/calcChain.xml'}
+    with zipfile.ZipFile(workbook) as source, zipfile.ZipFile(output) as target:
+        targets = {info.filename: info for info in target.infolist()}
+        for info in source.infolist():
+            if info.filename in rewritten:
+                continue
+            copied = targets[info.filename]
+            assert target.read(copied) == source.read(info), info.filename
+            assert (copied.compress_type, copied.date_time) == (info.compress_type, info.date_time)
+        assert target.testzip() is None
+
+    wb = openpyxl.load_workbook(output)
+    assert wb.sheetnames == ['Keep', 'Patch', 'Added']
+    assert [[cell.value for cell in row] for row in wb['Keep'].iter_rows()] == [['Name', 'Value'], ['a', 1]]
+    assert wb['Patch']['B2'].value == 'edited'
+    assert wb['Patch']['C3'].value == '=A3+B3'
+    assert wb['Patch']['D1'].value == '=A1*2'
+    assert wb['Added']['A1'].value == 'new'
+
+def test_patch_in_place(workbook):
+    patch = WorkbookPatch(str(workbook))
+    del patch['Keep']
+    patch.save(str(workbook))
+    patch.close()
+    assert openpyxl.load_workbook(workbook).sheetnames == ['Patch']
\ No newline at end of file
@@ -0,0 +1,48 @@
+import openpyxl
+import pandas as pd
+from replica_writer import create_replica_writer
+from status_rollup import ROLLUP_SHEET, StatusRollup
+
+def _rollup():
+    rollup = StatusRollup()
+    rollup.add_source('Expansion', pd.DataFrame({
+        'Week Group': ['W1', 'W1', 'W2', 'W1'],
+        'Status': ['COMPLETED', 'NOT_STARTED', 'COMPLETED', 'COMPLETED'],
+        'Revenue Impact (₹)': [100, 200, 300, 'n/a'],
+    }))
+    rollup.add_source('Launch', pd.DataFrame({'Week Group': ['W2'], 'Status': ['BLOCKED']}))
+    return rollup
+
+def test_values_group_by_key_and_status():
+    rollup = _rollup()
+    assert rollup.value('Week Group', 'W1', 'ALL', 'Expansion Count') == 3
+    assert rollup.value('Week Group', 'W1', 'COMPLETED', 'Expansion Revenue') == 100
+    assert rollup.value('Week Group', 'W2', 'ALL', 'Launch Count') == 1
+    assert rollup.value('Week Group', 'W2', 'COMPLETED', 'Launch Revenue') == 0
+    assert rollup.value('Week Group', 'W9', 'ALL', 'Expansion Count') == 0
+
+def test_cells_get_one_row_per_key_and_status():
+    rollup = _rollup()
+    assert rollup.cell('Week Group', 'W1', 'ALL', 'Expansion Count') == f'{ROLLUP_SHEET}!D2'
+    assert rollup.cell('Week Group', 'W1', 'COMPLETED', 'Launch Revenue') == f'{ROLLUP_SHEET}!G3'
+    assert rollup.cell('Week Group', 'W2', 'ALL', 'Launch Count') == f'{ROLLUP_SHEET}!E4'
+    assert rollup.row('Week Group', 'W1') == 2
+
+def test_helper_sheet_formulas(tmp_path):
+    rollup = _rollup()
+    rollup.cell('Week Group', 'W1', 'COMPLETED', 'Expansion Revenue')
+    path = tmp_path / 'rollup.xlsx'
+    writer = create_replica_writer(str(path))
+    writer.add_sheet('Weekly_Execution')
+    rollup.write_sheet(writer)
+    writer.save()
+
+    ws = openpyxl.load_workbook(path)[ROLLUP_SHEET]
+    assert ws.sheet_state == 'hidden'
+    assert [cell.value for cell in ws[3]] == [
+        'Week Group', 'W1', 'COMPLETED',
+        '=COUNTIFS(Club_Expansions!$A$2:$A$5,$B3,Club_Expansions!$B$2:$B$5,$C3)',
+        '=COUNTIFS(Club_Launches!$A$2:$A$2,$B3,Club_Launches!$B$2:$B$2,$C3)',
+        '=SUMIFS(Club_Expansions!$C$2:$C$5,Club_Expansions!$A$2:$A$5,$B3,Club_Expansions!$B$2:$B$5,$C3)',
+        0,
+    ]
\ No newline at end of file
@@ -0,0 +1,72 @@
+import pandas as pd
+import pytest
+from verify_plan import PLAN_CHECKS, REVENUE_COLUMN, verify_plan
+
+def _sheets():
+    working = pd.DataFrame({
+        'City': ['Pune', 'Pune'], 'Area': ['Baner', 'Aundh'], 'Activity': ['MUSIC', 'CHESS'],
+        'Current revenue': [100.0, 200.0], 'Monthly Revenue by January': [150.0, 250.0], 'Revenue by March': [300.0, 400.0],
+        'Current_Clubs_Count': [1, 2], 'Clubs_Needed_Feb': [2, 2],
+    })
+    expansions = pd.DataFrame({
+        'Action ID': ['EXP_001', 'EXP_002', 'EXP_003'],
+        'City': ['Pune'] * 3, 'Area': ['Baner', 'Aundh', 'Aundh'], 'Activity': ['MUSIC', 'CHESS', 'CHESS'],
+        'Club Name': ['Jam Room', 'Knights', 'Rooks'],
+        'Specific Action': ['Expand Jam Room to weekends', 'Expand Knights club', 'Expand Rooks club'],
+        'Success Criteria': ['20 members', '10 members', '12 members'],
+        REVENUE_COLUMN: [40.0, 30.0, 30.0],
+    })
+    launches = pd.DataFrame({
+        'Action ID': ['LAUNCH_001'], 'City': ['Pune'], 'Area': ['Baner'], 'Activity': ['MUSIC'],
+        'Specific Action': ['Launch a jam'], 'Success Criteria': ['First session'], REVENUE_COLUMN: [150.0],
+    })
+    return {'Working sheet': working, 'Club_Expansions': expansions, 'Club_Launches': launches}
+
+def _verify(tmp_path, sheets, checks=None):
+    path = tmp_path / 'plan.xlsx'
+    with pd.ExcelWriter(path) as writer:
+        for name, df in sheets.items():
+            df.to_excel(writer, sheet_name=name, index=False)
+    report = verify_plan(str(path), checks, use_snapshot=False)
+    return {result['check']: result for result in report['checks']}, report
+
+def test_clean_plan_passes(tmp_path):
+    results, report = _verify(tmp_path, _sheets())
+    assert list(results) == list(PLAN_CHECKS)
+    assert {name: result['status'] for name, result in results.items()} == dict.fromkeys(PLAN_CHECKS, 'pass')
+    assert report['ok'] and report['counts']['pass'] == len(PLAN_CHECKS)
+    assert results['column_h_club_names']['metrics']['checked'] == 3
+
+def test_duplicate_action_id_fails(tmp_path):
+    sheets = _sheets()
+    sheets['Club_Launches']['Action ID'] = ['EXP_002']
+    results, report = _verify(tmp_path, sheets, ['duplicate_action_ids'])
+    result = results['duplicate_action_ids']
+    assert result['status'] == 'fail' and not report['ok']
+    assert result['rows'] == [{'sheet': 'Club_Expansions', 'row': 3, 'action_id': 'EXP_002'},
+                              {'sheet': 'Club_Launches', 'row': 2, 'action_id': 'EXP_002'}]
+
+def test_formula_prefixed_success_criteria_fails(tmp_path):
+    sheets = _sheets()
+    sheets['Club_Expansions'].loc[2, 'Success Criteria'] = '+20% attendance'
+    result = _verify(tmp_path, sheets, ['formula_injection'])[0]['formula_injection']
+    assert result['status'] == 'fail'
+    assert result['rows'] == [{'sheet': 'Club_Expansions', 'row': 4, 'column': 'Success Criteria', 'value': '+20% attendance'}]
+
+def test_missing_column_skips_the_check(tmp_path):
+    sheets = _sheets()
+    sheets['Club_Expansions'] = sheets['Club_Expansions'].drop(columns='Club Name')
+    results, report = _verify(tmp_path, sheets)
+    assert results['column_h_club_names']['status'] == 'skip'
+    assert results['column_h_club_names']['message'] == 'missing Club_Expansions!Club Name'
+    assert report['ok'] and report['counts']['skip'] == 1
+
+@pytest.mark.parametrize('club, mismatched', [('Bishops', True), ('TBD', False), (None, False)])
+def test_action_must_name_its_own_club(tmp_path, club, mismatched):
+    sheets = _sheets()
+    sheets['Club_Expansions'].loc[2, 'Club Name'] = club
+    result = _verify(tmp_path, sheets, ['column_h_club_names'])[0]['column_h_club_names']
+    # Knights and Rooks share (Aundh, CHESS) and each is checked against its own row
+    assert result['status'] == ('fail' if mismatched else 'pass')
+    assert result['rows'] == ([{'sheet': 'Club_Expansions', 'row': 4, 'club': 'Bishops'}] if mismatched else [])
+    assert result['metrics']['matched'] == 2
\ No newline at end of file
@@ -0,0 +1,53 @@
+import datetime
+from plan_actions import generate_expansion_actions, generate_launch_actions
+from synthetic_plan import synthetic_working_sheet
+from week_schedule import WeekSchedule, format_days, parse_days
+
+def test_parse_days_accepts_names_and_abbreviations():
+    assert parse_days('Monday, wed,FRIDAY') == 0b10101
+    assert parse_days(' , ') == 0
+    assert format_days(0b1000001) == 'Monday, Sunday'
+
+def test_parse_days_returns_none_for_other_tokens():
+    for text in ['Weekends', 'Daily', 'Mon-Fri', '3', 'Monday, Weekends']:
+        assert parse_days(text) is None
+
+def test_non_canonical_schedules_keep_their_text_and_token_count():
+    schedule = WeekSchedule.parse(['Friday,  Monday', 'Weekends', None, 'Mon,Mon', 3, 'Mon-Fri, Sunday'])
+
+    assert schedule.known.tolist() == [True, True, False, True, True, True]
+    assert schedule.parsed.tolist() == [True, False, False, True, False, False]
+    assert schedule.texts(unknown='nan') == ['Friday, Monday', 'Weekends', 'nan', 'Mon, Mon', '3', 'Mon-Fri, Sunday']
+    assert schedule.counts().tolist() == [2, 1, 0, 2, 1, 2]
+
+def test_set_operations_on_masks():
+    current = WeekSchedule.parse(['Monday', 'Tuesday, Friday', 'Weekends'])
+    target = WeekSchedule.parse(['Monday, Wednesday', 'Friday', 'Saturday'])
+
+    added = target - current
+    assert added.texts(unknown='?') == ['Wednesday', '', '?']
+    assert (target | current).counts().tolist() == [2, 2, 0]
+    assert (target & current).masks.tolist() == [1, 16, 0]
+
+    filled = WeekSchedule.parse([None, 'Weekends']).fillna(WeekSchedule.parse(['Sun', 'Monday']))
+    assert filled.texts() == ['Sun', 'Weekends']
+    assert filled.counts().tolist() == [1, 1]
+
+def test_generators_accept_free_text_schedules():
+    working_sheet = synthetic_working_sheet(40, seed=3)
+    free_text = ['Weekends', 'Daily', 'Friday, Monday', 'Mon-Fri', 3]
+    working_sheet['Target days by December in a week'] = [free_text[row % len(free_text)] for row in range(40)]
+    working_sheet['Current Days with Meetups'] = [free_text[(row + 1) % len(free_text)] for row in range(40)]
+    start_date = datetime.datetime(2024, 11, 1)
+
+    launches = list(generate_launch_actions(working_sheet, ['MUSIC'], {}, start_date).records())
+    assert launches
+    assert {action['Target_Schedule'] for action in launches} <= {'Weekends', 'Daily', 'Friday, Monday', 'Mon-Fri', '3'}
+    for action in launches:
+        expected = 2 if action['Target_Schedule'] == 'Friday, Monday' else 1
+        assert f"with {expected} days/week ({action['Target_Schedule']})" in action['Specific_Action']
+
+    expansions = list(generate_expansion_actions(working_sheet, ['MUSIC'], {}, start_date).records())
+    assert expansions
+    schedules = {(action['Current_Schedule'], action['Target_Schedule']) for action in expansions}
+    assert schedules <= {(str(free_text[(row + 1) % 5]), str(free_text[row % 5])) for row in range(5)}
\ No newline at end of file
@@ -1,6 +1,10 @@
 #!/usr/bin/env python3
 
-import pandas as pd
+import re
+from workbook_source import WorkbookSource
+from club_names import first_match_index, join_club_names
+
+CLUB_KEYWORDS = ['Ballers', 'Mehfil', 'Dice', 'Fork', 'Current']
 
 def verify_column_h_updates():
     """
@@ -11,7 +15,7 @@ def verify_column_h_updates():
 
     try:
         # Read the updated Club_Expansions sheet
-        club_expansions = pd.read_excel(replica_file, sheet_name='Club_Expansions')
+        club_expansions = WorkbookSource(replica_file).sheet('Club_Expansions')
 
         print('🔍 VERIFYING COLUMN H UPDATES IN CLUB_EXPANSIONS')
         print('=' * 60)
@@ -27,10 +31,10 @@ def verify_column_h_updates():
             print(f'{i:2d}. {action}')
 
         # Check if club names are present
-        actions_with_clubs = []
-        for i, action in enumerate(specific_actions):
-            if any(club_keyword in str(action) for club_keyword in ['Ballers', 'Mehfil', 'Dice', 'Fork', 'Current']):
-                actions_with_clubs.append((i+2, action))  # +2 because of header and 0-indexing
+        action_text = specific_actions.astype(str)
+        has_club = action_text.str.contains('|'.join(map(re.escape, CLUB_KEYWORDS)), regex=True).to_numpy()
+        # +2 because of header and 0-indexing
+        actions_with_clubs = [(i + 2, specific_actions.iloc[i]) for i in has_club.nonzero()[0]]
 
         print(f'\n🎯 ACTIONS WITH CLUB NAMES: {len(actions_with_clubs)}')
         print('=' * 40)
@@ -49,6 +53,20 @@ def verify_column_h_updates():
             for club in unique_clubs[:10]:
                 print(f'• {club}')
 
+            # Column H should name the club joined to its (Area, Activity); TBD rows had no match
+            if 'Area' in club_expansions.columns and 'Activity' in club_expansions.columns:
+                areas = club_expansions['Area']
+                activities = club_expansions['Activity']
+                index = first_match_index(zip(areas, activities), club_names)
+                expected = join_club_names(areas, activities, index, default=None)
+                mismatched = [
+                    (i + 2, club) for i, (club, action) in enumerate(zip(expected, action_text))
+                    if isinstance(club, str) and club != 'TBD' and club not in action
+                ]
+                print(f'\n🔗 COLUMN H MATCHES JOINED CLUB NAME: {len(club_expansions) - len(mismatched)}/{len(club_expansions)}')
+                for row_num, club in mismatched[:10]:
+                    print(f'Row {row_num}: missing {club}')
+
         return True
 
     except Exception as e:
@@ -1,6 +1,6 @@
 #!/usr/bin/env python3
 
-import pandas as pd
+from workbook_source import WorkbookSource
 
 def verify_correct_split():
     """
@@ -14,9 +14,10 @@ def verify_correct_split():
         print('=' * 50)
 
         # Read the sheets
-        club_expansions = pd.read_excel(file_path, sheet_name='Club_Expansions')
-        club_launches = pd.read_excel(file_path, sheet_name='Club_Launches')
-        working_sheet = pd.read_excel(file_path, sheet_name='Working sheet')
+        source = WorkbookSource(file_path)
+        club_expansions = source.sheet('Club_Expansions')
+        club_launches = source.sheet('Club_Launches')
+        working_sheet = source.sheet('Working sheet')
 
         # Calculate totals
         expansion_revenue_total = club_expansions['Revenue Impact (₹)'].fillna(0).sum()
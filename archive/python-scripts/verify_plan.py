@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+
+import re
+import sys
+import json
+import time
+import argparse
+import numpy as np
+import pandas as pd
+from workbook_source import WorkbookSource
+from verify_column_h_updates import CLUB_KEYWORDS
+
+DEFAULT_WORKBOOK = 'OND-JFM Plan REPLICA with Club Maintenance.xlsx'
+
+ACTION_SHEETS = ['Club_Expansions', 'Club_Launches']
+REVENUE_COLUMN = 'Revenue Impact (₹)'
+PLACE_COLUMNS = ['City', 'Area', 'Activity']
+
+# Free-text action columns written to the workbook as typed
+TEXT_COLUMNS = ['Specific Action', 'Success Criteria', 'Dependencies', 'Strategy Notes']
+
+# Leading characters that make a spreadsheet read text as a formula ("'" quoted text is safe)
+FORMULA_PREFIX_PATTERN = r'^[=+\-@]'
+
+# Largest |current + expansion - January revenue| accepted, as a share of January revenue
+ALIGNMENT_TOLERANCE = 0.01
+
+JAN_TARGET = 3700000  # 37L
+MAR_TARGET = 5700000  # 57L
+
+# Offending rows listed per check
+ROW_LIMIT = 20
+
+STATUS_ICONS = {'pass': '✅', 'warn': '⚠️', 'fail': '❌', 'skip': '⏭️'}
+
+def _amount(value):
+    return round(float(value), 2)
+
+def _result(status, message, metrics, rows=None):
+    return {'status': status, 'message': message, 'metrics': metrics, 'rows': (rows or [])[:ROW_LIMIT]}
+
+def _excel_rows(mask):
+    """
+    Spreadsheet row numbers of the True entries (header is row 1)
+    """
+    return (np.flatnonzero(np.asarray(mask)) + 2).tolist()
+
+def _total(df, column):
+    return _amount(pd.to_numeric(df[column], errors='coerce').fillna(0).sum())
+
+def check_revenue_split(frames):
+    """
+    Current revenue plus the expansion actions' revenue should reach the
+    January revenue of the working sheet
+    """
+    working = frames['Working sheet']
+    current = _total(working, 'Current revenue')
+    january = _total(working, 'Monthly Revenue by January')
+    march = _total(working, 'Revenue by March')
+    expansion = _total(frames['Club_Expansions'], REVENUE_COLUMN)
+    launch = _total(frames['Club_Launches'], REVENUE_COLUMN)
+
+    gap = _amount(abs(current + expansion - january))
+    target_gap = MAR_TARGET - january
+    metrics = {
+        'current_revenue': current,
+        'january_revenue': january,
+        'march_revenue': march,
+        'expansion_revenue': expansion,
+        'launch_revenue': launch,
+        'alignment_gap': gap,
+        'jan_target_gap': _amount(JAN_TARGET - january),
+        'launch_target_coverage': _amount(launch / target_gap) if target_gap > 0 else None,
+    }
+    status = 'warn' if gap > ALIGNMENT_TOLERANCE * abs(january) else 'pass'
+    return _result(status, f'current + expansion ₹{current + expansion:,.0f} vs January ₹{january:,.0f} '
+                           f'(gap ₹{gap:,.0f})', metrics)
+
+def check_launch_counts(frames):
+    """
+    Launch actions against the working sheet's club needs: every place
+    needing new clubs should get a launch, and launches should only go
+    where clubs are needed
+    """
+    working = frames['Working sheet']
+    launches = frames['Club_Launches']
+    current_clubs = pd.to_numeric(working['Current_Clubs_Count'], errors='coerce').fillna(0)
+    clubs_needed = pd.to_numeric(working['Clubs_Needed_Feb'], errors='coerce').fillna(0)
+    needs_clubs = (clubs_needed > current_clubs).to_numpy()
+
+    working_places = pd.MultiIndex.from_frame(working[PLACE_COLUMNS])
+    launch_places = pd.MultiIndex.from_frame(launches[PLACE_COLUMNS])
+    needing_places = working_places[needs_clubs]
+    uncovered = needs_clubs & ~working_places.isin(launch_places)
+    unneeded = ~launch_places.isin(needing_places)
+
+    new_clubs = float(clubs_needed.sum() - current_clubs.sum())
+    metrics = {
+        'launch_rows': len(launches),
+        'current_clubs': float(current_clubs.sum()),
+        'clubs_needed_feb': float(clubs_needed.sum()),
+        'new_clubs': new_clubs,
+        'places_needing_clubs': int(needs_clubs.sum()),
+        'unique_launch_places': int(launch_places.nunique()),
+        'places_without_launch': int(uncovered.sum()),
+        'launches_without_need': int(unneeded.sum()),
+        'launch_revenue_jan_to_mar': _amount(_total(working, 'Revenue by March') - _total(working, 'Monthly Revenue by January')),
+    }
+    rows = [{'sheet': 'Working sheet', 'row': row, 'issue': 'needs clubs but has no launch'}
+            for row in _excel_rows(uncovered)]
+    rows += [{'sheet': 'Club_Launches', 'row': row, 'issue': 'launch where no clubs are needed'}
+             for row in _excel_rows(unneeded)]
+
+    status = 'warn' if rows or len(launches) > new_clubs else 'pass'
+    return _result(status, f'{len(launches)} launches for {new_clubs:,.0f} new clubs in '
+                           f'{metrics["places_needing_clubs"]} places', metrics, rows)
+
+def check_duplicate_action_ids(frames):
+    """
+    Action IDs must be unique across the expansion and launch sheets
+    """
+    ids = pd.concat([frames[sheet]['Action ID'] for sheet in ACTION_SHEETS], keys=ACTION_SHEETS)
+    duplicated = (ids.duplicated(keep=False) & ids.notna()).to_numpy()
+    missing = ids.isna().to_numpy()
+
+    metrics = {
+        'actions': len(ids),
+        'duplicate_rows': int(duplicated.sum()),
+        'duplicate_ids': int(ids[duplicated].nunique()),
+        'missing_ids': int(missing.sum()),
+    }
+    # Row numbers restart at 2 on every sheet
+    sheets = ids.index.get_level_values(0)
+    sheet_rows = ids.groupby(level=0, sort=False).cumcount().to_numpy() + 2
+    rows = [{'sheet': sheets[i], 'row': int(sheet_rows[i]), 'action_id': ids.iloc[i]}
+            for i in np.flatnonzero(duplicated | missing)]
+
+    status = 'fail' if metrics['duplicate_rows'] else 'warn' if metrics['missing_ids'] else 'pass'
+    return _result(status, f'{metrics["duplicate_ids"]} duplicated and {metrics["missing_ids"]} missing '
+                           f'Action IDs in {len(ids)} actions', metrics, rows)
+
+def check_formula_injection(frames):
+    """
+    Text cells starting with a formula prefix are run as formulas once the
+    sheet is retyped or exported, e.g. "+20% attendance"
+    """
+    metrics = {}
+    rows = []
+    for sheet in ACTION_SHEETS:
+        for column in TEXT_COLUMNS:
+            if column not in frames[sheet].columns:
+                continue
+            text = frames[sheet][column].astype('string')
+            flagged = text.str.match(FORMULA_PREFIX_PATTERN).fillna(False).to_numpy(dtype=bool)
+            if flagged.any():
+                metrics[f'{sheet}.{column}'] = int(flagged.sum())
+                rows += [{'sheet': sheet, 'row': row, 'column': column, 'value': value}
+                         for row, value in zip(_excel_rows(flagged), text[flagged])]
+
+    total = sum(metrics.values())
+    metrics['total'] = total
+    return _result('fail' if total else 'pass', f'{total} text cells start with a formula prefix', metrics, rows)
+
+def check_column_h_club_names(frames):
+    """
+    Column H (Specific Action) of every expansion names the club in its
+    own Club Name column
+    """
+    expansions = frames['Club_Expansions']
+    action_text = expansions['Specific Action'].fillna('').astype(str)
+    club_names = expansions['Club Name']
+    has_keyword = action_text.str.contains('|'.join(map(re.escape, CLUB_KEYWORDS)), regex=True).to_numpy()
+
+    expected = club_names.astype(object).reset_index(drop=True)
+    # TBD rows had no club to join
+    checked = expected.map(lambda club: isinstance(club, str) and club.strip() not in ('', 'TBD')).to_numpy(dtype=bool)
+    named = np.char.find(action_text.to_numpy(dtype=str), expected.where(checked, '').to_numpy(dtype=str)) >= 0
+    mismatched = checked & ~named
+
+    metrics = {
+        'expansions': len(expansions),
+        'actions_with_club_keywords': int(has_keyword.sum()),
+        'unique_club_names': int(club_names.nunique()),
+        'checked': int(checked.sum()),
+        'matched': int((checked & named).sum()),
+        'mismatched': int(mismatched.sum()),
+    }
+    rows = [{'sheet': 'Club_Expansions', 'row': row, 'club': club}
+            for row, club in zip(_excel_rows(mismatched), expected[mismatched])]
+    return _result('fail' if rows else 'pass', f'{metrics["matched"]}/{metrics["checked"]} column H actions name '
+                                               f'their club', metrics, rows)
+
+# Check name -> (function, {sheet: columns it reads}), in report order
+PLAN_CHECKS = {
+    'revenue_split': (check_revenue_split, {
+        'Working sheet': ['Current revenue', 'Monthly Revenue by January', 'Revenue by March'],
+        'Club_Expansions': [REVENUE_COLUMN],
+        'Club_Launches': [REVENUE_COLUMN],
+    }),
+    'launch_counts': (check_launch_counts, {
+        'Working sheet': PLACE_COLUMNS + ['Current_Clubs_Count', 'Clubs_Needed_Feb',
+                                          'Monthly Revenue by January', 'Revenue by March'],
+        'Club_Launches': PLACE_COLUMNS,
+    }),
+    'duplicate_action_ids': (check_duplicate_action_ids, {sheet: ['Action ID'] for sheet in ACTION_SHEETS}),
+    'formula_injection': (check_formula_injection, {sheet: ['Success Criteria'] for sheet in ACTION_SHEETS}),
+    'column_h_club_names': (check_column_h_club_names, {
+        'Club_Expansions': ['Area', 'Activity', 'Specific Action', 'Club Name'],
+    }),
+}
+
+# Columns read when present but not required by their check
+OPTIONAL_COLUMNS = {sheet: [column for column in TEXT_COLUMNS if column != 'Success Criteria']
+                    for sheet in ACTION_SHEETS}
+
+def needed_columns(checks):
+    """
+    {sheet: columns} read by the given checks, each sheet listed once
+    """
+    columns = {}
+    for name in checks:
+        for sheet, names in PLAN_CHECKS[name][1].items():
+            listed = columns.setdefault(sheet, [])
+            for column in names + OPTIONAL_COLUMNS.get(sheet, []):
+                if column not in listed:
+                    listed.append(column)
+    return columns
+
+def run_check(name, frames):
+    """
+    Report entry of one check, skipped when the workbook lacks what it reads
+    """
+    func, needs = PLAN_CHECKS[name]
+    missing = [f'{sheet}!{column}' for sheet, names in needs.items() for column in names
+               if sheet not in frames or column not in frames[sheet].columns]
+    if missing:
+        result = _result('skip', 'missing ' + ', '.join(missing), {})
+        return {'check': name, **result, 'seconds': 0.0}
+
+    start = time.perf_counter()
+    result = func(frames)
+    return {'check': name, **result, 'seconds': round(time.perf_counter() - start, 4)}
+
+def verify_plan(path=DEFAULT_WORKBOOK, checks=None, use_snapshot=True):
+    """
+    Run the plan checks on a workbook and return a JSON-ready report
+
+    The sheets the checks need are read once, and only the columns they
+    use; every check then works on whole columns. ok is False when a check
+    fails; warnings are reported but do not fail the plan.
+    """
+    checks = list(checks or PLAN_CHECKS)
+    unknown = [name for name in checks if name not in PLAN_CHECKS]
+    if unknown:
+        raise ValueError(f'Unknown checks: {", ".join(unknown)}')
+
+    start = time.perf_counter()
+    frames = WorkbookSource(path, use_snapshot).select(needed_columns(checks))
+    load_seconds = time.perf_counter() - start
+
+    results = [run_check(name, frames) for name in checks]
+    counts = {status: sum(result['status'] == status for result in results) for status in STATUS_ICONS}
+    return {
+        'workbook': path,
+        'ok': counts['fail'] == 0,
+        'counts': counts,
+        'load_seconds': round(load_seconds, 4),
+        'seconds': round(time.perf_counter() - start, 4),
+        'checks': results,
+    }
+
+def print_report(report):
+    print(f'🔍 VERIFYING {report["workbook"]}')
+    print('=' * 60)
+    for result in report['checks']:
+        print(f'{STATUS_ICONS[result["status"]]} {result["check"]}: {result["message"]}')
+        for row in result['rows'][:5]:
+            print('      ' + ', '.join(f'{key}={value}' for key, value in row.items()))
+    counts = ', '.join(f'{count} {status}' for status, count in report['counts'].items() if count)
+    print(f'\n{"✅" if report["ok"] else "❌"} {counts} in {report["seconds"]:.2f}s '
+          f'(loading {report["load_seconds"]:.2f}s)')
+
+def main():
+    parser = argparse.ArgumentParser(description='Verify generated plan workbooks in one pass')
+    parser.add_argument('workbooks', nargs='*', default=[DEFAULT_WORKBOOK])
+    parser.add_argument('--checks', help=f'comma-separated subset of {",".join(PLAN_CHECKS)}')
+    parser.add_argument('--json', help='write the report as JSON here ("-" for stdout only)')
+    parser.add_argument('--no-snapshot', action='store_true', help='read the xlsx even when a snapshot exists')
+    args = parser.parse_args()
+
+    checks = args.checks.split(',') if args.checks else None
+    reports = [verify_plan(path, checks, not args.no_snapshot) for path in args.workbooks]
+
+    if args.json == '-':
+        json.dump(reports, sys.stdout, indent=2, ensure_ascii=False, default=str)
+        print()
+    else:
+        for report in reports:
+            print_report(report)
+        if args.json:
+            with open(args.json, 'w', encoding='utf-8') as f:
+                json.dump(reports, f, indent=2, ensure_ascii=False, default=str)
+            print(f'📁 Report saved: {args.json}')
+
+    sys.exit(0 if all(report['ok'] for report in reports) else 1)
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+
+from functools import lru_cache
+import numpy as np
+import pandas as pd
+
+WEEKDAYS = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+
+# Full day names and three-letter abbreviations, lower case, to their bit
+DAY_BITS = {}
+for _bit, _day in enumerate(WEEKDAYS):
+    DAY_BITS[_day.lower()] = 1 << _bit
+    DAY_BITS[_day[:3].lower()] = 1 << _bit
+
+# Number of days in every 7-bit mask
+POPCOUNT = np.array([bin(mask).count('1') for mask in range(128)], dtype=np.int8)
+
+def day_tokens(days_text):
+    """
+    Non-blank comma separated tokens of a day list, stripped
+    """
+    return [token.strip() for token in days_text.split(',') if token.strip()]
+
+@lru_cache(maxsize=None)
+def parse_days(days_text):
+    """
+    7-bit mask (bit 0 = Monday) of a comma separated day list like
+    'Monday, Wednesday, Friday', or None when a token is not a day name
+    (e.g. 'Weekends', 'Mon-Fri' or '3')
+    """
+    mask = 0
+    for token in day_tokens(days_text):
+        bit = DAY_BITS.get(token.lower())
+        if bit is None:
+            return None
+        mask |= bit
+    return mask
+
+@lru_cache(maxsize=128)
+def format_days(mask):
+    """
+    Day list text of a mask, Monday first
+    """
+    return ', '.join(day for bit, day in enumerate(WEEKDAYS) if mask >> bit & 1)
+
+class WeekSchedule:
+    """
+    Column of weekly schedules stored as 7-bit day masks (bit 0 = Monday)
+
+    known marks the entries that had a schedule; blank cells parse to an
+    unknown entry with an empty mask. parsed marks the known entries made of
+    day names only: the others ('Weekends', 'Mon-Fri', ...) keep an empty
+    mask. labels holds the source text of every entry (None when there is
+    none), which texts() writes back in its own day order, and token_counts
+    its number of comma separated tokens. Day counts and set operations
+    (|, &, -) work on whole columns at once; set operations on unparsed
+    entries give unknown entries.
+    """
+
+    def __init__(self, masks, known=None, parsed=None, labels=None, token_counts=None):
+        self.masks = np.asarray(masks, dtype=np.uint8)
+        if known is None:
+            known = np.ones(len(self.masks), dtype=bool)
+        self.known = np.asarray(known, dtype=bool)
+        self.parsed = self.known.copy() if parsed is None else np.asarray(parsed, dtype=bool)
+        self.labels = list(labels) if labels is not None else [None] * len(self.masks)
+        self.token_counts = POPCOUNT[self.masks] if token_counts is None else np.asarray(token_counts, dtype=np.int8)
+
+    @classmethod
+    def parse(cls, values):
+        """
+        Schedules of a column of day-list strings, parsing each distinct
+        string once; NaN/None entries are unknown
+        """
+        codes, uniques = pd.factorize(pd.Series(values, dtype=object))
+        tokens = [day_tokens(str(text)) for text in uniques]
+        masks = [parse_days(str(text)) for text in uniques]
+
+        # One extra entry for code -1 (NaN/None)
+        unique_masks = np.array([mask or 0 for mask in masks] + [0], dtype=np.uint8)
+        unique_parsed = np.array([mask is not None for mask in masks] + [False])
+        unique_labels = [', '.join(text_tokens) for text_tokens in tokens] + [None]
+        unique_token_counts = np.array([len(text_tokens) for text_tokens in tokens] + [0], dtype=np.int8)
+
+        return cls(unique_masks[codes], codes >= 0, unique_parsed[codes],
+                   [unique_labels[code] for code in codes.tolist()], unique_token_counts[codes])
+
+    def __len__(self):
+        return len(self.masks)
+
+    def counts(self):
+        """
+        Days per week of every entry (0 for unknown entries): the number of
+        day tokens of its source text, as the sheets count them, or the days
+        of its mask when it has no source text
+        """
+        return np.where(self.known, self.token_counts, 0)
+
+    def texts(self, unknown=None):
+        """
+        Day list text of every entry, with unknown for the unknown entries
+        """
+        return [(label if label is not None else format_days(mask)) if known else unknown
+                for mask, known, label in zip(self.masks.tolist(), self.known.tolist(), self.labels)]
+
+    def fillna(self, other):
+        """
+        Entries of other where this schedule is unknown
+        """
+        known = self.known.tolist()
+        return WeekSchedule(np.where(self.known, self.masks, other.masks), self.known | other.known,
+                            np.where(self.known, self.parsed, other.parsed),
+                            [own if is_known else theirs for own, theirs, is_known in zip(self.labels, other.labels, known)],
+                            np.where(self.known, self.token_counts, other.token_counts))
+
+    def _combine(self, masks, other):
+        parsed = self.parsed & other.parsed
+        return WeekSchedule(np.where(parsed, masks, 0), parsed)
+
+    def __or__(self, other):
+        return self._combine(self.masks | other.masks, other)
+
+    def __and__(self, other):
+        return self._combine(self.masks & other.masks, other)
+
+    def __sub__(self, other):
+        """
+        Days of this schedule that are not in other, e.g. target - current
+        """
+        return self._combine(self.masks & ~other.masks, other)
\ No newline at end of file
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+
+import os
+from collections import OrderedDict
+import pandas as pd
+from sheet_snapshot import load_snapshot, write_snapshot, workbook_hash
+
+# Number of parsed workbooks kept in memory
+WORKBOOK_CACHE_SIZE = 8
+
+_workbook_cache = OrderedDict()
+
+class WorkbookSource:
+    """
+    Excel workbook parsed once with sheet_name=None and shared by every script
+
+    Parsed sheets are kept in an LRU cache keyed by (absolute path, mtime,
+    size), so reading the same unchanged file again skips the parse. Sheets
+    are handed out as copies so callers can modify them freely.
+
+    With use_snapshot (the default) the first parse also writes a columnar
+    sidecar snapshot next to the workbook, and later processes load that
+    snapshot instead of parsing the xlsx while its content hash is unchanged.
+    """
+
+    def __init__(self, path, use_snapshot=True):
+        self.path = path
+        self.use_snapshot = use_snapshot
+
+    def cache_key(self):
+        stat = os.stat(self.path)
+        return (os.path.abspath(self.path), stat.st_mtime_ns, stat.st_size)
+
+    def sheets(self):
+        """
+        All sheets of the workbook as {sheet name: DataFrame}, parsed at most
+        once per file version
+        """
+        key = self.cache_key()
+        if key in _workbook_cache:
+            _workbook_cache.move_to_end(key)
+            return _workbook_cache[key]
+
+        all_sheets = None
+        if self.use_snapshot:
+            content_hash = workbook_hash(self.path)
+            all_sheets = load_snapshot(self.path, content_hash)
+
+        if all_sheets is None:
+            all_sheets = pd.read_excel(self.path, sheet_name=None)
+            if self.use_snapshot:
+                write_snapshot(self.path, all_sheets, content_hash)
+
+        # Drop stale versions of the same file before caching the new one
+        for cached_key in [k for k in _workbook_cache if k[0] == key[0]]:
+            del _workbook_cache[cached_key]
+        _workbook_cache[key] = all_sheets
+        while len(_workbook_cache) > WORKBOOK_CACHE_SIZE:
+            _workbook_cache.popitem(last=False)
+
+        return all_sheets
+
+    @property
+    def sheet_names(self):
+        return list(self.sheets())
+
+    def sheet(self, sheet_name):
+        """
+        Copy of one sheet; raises ValueError like pd.read_excel when missing
+        """
+        all_sheets = self.sheets()
+        if sheet_name not in all_sheets:
+            raise ValueError(f"Worksheet named '{sheet_name}' not found")
+        return all_sheets[sheet_name].copy()
+
+    def select(self, columns):
+        """
+        {sheet name: DataFrame} of only the sheets and columns listed in
+        columns ({sheet name: column names}), for read-only checks; sheets
+        and columns the workbook lacks are left out
+
+        Slices the parsed workbook when it is cached, otherwise reads just
+        those Feather columns from a current snapshot, and only falls back
+        to parsing the selected sheets and columns of the xlsx.
+        """
+        def pick(df, names):
+            return df[[name for name in names if name in df.columns]]
+
+        key = self.cache_key()
+        if key in _workbook_cache:
+            all_sheets = _workbook_cache[key]
+            return {name: pick(all_sheets[name], names) for name, names in columns.items() if name in all_sheets}
+
+        selected = load_snapshot(self.path, columns=columns) if self.use_snapshot else None
+        if selected is None:
+            with pd.ExcelFile(self.path) as workbook:
+                wanted = set().union(*columns.values())
+                selected = {name: pick(workbook.parse(name, usecols=lambda column: column in wanted), names)
+                            for name, names in columns.items() if name in workbook.sheet_names}
+        return selected
+
+def read_sheet(path, sheet_name):
+    """
+    Drop-in replacement for pd.read_excel(path, sheet_name=...) backed by the cache
+    """
+    return WorkbookSource(path).sheet(sheet_name)
+
+def clear_workbook_cache():
+    _workbook_cache.clear()
\ No newline at end of file